@@ -0,0 +1 @@
+"""고객 분석 시스템 공용 분석 모듈"""
@@ -0,0 +1,223 @@
+"""백엔드 API 클라이언트 (연결 재사용, 재시도, 서킷 브레이커)"""
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 재시도 대상 HTTP 상태 코드
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """연속 실패가 쌓이면 일정 시간 호출을 즉시 실패시키는 서킷 브레이커
+
+    closed -> (연속 실패 failure_threshold 회) -> open -> (reset_timeout 경과) -> half_open
+    half_open 상태에서는 시험 호출 하나만 통과시키고, 성공하면 closed 로 돌아간다.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """지금 호출을 보내도 되는지 확인"""
+        with self._lock:
+            if self.state == 'open':
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = 'half_open'
+                self._trial_in_flight = False
+            if self.state == 'half_open':
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """성공 기록 - 서킷을 닫음"""
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """실패 기록 - 임계치를 넘거나 시험 호출이 실패하면 서킷을 엶"""
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class EndpointStats:
+    """엔드포인트별 호출 지연/오류 통계"""
+
+    def __init__(self, window: int = 200):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.rejected = 0
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def summary(self) -> Dict[str, Any]:
+        """최근 호출 기준 요약"""
+        samples = sorted(self.latencies)
+
+        def percentile(q: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 1)
+
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'rejected': self.rejected,
+            'error_rate': round(self.errors / self.calls * 100, 1) if self.calls else 0.0,
+            'p50_ms': percentile(0.5),
+            'p95_ms': percentile(0.95),
+        }
+
+
+class ApiClient:
+    """연결 풀을 재사용하는 백엔드 API 클라이언트
+
+    get() 은 예외를 던지지 않고 항상 {success, data | error} 형태의 응답을 반환한다.
+    연결 오류, 타임아웃, 5xx 응답은 지터가 들어간 지수 백오프로 max_retries 회까지
+    재시도하며, 서킷이 열려 있으면 요청을 보내지 않고 바로 실패한다.
+    deadline 을 주면 재시도와 백오프를 합친 전체 시간이 그 시각을 넘지 않는다.
+    """
+
+    def __init__(self, base_url: str, connect_timeout: float = 3.0, read_timeout: float = 10.0,
+                 max_retries: int = 2, backoff_base: float = 0.2, backoff_max: float = 2.0,
+                 pool_size: int = 16, breaker: Optional[CircuitBreaker] = None):
+        self.base_url = base_url.rstrip('/')
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._stats: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint_stats(self, endpoint: str) -> EndpointStats:
+        with self._lock:
+            if endpoint not in self._stats:
+                self._stats[endpoint] = EndpointStats()
+            return self._stats[endpoint]
+
+    def _backoff(self, attempt: int) -> float:
+        """full jitter 지수 백오프 대기 시간"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+            timeout: Optional[float] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """GET 요청 - 재시도와 서킷 브레이커 적용
+
+        deadline 은 time.monotonic() 기준 마감 시각. 시도마다 남은 시간만큼만 기다리고,
+        백오프 뒤에 남는 시간이 없으면 더 재시도하지 않는다.
+        """
+        stats = self._endpoint_stats(endpoint)
+        if deadline is not None and time.monotonic() >= deadline:
+            return {'success': False, 'error': 'API 호출 오류: 제한 시간 초과'}
+        if not self.breaker.allow():
+            with self._lock:
+                stats.rejected += 1
+            return {'success': False, 'error': 'API 호출 오류: 백엔드 응답 없음 (서킷 열림)'}
+
+        url = f"{self.base_url}/{endpoint}"
+        read_timeout = timeout if timeout is not None else self.read_timeout
+        error = ''
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = self._backoff(attempt - 1)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    break
+                time.sleep(delay)
+                with self._lock:
+                    stats.retries += 1
+            timeouts = (self.connect_timeout, read_timeout)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                timeouts = (min(self.connect_timeout, remaining), min(read_timeout, remaining))
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=timeouts)
+                elapsed = time.perf_counter() - started
+                if response.status_code in RETRY_STATUS_CODES or response.status_code >= 500:
+                    error = f"API 호출 오류: {response.status_code} {response.reason}"
+                    continue
+                response.raise_for_status()
+                result = response.json()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = f"API 호출 오류: {str(e)}"
+                continue
+            except (requests.exceptions.RequestException, ValueError) as e:
+                # 4xx 나 잘못된 JSON 은 재시도해도 결과가 같으므로 바로 실패 (백엔드는 살아 있음)
+                self.breaker.record_success()
+                with self._lock:
+                    stats.calls += 1
+                    stats.errors += 1
+                    stats.latencies.append(time.perf_counter() - started)
+                failure = {'success': False, 'error': f"API 호출 오류: {str(e)}"}
+                if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+                    failure['status'] = e.response.status_code
+                return failure
+
+            self.breaker.record_success()
+            with self._lock:
+                stats.calls += 1
+                stats.latencies.append(elapsed)
+            return result
+
+        self.breaker.record_failure()
+        with self._lock:
+            stats.calls += 1
+            stats.errors += 1
+        return {'success': False, 'error': error}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """엔드포인트별 지연/오류 통계"""
+        with self._lock:
+            return {endpoint: stats.summary() for endpoint, stats in self._stats.items()}
+
+    def close(self) -> None:
+        """연결 풀 정리"""
+        self.session.close()
+
+
+def split_bundle(bundle: Dict[str, Any], panels: List[str]) -> Dict[str, Dict[str, Any]]:
+    """번들 응답을 패널별 {success, data, message, timestamp} 응답으로 분리"""
+    if not bundle.get('success'):
+        error = bundle.get('error', '번들 조회 실패')
+        return {panel: {'success': False, 'error': error} for panel in panels}
+
+    panel_data = bundle['data'].get('panels', {})
+    panel_errors = bundle['data'].get('errors', {})
+    result = {}
+    for panel in panels:
+        if panel in panel_data:
+            result[panel] = {
+                'success': True,
+                'data': panel_data[panel],
+                'message': bundle.get('message'),
+                'timestamp': bundle.get('timestamp'),
+            }
+        else:
+            result[panel] = {'success': False, 'error': panel_errors.get(panel, '번들 응답에 패널이 없습니다.')}
+    return result
@@ -0,0 +1,245 @@
+"""대시보드 API 결과 캐시"""
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from analytics.concurrency import DEFAULT_TOTAL_TIMEOUT, run_in_background
+
+# 엔드포인트별 캐시 유지 시간 (초) - 자주 바뀌는 데이터일수록 짧게
+DASHBOARD_TTLS = {
+    'dashboard/overview': 60,
+    'dashboard/funnels': 300,
+    'dashboard/kpi-trends': 300,
+    'dashboard/recent-events': 15,
+    'dashboard/scenario-performance': 300,
+    'dashboard/category-metrics': 120,
+    'dashboard/bundle': 15,
+    'journey/ordered-funnel': 300,
+    'retention/cohorts': 300,
+    'journey/paths': 300,
+    'journey/dropout': 300,
+    'kpi/percentiles': 300,
+    'kpi/measurements': 300,
+    'dashboard/breakdown': 120,
+}
+DEFAULT_TTL = 60
+
+
+def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Tuple[str, Tuple[Tuple[str, Hashable], ...]]:
+    """(엔드포인트, 파라미터) 캐시 키 생성"""
+    return endpoint, tuple(sorted((params or {}).items()))
+
+
+class TTLCache:
+    """(엔드포인트, 파라미터) 키 기반 TTL 결과 캐시
+
+    성공한 응답만 저장하며, 엔드포인트별 TTL 이 지나거나 not_before 이전에
+    저장된 항목은 만료된 것으로 본다. 워커 스레드에서 함께 사용할 수 있다.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = DEFAULT_TTL):
+        self.ttls = dict(DASHBOARD_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self._entries: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+        # 만료/무효화와 관계없이 남겨 두는 마지막 성공 응답 (stale-while-revalidate 용)
+        self._last_good: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+        # 키별 마지막 조회 시각 - 워머가 최근에 쓰인 키만 미리 계산하도록
+        self._accessed: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_for(self, endpoint: str) -> float:
+        """엔드포인트 TTL 조회"""
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+            not_before: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """유효한 캐시 항목 조회 - 없거나 만료되었으면 None"""
+        key = make_key(endpoint, params)
+        with self._lock:
+            self._accessed[key] = time.time()
+            value = self._lookup(key, not_before)
+            if value is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value
+
+    def _lookup(self, key: Tuple, not_before: Optional[float]) -> Optional[Dict[str, Any]]:
+        """잠금을 잡은 상태에서 유효한 항목 조회 - 만료된 항목은 삭제"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        fresh = time.time() - stored_at < self.ttl_for(key[0])
+        if fresh and (not_before is None or stored_at >= not_before):
+            return value
+        del self._entries[key]
+        return None
+
+    def set(self, endpoint: str, params: Optional[Dict[str, Any]], value: Dict[str, Any]) -> None:
+        """캐시 항목 저장"""
+        key = make_key(endpoint, params)
+        entry = (time.time(), value)
+        with self._lock:
+            self._entries[key] = entry
+            self._last_good[key] = entry
+
+    def expires_in(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[float]:
+        """유효한 항목이 만료되기까지 남은 시간(초) - 항목이 없으면 None (통계에 반영하지 않음)"""
+        with self._lock:
+            entry = self._entries.get(make_key(endpoint, params))
+            if entry is None:
+                return None
+            return entry[0] + self.ttl_for(endpoint) - time.time()
+
+    def last_accessed(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[float]:
+        """키를 마지막으로 조회한 시각 - 조회한 적이 없으면 None (통계에 반영하지 않음)"""
+        with self._lock:
+            return self._accessed.get(make_key(endpoint, params))
+
+    def peek_last_good(self, endpoint: str, params: Optional[Dict[str, Any]] = None
+                       ) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """만료 여부와 관계없이 마지막 성공 응답과 저장 시각 조회 (통계에 반영하지 않음)"""
+        with self._lock:
+            return self._last_good.get(make_key(endpoint, params))
+
+    def fetch(self, endpoint: str, params: Optional[Dict[str, Any]],
+              loader: Callable[[], Optional[Dict[str, Any]]],
+              not_before: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """캐시에 있으면 반환하고, 없으면 loader 호출 후 성공한 응답만 저장"""
+        cached = self.get(endpoint, params, not_before)
+        if cached is not None:
+            return cached
+        value = loader()
+        if isinstance(value, dict) and value.get('success'):
+            self.set(endpoint, params, value)
+        return value
+
+    def invalidate(self, endpoint: Optional[str] = None) -> int:
+        """캐시 무효화 - endpoint 를 주면 해당 엔드포인트만, 아니면 전체. 삭제된 항목 수 반환
+
+        마지막 성공 응답(peek_last_good)은 지우지 않으므로 갱신 중에도 이전 데이터를 보여줄 수 있다.
+        """
+        with self._lock:
+            if endpoint is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            keys = [key for key in self._entries if key[0] == endpoint]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중/미스 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'hit_rate': round(self.hits / total * 100, 1) if total else 0.0,
+            }
+
+
+class _Flight:
+    """진행 중인 upstream 호출 하나"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.done = threading.Event()
+        self.value: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class SharedCache(TTLCache):
+    """여러 세션이 함께 쓰는 프로세스 전역 캐시 (single-flight 요청 병합)
+
+    같은 (엔드포인트, 파라미터) 키에 대해 동시에 들어온 요청은 upstream 호출
+    한 번만 보내고, 나머지는 그 결과를 기다렸다가 함께 받는다. 합류한 요청은 최대
+    timeout(기본 wait_timeout) 초만 기다리고, 그 안에 끝나지 않으면 실패 응답을 받는다.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = DEFAULT_TTL,
+                 wait_timeout: float = DEFAULT_TOTAL_TIMEOUT):
+        super().__init__(ttls, default_ttl)
+        self.wait_timeout = wait_timeout
+        self._flights: Dict[Tuple, _Flight] = {}
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.wait_timeouts = 0
+
+    def fetch(self, endpoint: str, params: Optional[Dict[str, Any]],
+              loader: Callable[[], Optional[Dict[str, Any]]],
+              not_before: Optional[float] = None, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """캐시 조회 후 미스면 진행 중인 호출에 합류하거나 직접 upstream 호출"""
+        cached = self.get(endpoint, params, not_before)
+        if cached is not None:
+            return cached
+        return self._load(endpoint, params, loader, not_before, timeout)
+
+    def _load(self, endpoint: str, params: Optional[Dict[str, Any]],
+              loader: Callable[[], Optional[Dict[str, Any]]],
+              not_before: Optional[float], timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """single-flight upstream 호출 - 합류한 요청은 timeout 초까지만 기다림"""
+        key = make_key(endpoint, params)
+        with self._lock:
+            # 조회와 잠금 사이에 다른 호출이 끝났을 수 있으므로 다시 확인
+            cached = self._lookup(key, not_before)
+            if cached is not None:
+                return cached
+            flight = self._flights.get(key)
+            # 새로고침 시각 이전에 시작된 호출에는 합류하지 않는다
+            if flight is not None and (not_before is None or flight.started_at >= not_before):
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.upstream_calls += 1
+                leader = True
+
+        if not leader:
+            wait_for = self.wait_timeout if timeout is None else timeout
+            if not flight.done.wait(wait_for):
+                with self._lock:
+                    self.wait_timeouts += 1
+                return {'success': False, 'error': f'진행 중인 같은 요청이 {wait_for:g}초 내에 끝나지 않았습니다.'}
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            if isinstance(flight.value, dict) and flight.value.get('success'):
+                self.set(endpoint, params, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    def revalidate(self, endpoint: str, params: Optional[Dict[str, Any]],
+                   loader: Callable[[], Optional[Dict[str, Any]]],
+                   not_before: Optional[float] = None, timeout: Optional[float] = None) -> Future:
+        """백그라운드에서 항목 갱신 - 이미 진행 중인 호출이 있으면 그 결과를 함께 기다린다"""
+        return run_in_background(self._load, endpoint, params, loader, not_before, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 + upstream 호출/병합된 요청 수"""
+        result = super().stats()
+        with self._lock:
+            result.update({
+                'upstream_calls': self.upstream_calls,
+                'coalesced': self.coalesced,
+                'wait_timeouts': self.wait_timeouts,
+                'in_flight': len(self._flights),
+            })
+        return result
@@ -0,0 +1,87 @@
+"""대시보드 데이터 동시 조회 유틸리티"""
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict
+
+# 기본 타임아웃 (초)
+DEFAULT_CALL_TIMEOUT = 10.0
+DEFAULT_TOTAL_TIMEOUT = 15.0
+
+# 프로세스 전역 워커 풀 - 매 rerun 마다 스레드를 새로 만들지 않도록 공유
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="dashboard-fetch")
+
+
+def run_in_background(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """공유 워커 풀에서 함수 실행"""
+    return _executor.submit(fn, *args, **kwargs)
+
+
+def _failure(message: str) -> Dict[str, Any]:
+    """실패 응답 생성"""
+    return {'success': False, 'error': message}
+
+
+def _result_of(future: Future) -> Dict[str, Any]:
+    """완료된 future 결과를 응답 형태로 정규화"""
+    try:
+        result = future.result()
+    except Exception as e:
+        return _failure(str(e))
+    if not isinstance(result, dict):
+        return _failure('빈 응답')
+    return result
+
+
+def fetch_concurrently(
+    calls: Dict[str, Callable[[], Dict[str, Any]]],
+    call_timeout: float = DEFAULT_CALL_TIMEOUT,
+    total_timeout: float = DEFAULT_TOTAL_TIMEOUT,
+) -> Dict[str, Dict[str, Any]]:
+    """여러 조회 함수를 동시에 실행하고 패널별 결과 반환
+
+    각 호출은 실행 시작부터 call_timeout 초, 전체는 total_timeout 초 안에 끝나야 한다.
+    실패하거나 시간을 넘긴 패널은 {'success': False, 'error': ...} 로 채워지므로
+    호출 측은 성공한 패널만 골라 렌더링할 수 있다.
+    """
+    started: Dict[str, float] = {}
+
+    def run(name: str, call: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        started[name] = time.monotonic()
+        return call()
+
+    begin = time.monotonic()
+    total_deadline = begin + total_timeout
+    pending = {_executor.submit(run, name, call): name for name, call in calls.items()}
+    results: Dict[str, Dict[str, Any]] = {}
+
+    while pending:
+        now = time.monotonic()
+
+        # 개별 호출 타임아웃 처리
+        for future, name in list(pending.items()):
+            if future.done():
+                results[name] = _result_of(future)
+                del pending[future]
+            elif name in started and now - started[name] >= call_timeout:
+                future.cancel()
+                results[name] = _failure(f'{call_timeout:g}초 내에 응답이 없습니다.')
+                del pending[future]
+
+        if not pending or now >= total_deadline:
+            break
+
+        # 다음으로 만료될 시점까지만 대기 (아직 시작 전인 호출은 now + call_timeout 이후 만료)
+        next_deadline = min(
+            [total_deadline, now + call_timeout]
+            + [started[name] + call_timeout for name in pending.values() if name in started]
+        )
+        done, _ = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+        for future in done:
+            results[pending.pop(future)] = _result_of(future)
+
+    # 전체 타임아웃을 넘긴 호출
+    for future, name in pending.items():
+        future.cancel()
+        results[name] = _failure(f'전체 {total_timeout:g}초 제한을 초과했습니다.')
+
+    return {name: results[name] for name in calls}
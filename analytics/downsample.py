@@ -0,0 +1,50 @@
+"""긴 시계열 다운샘플링 (LTTB)
+
+Largest-Triangle-Three-Buckets 는 첫 점과 마지막 점을 두고 나머지를 budget - 2 개 구간으로 나눈 뒤
+구간마다 (앞에서 고른 점, 이 구간의 점, 다음 구간 평균) 삼각형 넓이가 가장 큰 점 하나를 고른다.
+봉우리와 골짜기가 남으므로 화면 폭만큼의 점으로 줄여도 선 모양이 거의 그대로다.
+"""
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# 차트 한 개에 보내는 최대 점 수 - 넓은 레이아웃 차트 폭(픽셀) 정도
+TREND_POINT_BUDGET = 1_000
+# 그리는 점이 이보다 많으면 SVG 대신 WebGL 트레이스를 쓰고 마커를 뺀다
+WEBGL_THRESHOLD = 500
+
+
+def lttb(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """x 순으로 정렬된 (x, y) 에서 남길 점의 위치 - 점이 budget 개 이하면 전부"""
+    n = len(y)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # 구간 i 는 edges[i]:edges[i + 1], 마지막 구간의 다음 구간은 마지막 점 하나
+    every = (n - 2) / (budget - 2)
+    edges = np.append((np.arange(budget - 1) * every).astype(np.int64) + 1, n)
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for bucket in range(budget - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        following = slice(end, edges[bucket + 2])
+        next_x, next_y = x[following].mean(), y[following].mean()
+        areas = np.abs((x[anchor] - next_x) * (y[start:end] - y[anchor])
+                       - (x[anchor] - x[start:end]) * (next_y - y[anchor]))
+        anchor = start + int(np.argmax(areas))
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def downsample_points(points: List[Dict[str, Any]], budget: int = TREND_POINT_BUDGET,
+                      x_key: str = 'date', y_key: str = 'value') -> List[Dict[str, Any]]:
+    """시각 순 {x_key, y_key} 점 목록을 LTTB 로 budget 개 이하로 줄이기 - x 는 날짜 문자열이나 숫자"""
+    if len(points) <= budget:
+        return points
+    x = pd.to_datetime([point[x_key] for point in points])
+    y = np.array([point[y_key] for point in points], dtype=np.float64)
+    return [points[index] for index in lttb(x.asi8, np.nan_to_num(y), budget)]
+
@@ -0,0 +1,174 @@
+"""차트 Figure 메모이제이션
+
+차트 생성 함수는 같은 입력으로 다시 실행될 때마다 Figure 를 처음부터 만들며 속성을 하나하나 검증한다.
+FigureCache 는 (차트 이름, 입력 페이로드·옵션의 안정 해시) 키로 직렬화한 Figure JSON 을 담아 두고,
+적중하면 검증 없이 JSON 에서 새 Figure 를 만들어 돌려준다. 항목 수와 JSON 크기 합계 상한을 넘으면
+가장 오래 쓰지 않은 항목부터 버린다 (LRU).
+
+페이로드(list, dict)는 내용 해시로 키에 넣으므로, 같은 내용을 다시 가져온 응답은 새 객체여도 적중하고
+제자리에서 바꾼 페이로드는 다시 그린다. 큰 list 는 열 단위로(hash_pandas_object) 해시하고, 객체마다
+(id, 얕은 지문 → 해시) 만 기억해 같은 객체가 다시 들어오면 해시를 건너뛴다. 얕은 지문은 길이와 원소 객체의
+id 라서 원소를 바꾸거나 더하고 빼면 다시 해시하지만, 큰 list 의 원소 안쪽만 제자리에서 고친 경우는 알아채지 못한다.
+"""
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import plotly.graph_objects as go
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 2 ** 20
+# 내용 해시를 기억해 둘 페이로드 객체 수 - 해시만 기억하고 객체는 붙잡지 않는다
+DEFAULT_DIGEST_ENTRIES = 128
+# 이보다 짧은 페이로드는 기억하지 않고 매번 JSON 으로 해시한다 (해시 비용이 기억하는 비용보다 작음)
+DIGEST_MEMO_MIN_ITEMS = 256
+
+
+def payload_hash(*parts: Any) -> str:
+    """입력 페이로드의 안정 해시 - dict 키 순서와 관계없이 같은 값이면 같은 해시"""
+    encoded = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def content_digest(value: Any) -> str:
+    """페이로드 내용 해시 - dict 로 이뤄진 큰 list 는 열 단위로, 그 밖에는 JSON 으로"""
+    if isinstance(value, list) and len(value) >= DIGEST_MEMO_MIN_ITEMS and all(isinstance(item, dict) for item in value):
+        import pandas as pd
+        frame = pd.DataFrame(value)
+        try:
+            hashed = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+        except TypeError:
+            # list·dict 값이 든 열은 열 단위로 해시할 수 없다
+            return payload_hash(value)
+        digest = hashlib.blake2b(json.dumps([str(column) for column in frame.columns]).encode('utf-8'), digest_size=16)
+        digest.update(hashed.tobytes())
+        return digest.hexdigest()
+    return payload_hash(value)
+
+
+def _shallow_fingerprint(value: Any) -> Tuple:
+    """길이와 원소(dict 는 값) 객체 id - 같은 객체를 제자리에서 바꿨거나 id 가 재사용됐는지 싸게 확인"""
+    items = value.values() if isinstance(value, dict) else value
+    return len(value), hash(tuple(map(id, items)))
+
+
+class _PayloadDigests:
+    """페이로드 객체별 내용 해시 LRU - 객체를 붙잡지 않고 (id → 얕은 지문, 해시) 만 기억한다"""
+
+    def __init__(self, max_entries: int = DEFAULT_DIGEST_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[int, Tuple[Tuple, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def digest(self, value: Any) -> Any:
+        """list·dict 는 내용 해시, 그 밖의 값은 그대로 (키를 만들 때 함께 해시된다)"""
+        if not isinstance(value, (list, dict)):
+            return value
+        if len(value) < DIGEST_MEMO_MIN_ITEMS:
+            return payload_hash(value)
+        fingerprint = _shallow_fingerprint(value)
+        with self._lock:
+            entry = self._entries.get(id(value))
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(id(value))
+                return entry[1]
+        digest = content_digest(value)
+        with self._lock:
+            self._entries[id(value)] = (fingerprint, digest)
+            self._entries.move_to_end(id(value))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return digest
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class FigureCache:
+    """직렬화한 Figure 의 크기 제한 LRU 캐시 (프로세스 전역, 스레드 안전)"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._digests = _PayloadDigests()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """직렬화한 Figure 조회 - 적중하면 가장 최근에 쓴 항목이 된다"""
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return spec
+
+    def set(self, key: str, spec: str) -> None:
+        """직렬화한 Figure 저장 - 상한을 넘으면 오래된 항목부터 삭제 (상한보다 큰 항목은 저장하지 않음)"""
+        if len(spec) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = spec
+            self._bytes += len(spec)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def figure(self, name: str, builder: Callable[..., Optional[go.Figure]], *args, **kwargs) -> Optional[go.Figure]:
+        """builder(*args, **kwargs) 결과 Figure - 같은 차트·입력이면 캐시에서 복원"""
+        digest = self._digests.digest
+        key = f"{name}:{payload_hash([digest(arg) for arg in args], {k: digest(v) for k, v in kwargs.items()})}"
+        spec = self.get(key)
+        if spec is not None:
+            # 저장할 때 이미 검증한 Figure 이므로 다시 검증하지 않는다
+            return go.Figure(json.loads(spec), _validate=False)
+        fig = builder(*args, **kwargs)
+        if fig is not None:
+            self.set(key, fig.to_json())
+        return fig
+
+    def invalidate(self) -> int:
+        """전체 삭제 - 삭제한 항목 수 반환"""
+        self._digests.clear()
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중/미스·크기 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'bytes': self._bytes,
+                'hit_rate': round(self.hits / total * 100, 1) if total else 0.0,
+            }
+
+
+def memoized_figure(name: str, cache: Callable[[], FigureCache]) -> Callable[[Callable], Callable]:
+    """차트 생성 함수를 FigureCache 로 감싸는 데코레이터 - cache 는 호출 때마다 캐시를 돌려주는 함수"""
+    def decorate(builder: Callable) -> Callable:
+        @functools.wraps(builder)
+        def wrapper(*args, **kwargs):
+            return cache().figure(name, builder, *args, **kwargs)
+        return wrapper
+    return decorate
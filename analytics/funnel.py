@@ -0,0 +1,157 @@
+"""퍼널 엔진
+
+- FunnelEngine: customer_journey_funnel 뷰는 읽을 때마다 journey_stage_completions 전체를 훑어
+  단계별 COUNT(DISTINCT user_id) 와 LAG 윈도를 계산한다. 이 엔진은 단계별로 도달한 사용자 비트맵과
+  도달 사용자 수를 유지하고 새 완료 기록이 들어올 때만 갱신하므로 읽기는 O(단계) 비용만 든다.
+- windowed_funnel: 단계별 도달 수와 달리 사용자마다 단계를 순서대로, 전환 기간 안에 밟았는지를 따지는
+  순서·기간 제한 퍼널. 단계 수만큼의 벡터 연산으로 계산한다 (정렬·사용자별 파이썬 루프 없음).
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class FunnelEngine:
+    """시나리오·단계별 도달 사용자 상태를 증분으로 유지하는 퍼널 엔진
+
+    user_id 는 처음 본 순서대로 정수 코드를 받고, 단계마다 코드 위치에 도달 여부를 기록한다.
+    같은 사용자가 같은 단계를 여러 번 완료해도 한 번만 센다 (뷰의 COUNT(DISTINCT) 와 같은 의미).
+    """
+
+    def __init__(self, stages: Optional[pd.DataFrame] = None, initial_capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._users: Dict[Any, int] = {}
+        self._slots: Dict[int, int] = {}
+        self._stages: Dict[int, List[Tuple[int, str, int]]] = {}
+        self._reached = np.zeros((0, initial_capacity), dtype=bool)
+        self._counts = np.zeros(0, dtype=np.int64)
+        if stages is not None:
+            self.set_stages(stages)
+
+    def set_stages(self, stages: pd.DataFrame):
+        """journey_stages 행(id, scenario_id, stage_name, stage_order) 등록 - 이미 있는 단계의 상태는 유지"""
+        with self._lock:
+            new = [stage_id for stage_id in stages['id'].tolist() if stage_id not in self._slots]
+            for stage_id in new:
+                self._slots[stage_id] = len(self._slots)
+            if new:
+                self._reached = np.vstack([self._reached, np.zeros((len(new), self._reached.shape[1]), dtype=bool)])
+                self._counts = np.concatenate([self._counts, np.zeros(len(new), dtype=np.int64)])
+            self._stages = {}
+            for row in stages.sort_values(['scenario_id', 'stage_order']).itertuples(index=False):
+                self._stages.setdefault(row.scenario_id, []).append((row.stage_order, row.stage_name, self._slots[row.id]))
+
+    def _user_codes(self, user_ids: pd.Series) -> np.ndarray:
+        """user_id 를 정수 코드로 변환 - 처음 보는 사용자는 새 코드를 받는다"""
+        values = pd.Categorical(user_ids)
+        categories = pd.Series(values.categories)
+        codes = categories.map(self._users)
+        missing = codes.isna().to_numpy()
+        if missing.any():
+            start = len(self._users)
+            new_codes = np.arange(start, start + missing.sum())
+            self._users.update(zip(categories[missing].tolist(), new_codes.tolist()))
+            codes[missing] = new_codes
+        return codes.to_numpy(dtype=np.int64)[values.codes]
+
+    def _ensure_capacity(self, size: int):
+        capacity = self._reached.shape[1]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        grown = np.zeros((self._reached.shape[0], capacity), dtype=bool)
+        grown[:, :self._reached.shape[1]] = self._reached
+        self._reached = grown
+
+    def update(self, completions: pd.DataFrame) -> int:
+        """journey_stage_completions 행 반영 - 새로 도달한 (사용자, 단계) 쌍의 수를 반환
+
+        성공한 완료(is_successful)만 세고 등록되지 않은 단계의 행은 무시한다.
+        """
+        if completions.empty:
+            return 0
+        if 'is_successful' in completions:
+            completions = completions[completions['is_successful'].fillna(True).astype(bool)]
+        with self._lock:
+            slot_lookup = pd.Series(self._slots, dtype=np.int64)
+            slots = completions['stage_id'].map(slot_lookup)
+            known = slots.notna().to_numpy()
+            if not known.any():
+                return 0
+            slots = slots.to_numpy()[known].astype(np.int64)
+            users = self._user_codes(completions['user_id'][known])
+            self._ensure_capacity(len(self._users))
+            # 배치 안의 중복 쌍을 먼저 없앤 뒤 아직 도달하지 않은 쌍만 센다
+            pairs = np.unique(slots * len(self._users) + users)
+            slots, users = np.divmod(pairs, len(self._users))
+            new = ~self._reached[slots, users]
+            self._reached[slots[new], users[new]] = True
+            self._counts += np.bincount(slots[new], minlength=len(self._counts))
+            return int(new.sum())
+
+    def stage_counts(self, scenario_id: int) -> List[Tuple[int, str, int]]:
+        """(단계 순서, 단계명, 도달 사용자 수) 목록"""
+        with self._lock:
+            return [(order, name, int(self._counts[slot])) for order, name, slot in self._stages.get(scenario_id, [])]
+
+    def funnel(self, scenario_id: int) -> List[Dict[str, Any]]:
+        """customer_journey_funnel 뷰와 같은 형태 - conversion_rate 는 이전 단계 대비 비율 (첫 단계는 0)"""
+        stages = []
+        previous = None
+        for _, name, users in self.stage_counts(scenario_id):
+            stages.append({
+                'stage_name': name,
+                'users_reached': users,
+                'conversion_rate': round(users / previous * 100, 2) if previous else 0.0,
+            })
+            previous = users
+        return stages
+
+    def scenarios(self) -> List[int]:
+        with self._lock:
+            return list(self._stages)
+
+
+def windowed_funnel(users: np.ndarray, steps: np.ndarray, times: np.ndarray, n_steps: int,
+                    window: float) -> List[Dict[str, Any]]:
+    """사용자별 순서·기간 제한 퍼널
+
+    users 는 0부터 시작하는 사용자 코드, steps 는 0부터 시작하는 단계 번호, times 는 초 단위 시각이다.
+    각 사용자의 첫 단계 최초 완료 시각부터 window 초 안에서, 직전 단계 이후에 완료한
+    다음 단계 기록 중 가장 이른 것을 따라간다 (가장 이른 기록을 고르면 이후 단계 도달 가능성이 최대가 된다).
+
+    반환: 단계별 {'step', 'users_reached', 'median_seconds'} - median_seconds 는 직전 단계로부터 걸린 시간의 중앙값
+    """
+    if len(users) == 0:
+        return [{'step': step, 'users_reached': 0, 'median_seconds': None} for step in range(n_steps)]
+    times = np.asarray(times, dtype=np.float64)
+    n_users = int(users.max()) + 1
+
+    # 정렬 없이 사용자별 최솟값(ufunc.at)으로 가장 이른 완료 시각을 구한다 - 미도달은 inf
+    first = steps == 0
+    anchor = np.full(n_users, np.inf)
+    np.minimum.at(anchor, users[first], times[first])
+    deadline = anchor + window
+    previous = anchor
+    result = [{'step': 0, 'users_reached': int(np.isfinite(anchor).sum()), 'median_seconds': None}]
+
+    for step in range(1, n_steps):
+        mask = steps == step
+        step_users = users[mask]
+        step_times = times[mask]
+        # 직전 단계 미도달(inf) 사용자는 비교에서 자연히 제외된다
+        eligible = (step_times >= previous[step_users]) & (step_times <= deadline[step_users])
+        earliest = np.full(n_users, np.inf)
+        np.minimum.at(earliest, step_users[eligible], step_times[eligible])
+        reached = np.isfinite(earliest)
+        gaps = earliest[reached] - previous[reached]
+        result.append({
+            'step': step,
+            'users_reached': int(reached.sum()),
+            'median_seconds': float(np.median(gaps)) if len(gaps) else None,
+        })
+        previous = earliest
+    return result
@@ -0,0 +1,105 @@
+"""백엔드 상태 백그라운드 모니터"""
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import requests
+
+# 지연 히스토그램 구간 상한 (ms)
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class HealthMonitor:
+    """일정 간격으로 가벼운 엔드포인트를 호출해 백엔드 상태를 기록하는 데몬 스레드
+
+    화면 렌더링에서는 snapshot() 으로 마지막 상태만 읽으므로 절대 블로킹되지 않는다.
+    """
+
+    def __init__(self, url: str, interval: float = 15.0, timeout: float = 3.0,
+                 window: int = 120, down_after: int = 2):
+        self.url = url
+        self.interval = interval
+        self.timeout = timeout
+        self.down_after = down_after
+        self.session = requests.Session()
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self._state = 'unknown'
+        self._last_checked: Optional[datetime] = None
+        self._last_latency_ms: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._consecutive_failures = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'HealthMonitor':
+        """모니터 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='backend-health', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """모니터 스레드 중지"""
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(self.interval)
+
+    def probe(self) -> None:
+        """상태 확인 1회 수행"""
+        started = time.perf_counter()
+        error = None
+        try:
+            response = self.session.get(self.url, timeout=self.timeout)
+            ok = response.status_code == 200
+            if not ok:
+                error = f"HTTP {response.status_code}"
+        except requests.exceptions.RequestException as e:
+            ok = False
+            error = str(e)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self._samples.append((latency_ms, ok))
+            self._last_checked = datetime.now()
+            self._last_latency_ms = latency_ms
+            self._last_error = error
+            if ok:
+                self._consecutive_failures = 0
+                self._state = 'up'
+            else:
+                self._consecutive_failures += 1
+                # 일시적인 실패 한 번으로 down 처리하지 않음
+                if self._consecutive_failures >= self.down_after or self._state == 'unknown':
+                    self._state = 'down'
+
+    def snapshot(self) -> Dict[str, Any]:
+        """마지막 상태와 최근 지연 히스토그램"""
+        with self._lock:
+            samples = list(self._samples)
+            result = {
+                'state': self._state,
+                'last_checked': self._last_checked,
+                'last_latency_ms': self._last_latency_ms,
+                'last_error': self._last_error,
+            }
+        latencies = sorted(latency for latency, ok in samples if ok)
+        histogram: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for latency in latencies:
+            histogram[bisect_left(LATENCY_BUCKETS_MS, latency)] += 1
+        labels = [f"≤{bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        result.update({
+            'probes': len(samples),
+            'availability': round(sum(ok for _, ok in samples) / len(samples) * 100, 1) if samples else None,
+            'p50_ms': round(latencies[len(latencies) // 2], 1) if latencies else None,
+            'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1) if latencies else None,
+            'histogram': dict(zip(labels, histogram)),
+        })
+        return result
@@ -0,0 +1,144 @@
+"""KPI 계산식 컴파일러와 일괄 평가
+
+kpi_definitions.calculation_formula 는 '완료된 사용자 수 / 시작한 사용자 수 * 100' 처럼
+항(자연어 이름)과 사칙연산·괄호·숫자로 된 식이다. 식마다 한 번만
+
+- 항 이름을 롤업 큐브의 (팩트, 측정값, 필터) 열로 바꾸고 (다른 항의 식으로 정의된 항은 괄호째 펼친다)
+- 파이썬 식으로 파싱해 허용한 노드(사칙연산, 부호, 숫자, 이 식의 열 변수 c0, c1, ...)만 있는지 확인한 뒤 코드 객체로 컴파일해 둔다.
+
+평가는 (시나리오, 일자) 행 전체에 대한 NumPy 배열 연산 한 번이다. 롤업은 합계만 담으므로
+'사용자 수' 로 적힌 항은 단계 완료·세션 행 수로 세고, 롤업으로 셀 수 없는 항(고유 고객 수, 만족도 등)이 있는 식은 컴파일 오류로 남긴다.
+"""
+import ast
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analytics.rollup import RollupCube
+
+# 항 이름 → (롤업 팩트, 측정값, 필터) 또는 다른 항으로 쓴 식
+OPERANDS: Dict[str, object] = {
+    '시작한 사용자 수': ('stage_completions', 'successes', (('stage_role', ('first',)),)),
+    '완료된 사용자 수': ('stage_completions', 'successes', (('stage_role', ('final',)),)),
+    '이탈한 사용자 수': '시작한 사용자 수 - 완료된 사용자 수',
+    '총 체류시간': ('page_views', 'time_on_page_seconds', ()),
+    '페이지 뷰 수': ('page_views', 'page_views', ()),
+    '페이지 뷰 이벤트 수': ('page_views', 'page_views', ()),
+    '방문한 사용자 수': ('sessions', 'sessions', ()),
+    '총 수익': ('conversions', 'conversion_value', ()),
+}
+# KPI 분류별로 뜻이 다른 항 - 참여도의 이탈은 한 페이지만 보고 떠난 세션
+CATEGORY_OPERANDS: Dict[str, Dict[str, object]] = {
+    'engagement': {'이탈한 사용자 수': ('page_views', 'bounces', ())},
+}
+
+Column = Tuple[str, str, Tuple[Tuple[str, Tuple[str, ...]], ...]]
+
+_TOKENS = re.compile(r'\s*(\d+(?:\.\d+)?|[-+*/()])\s*')
+_ALLOWED_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Add, ast.Sub, ast.Mult, ast.Div,
+                  ast.USub, ast.UAdd, ast.Constant, ast.Name, ast.Load)
+
+
+class FormulaError(ValueError):
+    """컴파일할 수 없는 KPI 계산식"""
+
+
+class CompiledFormula:
+    """컴파일한 KPI 계산식 - columns 는 식이 읽는 롤업 열, 식 안에서는 c0, c1, ... 로 부른다"""
+
+    def __init__(self, formula: str, columns: List[Column], code):
+        self.formula = formula
+        self.columns = columns
+        self._code = code
+
+    def evaluate(self, values: Dict[Column, np.ndarray]) -> np.ndarray:
+        """열별 배열로 식을 계산 - 0 으로 나눈 칸은 NaN"""
+        names = {f"c{index}": np.asarray(values[column], dtype=np.float64) for index, column in enumerate(self.columns)}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = np.asarray(eval(self._code, {'__builtins__': {}}, names), dtype=np.float64)
+        return np.where(np.isfinite(result), result, np.nan)
+
+
+def _expand(formula: str, operands: Dict[str, object], columns: List[Column], depth: int = 0) -> str:
+    """항 이름을 열 변수로 바꾼 파이썬 식"""
+    if depth > len(operands):
+        raise FormulaError(f"순환 정의된 항이 있습니다: {formula}")
+    parts = []
+    for piece in _TOKENS.split(formula):
+        term = piece.strip()
+        if not term or _TOKENS.fullmatch(piece):
+            parts.append(term)
+            continue
+        if term not in operands:
+            raise FormulaError(f"롤업으로 계산할 수 없는 항: {term}")
+        operand = operands[term]
+        if isinstance(operand, str):
+            parts.append(f"({_expand(operand, operands, columns, depth + 1)})")
+            continue
+        if operand not in columns:
+            columns.append(operand)
+        parts.append(f"c{columns.index(operand)}")
+    return ' '.join(parts)
+
+
+def compile_formula(formula: str, category: Optional[str] = None) -> CompiledFormula:
+    """계산식을 한 번 파싱·검증해 컴파일"""
+    if not formula or not formula.strip():
+        raise FormulaError("계산식이 비어 있습니다")
+    operands = {**OPERANDS, **CATEGORY_OPERANDS.get(category, {})}
+    columns: List[Column] = []
+    source = _expand(formula, operands, columns)
+    try:
+        tree = ast.parse(source, mode='eval')
+    except SyntaxError as error:
+        raise FormulaError(f"계산식 문법 오류: {formula}") from error
+    names = {f"c{index}" for index in range(len(columns))}
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES) or (isinstance(node, ast.Name) and node.id not in names):
+            raise FormulaError(f"허용하지 않는 연산: {formula}")
+    return CompiledFormula(formula, columns, compile(tree, '<kpi>', 'eval'))
+
+
+def evaluate_kpis(formulas: Dict[int, CompiledFormula], cube: RollupCube,
+                  since: Dict[int, Optional[pd.Timestamp]], scenarios: Iterable[int],
+                  end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """KPI 별 since 일자부터 end 일자 전까지 (시나리오, 일자) 값 - kpi_id, scenario_id, measurement_date, measured_value 행
+
+    같은 롤업 열은 KPI 사이에 한 번만 조회하고 모든 열을 같은 (시나리오, 일자) 행에 맞춘 뒤 식마다 한 번 계산한다.
+    """
+    result_columns = ['kpi_id', 'scenario_id', 'measurement_date', 'measured_value']
+    if not formulas:
+        return pd.DataFrame(columns=result_columns)
+    starts = [since.get(kpi_id) for kpi_id in formulas]
+    start = None if any(value is None for value in starts) else min(starts)
+    scenarios = list(scenarios)
+    series: Dict[Column, pd.Series] = {}
+    for formula in formulas.values():
+        for column in formula.columns:
+            if column in series:
+                continue
+            fact, measure, filters = column
+            cells = cube.query(fact, ['scenario', 'bucket'], {'scenario': scenarios, **dict(filters)}, start, end)
+            series[column] = cells.set_index(['scenario', 'bucket'])[measure]
+    index = pd.MultiIndex.from_tuples([], names=['scenario', 'bucket'])
+    for values in series.values():
+        index = index.union(values.index)
+    if not len(index):
+        return pd.DataFrame(columns=result_columns)
+    aligned = {column: values.reindex(index, fill_value=0).to_numpy() for column, values in series.items()}
+    buckets = pd.DatetimeIndex(index.get_level_values('bucket'))
+    frames = []
+    for kpi_id, formula in formulas.items():
+        values = formula.evaluate({column: aligned[column] for column in formula.columns})
+        keep = ~np.isnan(values)
+        if since.get(kpi_id) is not None:
+            keep &= buckets >= since[kpi_id]
+        frames.append(pd.DataFrame({
+            'kpi_id': kpi_id,
+            'scenario_id': index.get_level_values('scenario')[keep].astype(np.int64),
+            'measurement_date': buckets[keep],
+            'measured_value': np.round(values[keep], 4),
+        }))
+    return pd.concat(frames, ignore_index=True)
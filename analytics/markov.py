@@ -0,0 +1,121 @@
+"""여정 이탈 마르코프 모델
+
+사용자별 시간 순 상태 열(여정 단계 완료, 페이지 뷰의 page_category)로 상태 간 전이 횟수를 센다.
+시작(START)에서 첫 상태로, 마지막 상태에서 흡수 상태인 이탈(EXIT)로 가는 전이를 더하고
+전환 상태에 도달한 뒤의 행은 버린다. 전이 횟수는 희소 행렬 한 번의 COO → CSR 변환으로 합산한다.
+
+- 전환 확률: 흡수 마르코프 체인에서 (I - Q) x = r 의 해 (Q 는 비흡수 상태 간 전이 확률, r 은 전환으로 가는 확률)
+- 제거 효과: 상태 s 를 지나는 흐름을 모두 이탈로 돌렸을 때 START 의 전환 확률이 줄어드는 비율
+- 전환까지 기대 단계 수: 전환 확률 x 로 조건을 건 체인 Q'_ij = Q_ij x_j / x_i 의 흡수까지 기대 전이 수
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+
+def transition_matrix(users: np.ndarray, states: np.ndarray, times: np.ndarray, n_states: int,
+                      absorbing: Sequence[int] = ()) -> sparse.csr_matrix:
+    """(n_states + 2) 정방 전이 횟수 행렬 - 인덱스 n_states 는 START, n_states + 1 은 EXIT
+
+    사용자가 absorbing 상태에 처음 도달한 뒤의 행은 세지 않고, 흡수 상태로 끝나지 않은 열은 EXIT 로 닫는다.
+    """
+    start, exit_state = n_states, n_states + 1
+    shape = (n_states + 2, n_states + 2)
+    if len(users) == 0:
+        return sparse.csr_matrix(shape, dtype=np.int64)
+    order = np.lexsort((times, users))
+    users, states = users[order], states[order]
+    absorbed = np.isin(states, absorbing)
+
+    # 사용자별로 앞선 흡수 상태가 없는 행만 남긴다
+    first = np.concatenate(([True], users[1:] != users[:-1]))
+    before = np.cumsum(absorbed) - absorbed
+    owner = np.cumsum(first) - 1
+    keep = before == before[first][owner]
+    users, states, absorbed = users[keep], states[keep], absorbed[keep]
+
+    first = np.concatenate(([True], users[1:] != users[:-1]))
+    last = np.concatenate((users[1:] != users[:-1], [True]))
+    closing = last & ~absorbed
+    source = np.concatenate((np.full(int(first.sum()), start), states[:-1][~last[:-1]], states[closing]))
+    target = np.concatenate((states[first], states[1:][~last[:-1]], np.full(int(closing.sum()), exit_state)))
+    counts = sparse.coo_matrix((np.ones(len(source), dtype=np.int64), (source, target)), shape=shape)
+    return counts.tocsr()
+
+
+class DropoutModel:
+    """전이 횟수 행렬에서 전환 확률, 제거 효과, 전환까지 기대 단계 수 계산
+
+    counts 의 마지막 두 상태는 START, EXIT 이고 conversion 은 흡수 상태인 전환 상태의 인덱스다.
+    """
+
+    def __init__(self, counts: sparse.csr_matrix, conversion: int):
+        self.counts = counts.tocsr()
+        self.conversion = conversion
+        self.start = counts.shape[0] - 2
+        self.exit = counts.shape[0] - 1
+        self.visits = np.asarray(self.counts.sum(axis=1)).ravel()
+        probabilities = sparse.diags(1 / np.maximum(self.visits, 1)) @ self.counts
+        # 나가는 전이가 있는 상태만 비흡수 상태로 본다 (전환·이탈·한 번도 나오지 않은 상태 제외)
+        self.transient = np.flatnonzero(self.visits > 0)
+        self.Q = probabilities[self.transient][:, self.transient].tocsc()
+        self.r = probabilities[self.transient][:, [conversion]].toarray().ravel()
+        self._system = (sparse.identity(len(self.transient), format='csc') - self.Q).tocsr()
+        self._position = {state: index for index, state in enumerate(self.transient.tolist())}
+
+    def _solve(self, removed: Optional[int] = None) -> np.ndarray:
+        """비흡수 상태별 전환 확률 - removed 상태는 이탈로 바꾼다 (전환 확률 0 이므로 연립방정식에서 뺀다)"""
+        keep = np.ones(len(self.transient), dtype=bool)
+        if removed is not None and removed in self._position:
+            keep[self._position[removed]] = False
+        indices = np.flatnonzero(keep)
+        system = self._system[indices][:, indices]
+        x = np.zeros(len(self.transient))
+        x[indices] = np.atleast_1d(spsolve(system.tocsc(), self.r[indices]))
+        return x
+
+    def conversion_probability(self) -> Dict[int, float]:
+        """상태별 전환 확률"""
+        return dict(zip(self.transient.tolist(), self._solve().tolist()))
+
+    def removal_effects(self, states: Sequence[int]) -> Dict[int, float]:
+        """상태별 제거 효과 (0 ~ 1) - START 의 전환 확률 감소 비율"""
+        base = self._solve()[self._position[self.start]] if self.start in self._position else 0.0
+        effects = {}
+        for state in states:
+            removed = self._solve(state)[self._position[self.start]] if base else 0.0
+            effects[state] = float(1 - removed / base) if base else 0.0
+        return effects
+
+    def expected_steps(self) -> Dict[int, float]:
+        """전환하는 경우에 한한 상태별 전환까지 기대 전이 수 (전환 확률 0 인 상태 제외)"""
+        x = self._solve()
+        reachable = np.flatnonzero(x > 1e-12)
+        if not len(reachable):
+            return {}
+        scale = sparse.diags(1 / x[reachable])
+        conditioned = scale @ self.Q[reachable][:, reachable] @ sparse.diags(x[reachable])
+        system = sparse.identity(len(reachable), format='csc') - conditioned.tocsc()
+        steps = np.atleast_1d(spsolve(system, np.ones(len(reachable))))
+        return dict(zip(self.transient[reachable].tolist(), steps.tolist()))
+
+    def table(self, labels: List[str], states: Sequence[int]) -> List[Dict[str, Any]]:
+        """상태별 방문 수, 이탈률, 전환 확률, 제거 효과, 전환까지 기대 단계 수"""
+        probability = self.conversion_probability()
+        effects = self.removal_effects(states)
+        steps = self.expected_steps()
+        exits = self.counts[:, [self.exit]].toarray().ravel()
+        rows = []
+        for state in states:
+            visits = int(self.visits[state])
+            rows.append({
+                'state': labels[state],
+                'visits': visits,
+                'exit_rate': round(exits[state] / visits * 100, 1) if visits else 0.0,
+                'conversion_probability': round(probability.get(state, 0.0) * 100, 1),
+                'removal_effect': round(effects[state] * 100, 1),
+                'expected_steps_to_convert': round(steps[state], 2) if state in steps else None,
+            })
+        return rows
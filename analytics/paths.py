@@ -0,0 +1,183 @@
+"""세션 경로 분석 (접두사 트리)
+
+세션마다 처음 max_depth 개의 페이지(또는 액션) 순서를 접두사 트리에 누적한다.
+노드는 (부모 노드, 토큰) 정수 키로 찾고 깊이별로 청크 전체를 한 번에 처리하므로 세션별 파이썬 루프가 없다.
+
+메모리는 손실 카운팅(lossy counting)으로 제한한다. 청크를 반영할 때마다 지금까지 본 세션 수 N 에 대해
+count + delta <= epsilon * N 인 노드(와 그 하위 노드)를 버린다. 버린 경로가 다시 나오면 delta = epsilon * N 을
+안고 새로 세므로 어떤 경로의 세션 수도 실제보다 최대 epsilon * N 만큼만 적게 센다.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MAX_DEPTH = 5
+MIN_SUPPORT = 0.001
+
+_TOKEN_BITS = 24
+
+
+def session_chunks(frames: Iterable[pd.DataFrame], column: str = 'session_id') -> Iterator[pd.DataFrame]:
+    """세션 순으로 정렬된 프레임 스트림을 세션 경계에서 다시 잘라 각 청크가 완결된 세션만 담게 한다"""
+    carry = None
+    for frame in frames:
+        if carry is not None:
+            frame = pd.concat([carry, frame], ignore_index=True)
+        if frame.empty:
+            continue
+        # 마지막 세션은 다음 프레임에 이어질 수 있으므로 남겨 둔다
+        last = frame[column].iloc[-1]
+        cut = len(frame) - int(np.count_nonzero(frame[column].to_numpy() == last))
+        carry = frame.iloc[cut:]
+        if cut:
+            yield frame.iloc[:cut]
+    if carry is not None and not carry.empty:
+        yield carry
+
+
+class PathTrie:
+    """세션 경로 접두사 트리
+
+    노드별 count 는 그 접두사를 지난 세션 수, ends 는 그 노드에서 경로가 끝난 세션 수다.
+    같은 토큰이 연속되면 (새로고침 등) 한 번으로 본다.
+    """
+
+    def __init__(self, max_depth: int = MAX_DEPTH, min_support: float = MIN_SUPPORT,
+                 epsilon: Optional[float] = None):
+        self.max_depth = max_depth
+        self.min_support = min_support
+        self.epsilon = epsilon if epsilon is not None else min_support / 10
+        self.sessions = 0
+        self._tokens = pd.Index([])
+        self._keys = pd.Index(np.zeros(0, dtype=np.int64))
+        self._parent = np.zeros(0, dtype=np.int64)
+        self._token = np.zeros(0, dtype=np.int64)
+        self._depth = np.zeros(0, dtype=np.int64)
+        self._count = np.zeros(0, dtype=np.int64)
+        self._ends = np.zeros(0, dtype=np.int64)
+        self._delta = np.zeros(0, dtype=np.int64)
+
+    @property
+    def nodes(self) -> int:
+        return len(self._keys)
+
+    def _token_codes(self, tokens) -> np.ndarray:
+        values = pd.Categorical(tokens)
+        codes = self._tokens.get_indexer(values.categories)
+        missing = codes < 0
+        if missing.any():
+            codes[missing] = np.arange(len(self._tokens), len(self._tokens) + missing.sum())
+            new_tokens = values.categories[missing]
+            self._tokens = self._tokens.append(new_tokens) if len(self._tokens) else new_tokens
+        return codes[values.codes]
+
+    @staticmethod
+    def _node_keys(parents: np.ndarray, tokens: np.ndarray) -> np.ndarray:
+        # 부모가 없는 첫 단계는 -1 이므로 1을 더해 음수를 피한다
+        return ((parents + 1) << _TOKEN_BITS) | tokens
+
+    def _nodes_for(self, parents: np.ndarray, tokens: np.ndarray, depth: int) -> np.ndarray:
+        """(부모, 토큰) 의 노드 번호 - 없는 노드는 만든다"""
+        keys = self._node_keys(parents, tokens)
+        ids = self._keys.get_indexer(keys)
+        missing = ids < 0
+        if missing.any():
+            new_keys, first = np.unique(keys[missing], return_index=True)
+            count = len(new_keys)
+            self._keys = self._keys.append(pd.Index(new_keys))
+            self._parent = np.concatenate([self._parent, parents[missing][first]])
+            self._token = np.concatenate([self._token, tokens[missing][first]])
+            self._depth = np.concatenate([self._depth, np.full(count, depth)])
+            self._count = np.concatenate([self._count, np.zeros(count, dtype=np.int64)])
+            self._ends = np.concatenate([self._ends, np.zeros(count, dtype=np.int64)])
+            self._delta = np.concatenate([self._delta, np.full(count, int(self.epsilon * self.sessions))])
+            ids[missing] = self._keys.get_indexer(keys[missing])
+        return ids
+
+    def update(self, session_ids, tokens) -> int:
+        """세션·시각 순으로 정렬된 (session_id, 토큰) 행 반영 - 청크 안의 세션은 완결돼 있어야 한다
+
+        반영한 세션 수를 반환한다.
+        """
+        if len(session_ids) == 0:
+            return 0
+        sessions = pd.factorize(np.asarray(session_ids))[0]
+        codes = self._token_codes(tokens)
+        new_session = np.concatenate(([True], sessions[1:] != sessions[:-1]))
+        repeated = ~new_session & np.concatenate(([False], codes[1:] == codes[:-1]))
+        sessions, codes, new_session = sessions[~repeated], codes[~repeated], new_session[~repeated]
+        session_index = np.cumsum(new_session) - 1
+        starts = np.flatnonzero(new_session)
+        position = np.arange(len(codes)) - starts[session_index]
+
+        n_sessions = len(starts)
+        node = np.full(n_sessions, -1, dtype=np.int64)
+        for depth in range(self.max_depth):
+            rows = position == depth
+            if not rows.any():
+                break
+            owners = session_index[rows]
+            ids = self._nodes_for(node[owners], codes[rows], depth)
+            self._count += np.bincount(ids, minlength=len(self._count))
+            node[owners] = ids
+        self._ends += np.bincount(node, minlength=len(self._ends))
+        self.sessions += n_sessions
+        self._prune()
+        return n_sessions
+
+    def _prune(self):
+        """손실 카운팅 기준에 못 미치는 노드와 그 하위 노드 제거"""
+        drop = self._count + self._delta <= self.epsilon * self.sessions
+        if not drop.any():
+            return
+        for _ in range(self.max_depth):
+            drop |= (self._parent >= 0) & drop[np.maximum(self._parent, 0)]
+        keep = ~drop
+        new_ids = np.cumsum(keep) - 1
+        parent = self._parent[keep]
+        self._parent = np.where(parent >= 0, new_ids[np.maximum(parent, 0)], -1)
+        self._token = self._token[keep]
+        self._depth = self._depth[keep]
+        self._count = self._count[keep]
+        self._ends = self._ends[keep]
+        self._delta = self._delta[keep]
+        self._keys = pd.Index(self._node_keys(self._parent, self._token))
+
+    def _path(self, node: int) -> List[str]:
+        path = []
+        while node >= 0:
+            path.append(self._tokens[self._token[node]])
+            node = self._parent[node]
+        return path[::-1]
+
+    def top_paths(self, k: int = 10) -> List[Dict[str, Any]]:
+        """세션 수 기준 상위 k 개 경로 - 지지도(min_support - epsilon) 이상인 노드에서 끝난 경로만"""
+        if not self.sessions:
+            return []
+        threshold = (self.min_support - self.epsilon) * self.sessions
+        candidates = np.flatnonzero((self._count >= threshold) & (self._ends > 0))
+        top = candidates[np.argsort(-self._ends[candidates], kind='stable')[:k]]
+        return [{
+            'path': self._path(node),
+            'sessions': int(self._ends[node]),
+            'share': round(self._ends[node] / self.sessions * 100, 1),
+        } for node in top.tolist()]
+
+    def sankey(self, k: int = 10, exit_label: str = '이탈') -> Dict[str, Any]:
+        """상위 k 개 경로의 Sankey 노드·링크
+
+        같은 깊이의 같은 토큰은 한 노드로 합치고, 경로의 마지막 단계는 exit_label 노드로 이어 한 페이지 세션도 보이게 한다.
+        """
+        labels: Dict[tuple, int] = {}
+        links: Dict[tuple, int] = {}
+        for path in self.top_paths(k):
+            steps = [labels.setdefault((depth, token), len(labels)) for depth, token in enumerate(path['path'])]
+            steps.append(labels.setdefault((None, exit_label), len(labels)))
+            for source, target in zip(steps, steps[1:]):
+                links[(source, target)] = links.get((source, target), 0) + path['sessions']
+        return {
+            'nodes': [{'label': token, 'depth': depth} for depth, token in labels],
+            'links': [{'source': source, 'target': target, 'value': value}
+                      for (source, target), value in links.items()],
+        }
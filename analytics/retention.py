@@ -0,0 +1,193 @@
+"""코호트 재방문 엔진
+
+user_sessions 의 (사용자, 시작 시각) 으로 첫 방문 기간(코호트) × 경과 기간별 재방문 사용자 수를 유지한다.
+
+- 사용자는 처음 본 순서대로 정수 코드를, 기간은 유닉스 일자(또는 월요일 시작 주) 번호를 받는다.
+- (사용자, 기간) 활동 쌍을 `사용자 << 32 | 기간` 정수 키의 정렬 배열로 보관하고,
+  새 세션 배치에서는 처음 보는 쌍만 골라 bincount 한 번으로 행렬에 더한다 (사용자별 파이썬 루프 없음).
+- 이미 본 기간보다 이른 세션이 늦게 들어와 사용자의 코호트가 바뀌면 그 사용자의 기존 기여분을 빼고 다시 더한다.
+"""
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+EPOCH = date(1970, 1, 1)
+GRANULARITIES = ('day', 'week')
+
+_PERIOD_BITS = 32
+_PERIOD_MASK = (1 << _PERIOD_BITS) - 1
+_NO_COHORT = np.iinfo(np.int64).max
+
+
+def period_codes(timestamps, granularity: str = 'day') -> np.ndarray:
+    """시각 배열을 기간 번호로 변환 - 일자는 1970-01-01 부터의 일수, 주는 월요일 시작 주 번호"""
+    days = np.asarray(timestamps, dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+    # 1970-01-01 은 목요일이므로 3일을 더해 월요일에 주 경계를 맞춘다
+    return days if granularity == 'day' else (days + 3) // 7
+
+
+def period_start(period: int, granularity: str = 'day') -> date:
+    """기간 번호의 첫날"""
+    return EPOCH + timedelta(days=int(period) if granularity == 'day' else int(period) * 7 - 3)
+
+
+class RetentionEngine:
+    """첫 방문 코호트 × 경과 기간 재방문 행렬을 증분으로 유지하는 엔진
+
+    counts[c, k] 는 코호트 c 사용자 중 첫 방문 후 k 기간째에 세션이 있는 사용자 수이고
+    counts[c, 0] 은 코호트 크기다.
+    """
+
+    def __init__(self, granularity: str = 'day', initial_capacity: int = 1024):
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity 는 {GRANULARITIES} 중 하나여야 합니다")
+        self.granularity = granularity
+        self._lock = threading.Lock()
+        self._users = pd.Index([])
+        self._first = np.full(initial_capacity, _NO_COHORT, dtype=np.int64)
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._counts = np.zeros((0, 0), dtype=np.int64)
+        self._origin = 0
+        self._last = None
+
+    def _user_codes(self, user_ids, add: bool = True) -> np.ndarray:
+        """user_id 를 정수 코드로 변환 - add 가 아니면 모르는 사용자는 -1
+
+        코드는 사용자 인덱스의 위치다. 해시 테이블을 가진 pd.Index 로 조회하므로 배치 크기에 비례하는 비용만 든다.
+        """
+        values = pd.Categorical(user_ids)
+        codes = self._users.get_indexer(values.categories)
+        missing = codes < 0
+        if add and missing.any():
+            codes[missing] = np.arange(len(self._users), len(self._users) + missing.sum())
+            new_users = values.categories[missing]
+            self._users = self._users.append(new_users) if len(self._users) else new_users
+        return np.where(values.codes >= 0, codes[values.codes], -1)
+
+    def _ensure_capacity(self, size: int):
+        capacity = len(self._first)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        grown = np.full(capacity, _NO_COHORT, dtype=np.int64)
+        grown[:len(self._first)] = self._first
+        self._first = grown
+
+    def _grow(self, low: int, high: int, width: int):
+        """코호트 [low, high] 와 경과 기간 width 칸을 담도록 행렬 확장"""
+        rows, columns = self._counts.shape
+        origin = min(self._origin, low) if rows else low
+        top = self._origin - origin if rows else 0
+        new_rows = max(top + rows, high - origin + 1)
+        new_columns = max(columns, width)
+        if (new_rows, new_columns) == (rows, columns):
+            return
+        grown = np.zeros((new_rows, new_columns), dtype=np.int64)
+        grown[top:top + rows, :columns] = self._counts
+        self._counts, self._origin = grown, origin
+
+    def _accumulate(self, users: np.ndarray, periods: np.ndarray, sign: int):
+        """활동 쌍을 사용자의 현재 코호트 기준으로 행렬에 더하거나(sign=1) 뺀다(sign=-1)"""
+        if not len(users):
+            return
+        cohorts = self._first[users]
+        offsets = periods - cohorts
+        self._grow(int(cohorts.min()), int(cohorts.max()), int(offsets.max()) + 1)
+        rows, columns = self._counts.shape
+        flat = (cohorts - self._origin) * columns + offsets
+        self._counts += sign * np.bincount(flat, minlength=rows * columns).reshape(rows, columns)
+
+    def update(self, user_ids, timestamps) -> int:
+        """세션 배치 반영 - 새로 생긴 (사용자, 기간) 활동 쌍의 수를 반환"""
+        if len(user_ids) == 0:
+            return 0
+        with self._lock:
+            codes = self._user_codes(user_ids)
+            periods = period_codes(timestamps, self.granularity)
+            keys = np.unique((codes << _PERIOD_BITS) | periods)
+            positions = np.searchsorted(self._keys, keys)
+            known = positions < len(self._keys)
+            known[known] = self._keys[positions[known]] == keys[known]
+            new, positions = keys[~known], positions[~known]
+            if not len(new):
+                return 0
+            users, periods = new >> _PERIOD_BITS, new & _PERIOD_MASK
+
+            self._ensure_capacity(len(self._users))
+            touched = np.unique(users)
+            before = self._first[touched]
+            np.minimum.at(self._first, users, periods)
+            # 더 이른 기간이 늦게 들어와 코호트가 바뀐 사용자는 기존 기여분을 옮긴다
+            moved = touched[(self._first[touched] < before) & (before != _NO_COHORT)]
+            if len(moved):
+                rows = np.flatnonzero(np.isin(self._keys >> _PERIOD_BITS, moved))
+                old_users, old_periods = self._keys[rows] >> _PERIOD_BITS, self._keys[rows] & _PERIOD_MASK
+                current = self._first[moved]
+                self._first[moved] = before[np.searchsorted(touched, moved)]
+                self._accumulate(old_users, old_periods, -1)
+                self._first[moved] = current
+                self._accumulate(old_users, old_periods, 1)
+
+            self._accumulate(users, periods, 1)
+            self._keys = np.insert(self._keys, positions, new)
+            last = int(periods.max())
+            self._last = last if self._last is None else max(self._last, last)
+            return int(len(new))
+
+    def matrix(self, user_ids: Optional[Iterable] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(코호트 기간 번호, 재방문 사용자 수 행렬) - user_ids 를 주면 해당 사용자만 활동 쌍에서 다시 집계"""
+        with self._lock:
+            if user_ids is None:
+                counts = self._counts.copy()
+            else:
+                codes = self._user_codes(list(user_ids), add=False)
+                selected = np.isin(self._keys >> _PERIOD_BITS, codes[codes >= 0])
+                users = self._keys[selected] >> _PERIOD_BITS
+                offsets = (self._keys[selected] & _PERIOD_MASK) - self._first[users]
+                rows, columns = self._counts.shape
+                flat = (self._first[users] - self._origin) * columns + offsets
+                counts = np.bincount(flat, minlength=rows * columns).reshape(rows, columns)
+            cohorts = self._origin + np.arange(len(counts))
+            present = counts[:, 0] > 0 if counts.size else np.zeros(len(counts), dtype=bool)
+            return cohorts[present], counts[present]
+
+    def table(self, user_ids: Optional[Iterable] = None, max_offset: Optional[int] = None) -> Dict[str, Any]:
+        """코호트 재방문율 표
+
+        rates[c][k] 는 코호트 크기 대비 k 기간째 재방문율(%)이고 아직 관측할 수 없는 칸은 None 이다.
+        return_rate 는 두 기간 이상 방문한 사용자 비율(%) 이다.
+        """
+        cohorts, counts = self.matrix(user_ids)
+        if max_offset is not None:
+            counts = counts[:, :max_offset + 1]
+        sizes = counts[:, 0] if counts.size else np.zeros(len(cohorts), dtype=np.int64)
+        width = counts.shape[1] if counts.ndim == 2 else 0
+        rates = np.round(counts / np.maximum(sizes, 1)[:, None] * 100, 1) if width else counts.astype(float)
+        observable = (cohorts[:, None] + np.arange(width)[None, :]) <= (self._last if self._last is not None else -1)
+        returning = int(sizes.sum() - self._single_period_users(user_ids))
+        return {
+            'granularity': self.granularity,
+            'cohorts': [period_start(cohort, self.granularity).isoformat() for cohort in cohorts.tolist()],
+            'cohort_sizes': sizes.tolist(),
+            'offsets': list(range(width)),
+            'rates': [[rate if seen else None for rate, seen in zip(row, mask)]
+                      for row, mask in zip(rates.tolist(), observable.tolist())],
+            'return_rate': round(returning / sizes.sum() * 100, 1) if sizes.sum() else 0.0,
+        }
+
+    def _single_period_users(self, user_ids: Optional[Iterable] = None) -> int:
+        """한 기간에만 방문한 사용자 수"""
+        with self._lock:
+            users = self._keys >> _PERIOD_BITS
+            if user_ids is not None:
+                codes = self._user_codes(list(user_ids), add=False)
+                users = users[np.isin(users, codes[codes >= 0])]
+            return int(np.count_nonzero(np.bincount(users) == 1)) if len(users) else 0
+
+    def users(self) -> int:
+        with self._lock:
+            return len(self._users)
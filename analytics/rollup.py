@@ -0,0 +1,163 @@
+"""시간 구간 × 차원 롤업 큐브
+
+세션·페이지 뷰·전환·단계 완료 행을 (시간 구간, 차원...) 셀의 합계로 미리 묶어 두면
+기기·브라우저·국가·페이지 분류·전환 유형별 분해와 필터를 원시 테이블을 다시 읽지 않고 작은 셀 표에서 계산할 수 있다.
+
+- 새 배치는 시간 단위로 묶은 뒤 기존 셀과 합산한다 (증분 추가).
+- 가장 최근 시각으로부터 hourly_days 일이 지난 시간 셀은 일 단위 셀로 말아 올려 큐브 크기를 제한한다.
+- 합계만 담으므로 같은 셀을 여러 번 더해도 결과가 정확하다 (고유 개수는 analytics.sketch 를 쓴다).
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+UNKNOWN = '알 수 없음'
+HOURLY_DAYS = 7
+
+# 팩트별 시각 컬럼, 차원, 측정값 (측정값: 합산할 컬럼, None 이면 행 수)
+FACTS: Dict[str, Dict[str, Any]] = {
+    'sessions': {
+        'time': 'started_at',
+        'dimensions': ['scenario', 'device_type', 'browser', 'country'],
+        'measures': {'sessions': None, 'duration_seconds': 'duration_seconds'},
+    },
+    'page_views': {
+        'time': 'viewed_at',
+        'dimensions': ['scenario', 'device_type', 'browser', 'country', 'page_category'],
+        'measures': {'page_views': None, 'time_on_page_seconds': 'time_on_page_seconds', 'bounces': 'is_bounce'},
+    },
+    'conversions': {
+        'time': 'converted_at',
+        'dimensions': ['scenario', 'device_type', 'browser', 'country', 'conversion_type'],
+        'measures': {'conversions': None, 'conversion_value': 'conversion_value'},
+    },
+    # stage_role 은 시나리오의 첫 단계(first)·마지막 단계(final)·그 밖(middle)
+    'stage_completions': {
+        'time': 'completed_at',
+        'dimensions': ['scenario', 'stage_role'],
+        'measures': {'completions': None, 'successes': 'is_successful'},
+    },
+}
+
+
+class RollupCube:
+    """팩트별 시간 셀(최근 hourly_days 일)과 일 셀을 유지하는 롤업 큐브
+
+    셀 표는 (bucket, 차원...) MultiIndex 와 측정값 컬럼을 가진 DataFrame 이다.
+    """
+
+    def __init__(self, facts: Optional[Dict[str, Dict[str, Any]]] = None, hourly_days: int = HOURLY_DAYS):
+        self.facts = facts or FACTS
+        self.hourly_days = hourly_days
+        self._lock = threading.Lock()
+        self._hourly = {fact: self._empty(fact) for fact in self.facts}
+        self._daily = {fact: self._empty(fact) for fact in self.facts}
+        # 일 단위 조회용 평평한 셀 표 - 추가가 있을 때만 다시 만든다
+        self._day_view: Dict[str, pd.DataFrame] = {}
+
+    def _empty(self, fact: str) -> pd.DataFrame:
+        spec = self.facts[fact]
+        index = pd.MultiIndex.from_arrays([[] for _ in range(len(spec['dimensions']) + 1)],
+                                          names=['bucket'] + spec['dimensions'])
+        return pd.DataFrame({measure: pd.Series(dtype=np.float64) for measure in spec['measures']}, index=index)
+
+    def _aggregate(self, fact: str, frame: pd.DataFrame, unit: str) -> pd.DataFrame:
+        """행을 unit('h' 또는 'D') 구간과 차원으로 묶은 셀 합계"""
+        spec = self.facts[fact]
+        columns = {'bucket': np.asarray(frame[spec['time']], dtype='datetime64[ns]').astype(f'datetime64[{unit}]')}
+        for dimension in spec['dimensions']:
+            values = frame[dimension] if dimension in frame else pd.Series(UNKNOWN, index=frame.index)
+            columns[dimension] = values.astype(object).where(values.notna(), UNKNOWN).to_numpy()
+        for measure, column in spec['measures'].items():
+            if column is None:
+                columns[measure] = np.ones(len(frame))
+            elif column in frame:
+                columns[measure] = pd.to_numeric(frame[column], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+            else:
+                columns[measure] = np.zeros(len(frame))
+        cells = pd.DataFrame(columns)
+        return cells.groupby(['bucket'] + spec['dimensions'], sort=False).sum()
+
+    @staticmethod
+    def _merge(cells: pd.DataFrame, other: pd.DataFrame) -> pd.DataFrame:
+        if cells.empty:
+            return other
+        if other.empty:
+            return cells
+        merged = pd.concat([cells, other])
+        return merged.groupby(level=list(range(merged.index.nlevels)), sort=False).sum()
+
+    @staticmethod
+    def _to_daily(cells: pd.DataFrame) -> pd.DataFrame:
+        """시간 셀을 일 셀로 말아 올리기"""
+        if cells.empty:
+            return cells
+        levels = list(cells.index.names)
+        flat = cells.reset_index()
+        flat['bucket'] = flat['bucket'].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        return flat.groupby(levels, sort=False).sum()
+
+    def append(self, fact: str, frame: pd.DataFrame) -> int:
+        """팩트 행 배치 추가 - 추가한 행 수를 반환"""
+        if frame is None or frame.empty:
+            return 0
+        hourly = self._aggregate(fact, frame, 'h')
+        with self._lock:
+            self._hourly[fact] = self._merge(self._hourly[fact], hourly)
+            self._compact(fact)
+            self._day_view.pop(fact, None)
+        return len(frame)
+
+    def _compact(self, fact: str):
+        """최근 hourly_days 일 이전의 시간 셀을 일 셀로 옮기기"""
+        hourly = self._hourly[fact]
+        if hourly.empty:
+            return
+        buckets = hourly.index.get_level_values('bucket')
+        cutoff = (buckets.max() - pd.Timedelta(days=self.hourly_days)).floor('D')
+        old = buckets < cutoff
+        if old.any():
+            self._daily[fact] = self._merge(self._daily[fact], self._to_daily(hourly[old]))
+            self._hourly[fact] = hourly[~old]
+
+    def cells(self, fact: str, granularity: str = 'day') -> pd.DataFrame:
+        """평평한 셀 표 - day 는 일 셀과 말아 올린 시간 셀, hour 는 시간 셀(최근 hourly_days 일)만"""
+        with self._lock:
+            if granularity == 'hour':
+                return self._hourly[fact].reset_index()
+            if fact not in self._day_view:
+                self._day_view[fact] = self._merge(self._daily[fact], self._to_daily(self._hourly[fact])).reset_index()
+            return self._day_view[fact]
+
+    def query(self, fact: str, by: Iterable[str] = (), filters: Optional[Dict[str, Iterable]] = None,
+              start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None,
+              granularity: str = 'day') -> pd.DataFrame:
+        """기간·차원 필터를 건 셀을 by 차원(과 'bucket')으로 합산
+
+        end 는 그 시각 이전(미포함)까지다.
+        """
+        cells = self.cells(fact, granularity)
+        mask = np.ones(len(cells), dtype=bool)
+        if start is not None:
+            mask &= (cells['bucket'] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (cells['bucket'] < pd.Timestamp(end)).to_numpy()
+        for dimension, values in (filters or {}).items():
+            mask &= cells[dimension].isin(list(values)).to_numpy()
+        measures = list(self.facts[fact]['measures'])
+        by = list(by)
+        if not by:
+            return cells.loc[mask, measures].sum().to_frame().T
+        return cells[mask].groupby(by, sort=True)[measures].sum().reset_index()
+
+    def values(self, fact: str, dimension: str) -> List[Any]:
+        """차원에 나타난 값 목록"""
+        cells = self.cells(fact)
+        return sorted(cells[dimension].unique().tolist(), key=str) if dimension in cells else []
+
+    def nbytes(self) -> int:
+        with self._lock:
+            frames = list(self._hourly.values()) + list(self._daily.values())
+        return int(sum(frame.memory_usage(index=True, deep=True).sum() for frame in frames))
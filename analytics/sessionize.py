@@ -0,0 +1,207 @@
+"""비활성 간격 기반 세션 분할
+
+session_id 없이 들어오는 원시 클릭스트림(page_view_events / user_action_events 행)을
+사용자·시각 순으로 정렬해 비활성 간격(기본 30분)마다 세션을 나누고 user_sessions 행을 만든다.
+
+청크 스트림을 받아 청크마다 닫힌 세션과 그 이벤트를 내보내므로, 메모리는 청크 크기와 열린 세션
+(의 이벤트) 수에만 비례한다. 청크는 시각 순으로 들어온다고 가정한다 - 마지막 이벤트 후 간격이 지나지
+않은 세션은 닫지 않고 다음 청크로 넘겨 이어 붙이고, 청크의 가장 늦은 시각(워터마크) 기준으로 간격이
+지난 세션만 내보낸다.
+"""
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+SESSION_GAP = pd.Timedelta(minutes=30)
+
+EVENT_COLUMNS = ['user_id', 'timestamp', 'page_url', 'event_type']
+SESSION_COLUMNS = ['session_id', 'user_id', 'started_at', 'ended_at', 'landing_page',
+                   'page_views', 'events', 'duration_seconds', 'is_bounce']
+
+
+# 원시 이벤트 테이블별 (시각 컬럼, event_type)
+CLICKSTREAM_SOURCES = (('viewed_at', 'page_view'), ('performed_at', 'action'))
+
+
+def _times(frame: pd.DataFrame, column: str) -> np.ndarray:
+    return pd.to_datetime(frame[column]).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+
+
+def iter_chunks(events: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """이벤트를 시각 순 chunk_size 행씩 나누기 - 프레임을 통째로 정렬하지 않고 정렬 순서(행당 8바이트)만 만든다"""
+    order = np.argsort(_times(events, 'timestamp'), kind='stable')
+    for start in range(0, len(order), chunk_size):
+        yield events.iloc[order[start:start + chunk_size]]
+
+
+def clickstream_chunks(page_views: Optional[pd.DataFrame] = None, actions: Optional[pd.DataFrame] = None,
+                       chunk_size: int = 500_000) -> Iterator[pd.DataFrame]:
+    """page_view_events / user_action_events 행을 시각 순 이벤트 청크로 나누기
+
+    청크는 원래 컬럼에 시각 컬럼을 timestamp 로 바꾸고 event_type 을 붙인 형태다.
+    두 프레임을 합치지 않고 시각 배열의 정렬 순서만 만든 뒤 청크마다 해당 행만 꺼낸다.
+    """
+    sources = [(frame, column, event_type)
+               for frame, (column, event_type) in zip((page_views, actions), CLICKSTREAM_SOURCES)
+               if frame is not None and not frame.empty]
+    if not sources:
+        return
+    offsets = np.cumsum([0] + [len(frame) for frame, _, _ in sources])
+    order = np.argsort(np.concatenate([_times(frame, column) for frame, column, _ in sources]), kind='stable')
+    for start in range(0, len(order), chunk_size):
+        rows = order[start:start + chunk_size]
+        pieces = []
+        for (frame, column, event_type), first, last in zip(sources, offsets[:-1], offsets[1:]):
+            picked = rows[(rows >= first) & (rows < last)] - first
+            if len(picked):
+                pieces.append(frame.iloc[picked].rename(columns={column: 'timestamp'}).assign(event_type=event_type))
+        yield pd.concat(pieces, ignore_index=True)
+
+
+class Sessionizer:
+    """청크 경계를 넘어 열린 세션을 이어 가는 벡터화 세션 분할기
+
+    process() 는 청크의 이벤트에 session_id 를 붙여 돌려주고, 이번 청크에서 끝난 세션을 함께 돌려준다.
+    스트림이 끝나면 flush() 로 아직 열린 세션을 모두 닫는다.
+    """
+
+    def __init__(self, gap: pd.Timedelta = SESSION_GAP, id_prefix: str = 'sess_', id_width: int = 8,
+                 start_id: int = 1):
+        self.gap = pd.Timedelta(gap)
+        self.id_prefix = id_prefix
+        self.id_width = id_width
+        self._next_id = start_id
+        self._watermark = np.iinfo(np.int64).min
+        # 사용자별 열린 세션 - 인덱스는 user_id, 시각은 int64 나노초
+        self._open = pd.DataFrame(
+            {'session_id': pd.Series(dtype=object), 'started_at': pd.Series(dtype=np.int64),
+             'ended_at': pd.Series(dtype=np.int64), 'landing_page': pd.Series(dtype=object),
+             'page_views': pd.Series(dtype=np.int64), 'events': pd.Series(dtype=np.int64)},
+            index=pd.Index([], dtype=object, name='user_id'),
+        )
+
+    @property
+    def open_sessions(self) -> int:
+        return len(self._open)
+
+    def _new_ids(self, count: int) -> np.ndarray:
+        start = self._next_id
+        self._next_id += count
+        numbers = np.char.zfill(np.arange(start, start + count).astype(str), self.id_width)
+        return np.char.add(self.id_prefix, numbers).astype(object)
+
+    def process(self, events: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """청크 처리 - (session_id 가 붙은 이벤트, 이번 청크에서 닫힌 세션)"""
+        if events.empty:
+            return events.assign(session_id=pd.Series(dtype=object)), self._sessions_frame(self._open.iloc[:0])
+
+        users, user_index = pd.factorize(events['user_id'].astype(str))
+        times = events['timestamp'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        order = np.lexsort((times, users))
+        users, times = users[order], times[order]
+        pages = events['page_url'].to_numpy(dtype=object)[order] if 'page_url' in events else np.full(len(order), None)
+        is_view = ((events['event_type'] == 'page_view').to_numpy()[order]
+                   if 'event_type' in events else np.ones(len(order), dtype=bool))
+        gap = self.gap.value
+        self._watermark = max(self._watermark, int(times.max()))
+
+        # 구간 시작: 사용자의 첫 행이거나 직전 이벤트와의 간격이 gap 초과
+        first_of_user = np.concatenate(([True], users[1:] != users[:-1]))
+        starts = first_of_user | np.concatenate(([True], np.diff(times) > gap))
+        start_rows = np.flatnonzero(starts)
+        end_rows = np.concatenate((start_rows[1:], [len(times)])) - 1
+        segment_users = users[start_rows]
+
+        # 사용자의 첫 구간이 열린 세션과 gap 안에 있으면 그 세션을 이어 간다
+        open_positions = self._open.index.get_indexer(user_index)[segment_users]
+        # -1(열린 세션 없음)은 끝에 붙인 자리값을 가리킨다
+        open_ended = np.append(self._open['ended_at'].to_numpy(dtype=np.int64), 0)[open_positions]
+        continues = first_of_user[start_rows] & (open_positions >= 0) & (times[start_rows] - open_ended <= gap)
+
+        page_views = np.add.reduceat(is_view.astype(np.int64), start_rows)
+        counts = end_rows - start_rows + 1
+        session_ids = np.empty(len(start_rows), dtype=object)
+        started = times[start_rows].copy()
+        landing = pages[start_rows].copy()
+        carried = open_positions[continues]
+        open_rows = self._open.iloc[carried]
+        session_ids[continues] = open_rows['session_id'].to_numpy()
+        started[continues] = open_rows['started_at'].to_numpy()
+        landing[continues] = open_rows['landing_page'].to_numpy()
+        page_views[continues] += open_rows['page_views'].to_numpy()
+        counts[continues] += open_rows['events'].to_numpy()
+        session_ids[~continues] = self._new_ids(int((~continues).sum()))
+
+        segments = pd.DataFrame({
+            'session_id': session_ids,
+            'started_at': started,
+            'ended_at': times[end_rows],
+            'landing_page': landing,
+            'page_views': page_views,
+            'events': counts,
+        }, index=pd.Index(user_index[segment_users], name='user_id'))
+
+        # 사용자의 마지막 구간만 열려 있을 수 있고, 워터마크 기준 gap 이 지났으면 닫는다
+        last_of_user = np.concatenate((segment_users[1:] != segment_users[:-1], [True]))
+        still_open = last_of_user & (self._watermark - segments['ended_at'].to_numpy() <= gap)
+
+        # 이번 청크에 나온 사용자의 이전 열린 세션은 이어졌거나(위에서 합침) 새 세션으로 대체되어 닫힌다
+        seen = self._open.index.isin(user_index)
+        replaced = seen & ~self._open['session_id'].isin(session_ids[continues])
+        unseen = self._open[~seen]
+        expired = (self._watermark - unseen['ended_at'].to_numpy()) > gap
+
+        closed = pd.concat([self._open[replaced], unseen[expired], segments[~still_open]])
+        self._open = pd.concat([unseen[~expired], segments[still_open]])
+
+        annotated = events.iloc[order].assign(session_id=np.repeat(session_ids, end_rows - start_rows + 1))
+        return annotated, self._sessions_frame(closed)
+
+    def flush(self) -> pd.DataFrame:
+        """스트림 끝 - 열린 세션을 모두 닫아 반환"""
+        closed, self._open = self._open, self._open.iloc[:0]
+        return self._sessions_frame(closed)
+
+    @staticmethod
+    def _sessions_frame(state: pd.DataFrame) -> pd.DataFrame:
+        """내부 상태를 user_sessions 형태(+ 세션 통계)로 변환"""
+        sessions = state.reset_index()
+        started = sessions['started_at'].to_numpy(dtype=np.int64)
+        ended = sessions['ended_at'].to_numpy(dtype=np.int64)
+        return pd.DataFrame({
+            'session_id': sessions['session_id'].to_numpy(dtype=object),
+            'user_id': sessions['user_id'].to_numpy(dtype=object),
+            'started_at': started.astype('datetime64[ns]'),
+            'ended_at': ended.astype('datetime64[ns]'),
+            'landing_page': sessions['landing_page'].to_numpy(dtype=object),
+            'page_views': sessions['page_views'].to_numpy(dtype=np.int64),
+            'events': sessions['events'].to_numpy(dtype=np.int64),
+            'duration_seconds': (ended - started) // 1_000_000_000,
+            # 이벤트가 하나뿐인 세션은 이탈로 본다
+            'is_bounce': sessions['events'].to_numpy(dtype=np.int64) == 1,
+        }, columns=SESSION_COLUMNS)
+
+
+def sessionize(chunks: Iterable[pd.DataFrame], gap: pd.Timedelta = SESSION_GAP,
+               start_id: int = 1) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """청크 스트림 세션 분할 - 청크마다 (이번에 닫힌 세션의 이벤트(session_id 포함), 닫힌 세션) 을 내보낸다
+
+    열린 세션의 이벤트는 세션이 닫힐 때까지 붙잡아 두므로, 내보낸 세션 통계(이탈 여부 등)는 확정된 값이다.
+    스트림이 끝나면 남은 세션을 모두 닫아 마지막으로 내보낸다.
+    """
+    sessionizer = Sessionizer(gap, start_id=start_id)
+    held: List[pd.DataFrame] = []
+    for chunk in chunks:
+        events, closed = sessionizer.process(chunk)
+        if closed.empty:
+            held.append(events)
+            continue
+        events = pd.concat(held + [events]) if held else events
+        done = events['session_id'].isin(closed['session_id']).to_numpy()
+        held = [events[~done]]
+        yield events[done], closed
+    closed = sessionizer.flush()
+    if held or not closed.empty:
+        events = pd.concat(held) if held else pd.DataFrame(columns=EVENT_COLUMNS + ['session_id'])
+        yield events, closed
@@ -0,0 +1,1003 @@
+"""내장 SQLite 분석 저장소
+
+database/schema.sql 의 테이블과 인덱스를 그대로 만들고 원시 이벤트를 적재한 뒤
+대시보드 패널(개요, 퍼널, KPI 트렌드, 최근 이벤트, 시나리오 성과)을 SQL 집계로 계산한다.
+외부 서비스 없이 프로세스 안에서 동작하므로 Streamlit Cloud 에서도 실제 데이터로 대시보드를 그릴 수 있다.
+
+- 시각 컬럼은 유닉스 초(INTEGER)로 저장한다. 범위 비교가 빠르고 date(x, 'unixepoch') 로 일자를 구할 수 있다.
+- schema.sql 의 뷰는 PostgreSQL 전용 문법(::DECIMAL)을 쓰므로 만들지 않고 같은 집계를 메서드로 제공한다.
+- 퍼널 단계별 도달 사용자 수는 FunnelEngine 이 적재 시점에 증분으로 갱신한다.
+- 기간별 고유 사용자 수는 일자별 HyperLogLog 스케치(analytics.sketch)를 병합해 구하고 exact=True 이면 원시 테이블로 센다.
+- 첫 방문 코호트별 재방문 행렬은 RetentionEngine(analytics.retention)이 일·주 단위로 증분 유지한다.
+- 기기·브라우저·국가·페이지 분류·전환 유형별 분해는 롤업 큐브(analytics.rollup)의 시간·일 셀 합계로 답한다.
+- kpi_definitions 의 계산식은 한 번 컴파일(analytics.kpi)해 두고 적재 뒤 처음 KPI 를 조회할 때 마지막 측정일 이후만
+  롤업으로 계산해 kpi_measurements 에 일별로 채운다 (첫 화면에 필요 없는 계산을 적재에서 뺀다).
+- 이탈 분석의 SciPy 희소 행렬(analytics.markov)은 처음 호출할 때 임포트한다.
+- 카테고리 필터용으로 사용자 → 시나리오 매핑(user_scenarios)을 적재 후 한 번 만들어 둔다.
+"""
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analytics.funnel import FunnelEngine, windowed_funnel
+from analytics.kpi import CompiledFormula, FormulaError, compile_formula, evaluate_kpis
+from analytics.paths import MAX_DEPTH, MIN_SUPPORT, PathTrie, session_chunks
+from analytics.rollup import FACTS as ROLLUP_FACTS, RollupCube
+from analytics.retention import GRANULARITIES, RetentionEngine
+from analytics.sessionize import SESSION_GAP, clickstream_chunks, sessionize
+from analytics.sketch import DEFAULT_PRECISION, SketchIndex
+from analytics.synthetic import CATEGORY_PROFILES, generate_dataset
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database', 'schema.sql')
+
+# 적재 순서 - 참조되는 테이블부터
+TABLE_ORDER = [
+    'users',
+    'customer_journey_scenarios',
+    'journey_stages',
+    'user_sessions',
+    'page_view_events',
+    'user_action_events',
+    'conversion_events',
+    'journey_stage_completions',
+    'kpi_definitions',
+    'scenario_kpi_mappings',
+    'kpi_measurements',
+]
+
+# schema.sql 외에 대시보드 집계가 쓰는 보조 인덱스
+EXTRA_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_journey_stage_completions_stage_id ON journey_stage_completions(stage_id, is_successful)",
+    "CREATE INDEX IF NOT EXISTS idx_journey_stage_completions_completed_at ON journey_stage_completions(completed_at)",
+    "CREATE INDEX IF NOT EXISTS idx_page_view_events_user_id ON page_view_events(user_id)",
+]
+
+# 경로 분석 원천 - (테이블, 토큰 컬럼, 시각 컬럼)
+PATH_SOURCES = {
+    'pages': ('page_view_events', 'page_url', 'viewed_at'),
+    'actions': ('user_action_events', 'action_type', 'performed_at'),
+}
+PATH_CHUNK_ROWS = 200_000
+
+# 분포 지표 - 지표: (테이블, 값 컬럼, 시각 컬럼, 이름, 단위)
+# 페이지 지표의 스케치 키는 (시나리오, page_category), 단계 완료 시간은 단계 ID
+DISTRIBUTION_METRICS = {
+    'time_on_page': ('page_view_events', 'time_on_page_seconds', 'viewed_at', '페이지 체류 시간', '초'),
+    'scroll_depth': ('page_view_events', 'scroll_depth_percentage', 'viewed_at', '스크롤 깊이', '%'),
+    'completion_duration': ('journey_stage_completions', 'completion_duration_minutes', 'completed_at', '단계 완료 소요 시간', '분'),
+}
+PERCENTILES = (0.5, 0.9, 0.99)
+
+SESSION_DIMENSIONS = ['device_type', 'browser', 'country']
+
+# KPI 트렌드 해상도 - 이름: (구간 초, 표시 형식)
+TREND_RESOLUTIONS = {
+    'day': (86400, '%Y-%m-%d'),
+    'hour': (3600, '%Y-%m-%d %H:00'),
+    'minute': (60, '%Y-%m-%d %H:%M'),
+}
+
+CONVERSION_LABELS = {'purchase': '구매 완료', 'lead': '리드 제출', 'signup': '문의 완료'}
+
+# 유입 경로별 시나리오 성과 - referrer_url 도메인으로 채널 구분
+CHANNEL_CASE = """
+    CASE
+        WHEN s.referrer_url IS NULL THEN '직접 방문'
+        WHEN s.referrer_url LIKE '%google.%' OR s.referrer_url LIKE '%naver.%' THEN '검색 엔진'
+        ELSE '소셜 미디어'
+    END
+"""
+
+
+def load_schema(path: str = SCHEMA_PATH) -> List[str]:
+    """schema.sql 에서 SQLite 로 실행할 CREATE TABLE / CREATE INDEX 문 추출"""
+    with open(path, encoding='utf-8') as f:
+        sql = re.sub(r'--[^\n]*', '', f.read())
+    statements = []
+    for statement in sql.split(';'):
+        statement = statement.strip()
+        if not statement.upper().startswith(('CREATE TABLE', 'CREATE INDEX')):
+            continue
+        # SQLite 에서는 INTEGER PRIMARY KEY 가 rowid 별칭이 되어 자동 증가한다
+        statement = re.sub(r'\bSERIAL PRIMARY KEY\b', 'INTEGER PRIMARY KEY', statement)
+        statements.append(statement)
+    return statements
+
+
+def _column_values(series: pd.Series) -> Iterable:
+    """DataFrame 컬럼을 sqlite3 에 넣을 수 있는 파이썬 값 목록으로 변환"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        seconds = series.to_numpy(dtype='datetime64[s]').astype(np.int64)
+        return [None if missing else value for missing, value in zip(series.isna().to_numpy(), seconds.tolist())]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype(object).where(series.notna(), None).tolist()
+    if pd.api.types.is_float_dtype(series):
+        return [None if value != value else value for value in series.tolist()]
+    return series.tolist()
+
+
+def _pair_keys(first: pd.Series, second: pd.Series) -> np.ndarray:
+    """행별 (first, second) 튜플 키 배열 - 고유 조합만 튜플로 만든다"""
+    codes, uniques = pd.factorize(pd.MultiIndex.from_arrays([first, second]))
+    return np.asarray(uniques.to_flat_index(), dtype=object)[codes]
+
+
+class AnalyticsStore:
+    """schema.sql 테이블을 담은 내장 SQLite 저장소와 대시보드 집계 쿼리
+
+    하나의 연결을 여러 스레드(패널 동시 조회, 캐시 워머)가 공유하므로 쿼리는 잠금으로 직렬화한다.
+    """
+
+    def __init__(self, path: str = ':memory:', schema_path: str = SCHEMA_PATH,
+                 sketch_precision: int = DEFAULT_PRECISION):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._categories: Dict[str, int] = {}
+        self._scenario_categories: Dict[int, str] = {}
+        self._first_stages: List[int] = []
+        self._final_stages: List[int] = []
+        self._stages: Dict[int, List[Tuple[int, str, int]]] = {}
+        self._funnel = FunnelEngine()
+        self._sketches = SketchIndex(sketch_precision)
+        self._user_scenarios = pd.Series(dtype=np.int64)
+        self._rollups = RollupCube()
+        # 페이지 뷰·전환에 세션 차원(기기·브라우저·국가)을 붙이기 위한 세션별 차원
+        self._session_dims = pd.DataFrame(columns=SESSION_DIMENSIONS, index=pd.Index([], name='session_id'))
+        self._retention = {granularity: RetentionEngine(granularity) for granularity in GRANULARITIES}
+        # KPI ID → (계산식, 컴파일 결과 또는 오류 메시지) - 계산식이 바뀔 때만 다시 컴파일
+        self._kpi_formulas: Dict[int, Tuple[Optional[str], Any]] = {}
+        # 적재 후 아직 계산하지 않은 KPI 측정값이 있는지 - 동시에 처음 조회해도 한 번만 계산
+        self._kpis_pending = False
+        self._kpi_lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode = OFF")
+            self._conn.execute("PRAGMA synchronous = OFF")
+            # 인덱스는 대량 적재가 끝난 뒤 한 번에 만든다
+            self._indexes = []
+            for statement in load_schema(schema_path):
+                if statement.upper().startswith('CREATE TABLE'):
+                    self._conn.execute(statement.replace('CREATE TABLE', 'CREATE TABLE IF NOT EXISTS', 1))
+                else:
+                    self._indexes.append(statement.replace('CREATE INDEX', 'CREATE INDEX IF NOT EXISTS', 1))
+            self._columns = {
+                table: [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+                for (table,) in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
+
+    @classmethod
+    def from_synthetic(cls, n_users: int = 20_000, days: int = 30, seed: int = 42, **kwargs) -> 'AnalyticsStore':
+        """합성 데이터셋으로 채운 저장소"""
+        store = cls()
+        store.load(generate_dataset(n_users, days, seed, **kwargs))
+        return store
+
+    @classmethod
+    def from_parquet(cls, directory: str) -> 'AnalyticsStore':
+        """python -m analytics.synthetic 으로 저장한 Parquet 디렉터리에서 저장소 생성"""
+        tables = {
+            name[:-len('.parquet')]: pd.read_parquet(os.path.join(directory, name))
+            for name in os.listdir(directory) if name.endswith('.parquet')
+        }
+        store = cls()
+        store.load(tables)
+        return store
+
+    def load(self, tables: Dict[str, pd.DataFrame]):
+        """테이블별 DataFrame 을 적재하고 집계용 보조 구조를 갱신"""
+        with self._lock:
+            for table in sorted(tables, key=lambda name: TABLE_ORDER.index(name) if name in TABLE_ORDER else len(TABLE_ORDER)):
+                frame = tables[table]
+                if table not in self._columns or frame.empty:
+                    continue
+                # 값이 전부 비어 있는 컬럼은 기본값(NULL)에 맡긴다
+                columns = [column for column in self._columns[table]
+                           if column in frame.columns and frame[column].notna().any()]
+                rows = zip(*(_column_values(frame[column]) for column in columns))
+                placeholders = ', '.join('?' for _ in columns)
+                self._conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows
+                )
+            for statement in self._indexes + EXTRA_INDEXES:
+                self._conn.execute(statement)
+            self._conn.execute("DROP TABLE IF EXISTS user_scenarios")
+            self._conn.execute("""
+                CREATE TABLE user_scenarios AS
+                SELECT user_id, MIN(scenario_id) AS scenario_id
+                FROM journey_stage_completions
+                GROUP BY user_id
+            """)
+            self._conn.execute("CREATE UNIQUE INDEX idx_user_scenarios_user_id ON user_scenarios(user_id, scenario_id)")
+            self._conn.execute("CREATE INDEX idx_user_scenarios_scenario_id ON user_scenarios(scenario_id)")
+            self._conn.execute("ANALYZE")
+            self._conn.commit()
+            self._refresh_scenarios()
+            self._funnel.set_stages(pd.read_sql_query(
+                "SELECT id, scenario_id, stage_name, stage_order FROM journey_stages", self._conn
+            ))
+        # 퍼널 상태와 스케치는 새로 들어온 행만 반영
+        if 'journey_stage_completions' in tables:
+            self._funnel.update(tables['journey_stage_completions'])
+        if 'user_sessions' in tables:
+            for engine in self._retention.values():
+                engine.update(tables['user_sessions']['user_id'].astype(str), tables['user_sessions']['started_at'])
+        self._index_sketches(tables)
+        self._index_rollups(tables)
+        self._kpis_pending = True
+
+    def _scenarios_for(self, user_ids: pd.Series) -> np.ndarray:
+        """행별 사용자의 시나리오 ID (모르는 사용자는 0)"""
+        values = pd.Categorical(user_ids)
+        positions = self._user_scenarios.index.get_indexer(values.categories)
+        # -1(모르는 사용자)은 끝에 붙인 0 을 가리킨다
+        scenarios = np.append(self._user_scenarios.to_numpy(), 0)[positions]
+        return np.where(values.codes >= 0, scenarios[values.codes], 0)
+
+    def _index_sketches(self, tables: Dict[str, pd.DataFrame]):
+        """일자·시나리오별 고유 사용자 스케치와 합계, 일자·단계별 도달 사용자 스케치 갱신"""
+        completions = tables.get('journey_stage_completions')
+        if completions is not None and not completions.empty:
+            first = completions.groupby(completions['user_id'].astype(str))['scenario_id'].min()
+            merged = pd.concat([self._user_scenarios, first])
+            self._user_scenarios = merged.groupby(level=0).min()
+            successful = completions[completions['is_successful'].fillna(True).astype(bool)]
+            self._sketches.add_distinct('stage', successful['completed_at'], successful['stage_id'], successful['user_id'])
+            if 'completion_duration_minutes' in completions:
+                self._sketches.add_quantiles('completion_duration', completions['completed_at'], completions['stage_id'],
+                                             completions['completion_duration_minutes'])
+        sessions = tables.get('user_sessions')
+        if sessions is not None and not sessions.empty:
+            scenarios = self._scenarios_for(sessions['user_id'])
+            self._sketches.add_distinct('users', sessions['started_at'], scenarios, sessions['user_id'])
+            self._sketches.add_total('sessions', sessions['started_at'], scenarios)
+        views = tables.get('page_view_events')
+        if views is not None and not views.empty:
+            scenarios = self._scenarios_for(views['user_id'])
+            self._sketches.add_distinct('visitors', views['viewed_at'], scenarios, views['user_id'])
+            self._sketches.add_total('page_views', views['viewed_at'], scenarios)
+            if 'page_category' in views:
+                keys = _pair_keys(pd.Series(scenarios), views['page_category'].astype(str).reset_index(drop=True))
+                for metric in ('time_on_page', 'scroll_depth'):
+                    column = DISTRIBUTION_METRICS[metric][1]
+                    if column in views:
+                        self._sketches.add_quantiles(metric, views['viewed_at'], keys, views[column])
+        conversions = tables.get('conversion_events')
+        if conversions is not None and not conversions.empty:
+            scenarios = self._scenarios_for(conversions['user_id'])
+            self._sketches.add_total('conversions', conversions['converted_at'], scenarios)
+            for conversion_type, metric in (('purchase', 'purchases'), ('lead', 'leads')):
+                subset = (conversions['conversion_type'] == conversion_type).to_numpy()
+                self._sketches.add_total(metric, conversions['converted_at'][subset], scenarios[subset])
+                if conversion_type == 'purchase':
+                    self._sketches.add_total('revenue', conversions['converted_at'][subset], scenarios[subset],
+                                             conversions['conversion_value'][subset])
+
+    def _index_rollups(self, tables: Dict[str, pd.DataFrame]):
+        """세션·페이지 뷰·전환·단계 완료 행을 롤업 큐브에 추가 - 이벤트는 session_id 로 세션 차원을 이어 받는다"""
+        sessions = tables.get('user_sessions')
+        if sessions is not None and not sessions.empty:
+            dims = sessions[['session_id'] + [column for column in SESSION_DIMENSIONS if column in sessions]]
+            dims = dims.assign(session_id=dims['session_id'].astype(str)).set_index('session_id')
+            self._session_dims = pd.concat([self._session_dims, dims]) if len(self._session_dims) else dims
+            duration = (pd.to_datetime(sessions['ended_at']) - pd.to_datetime(sessions['started_at'])).dt.total_seconds()
+            self._rollups.append('sessions', sessions.assign(scenario=self._scenarios_for(sessions['user_id']),
+                                                             duration_seconds=duration))
+        for table, fact in (('page_view_events', 'page_views'), ('conversion_events', 'conversions')):
+            frame = tables.get(table)
+            if frame is None or frame.empty:
+                continue
+            dims = self._session_dims.reindex(frame['session_id'].astype(str))
+            self._rollups.append(fact, frame.assign(
+                scenario=self._scenarios_for(frame['user_id']),
+                **{column: dims[column].to_numpy() for column in SESSION_DIMENSIONS if column in dims},
+            ))
+        completions = tables.get('journey_stage_completions')
+        if completions is not None and not completions.empty:
+            stage_ids = completions['stage_id'].to_numpy()
+            roles = np.select([np.isin(stage_ids, self._final_stages), np.isin(stage_ids, self._first_stages)],
+                              ['final', 'first'], 'middle')
+            self._rollups.append('stage_completions', completions.assign(
+                scenario=completions['scenario_id'], stage_role=roles,
+                is_successful=completions['is_successful'].fillna(True).astype(bool),
+            ))
+
+    def ingest_clickstream(self, page_views: Optional[pd.DataFrame] = None, actions: Optional[pd.DataFrame] = None,
+                           gap: pd.Timedelta = SESSION_GAP, chunk_size: int = 500_000) -> Dict[str, int]:
+        """session_id 없는 원시 페이지 뷰·액션을 세션으로 나눠 user_sessions 와 함께 적재
+
+        두 프레임을 시각 순 청크로 나눠 ingest_events() 로 넘긴다.
+        """
+        return self.ingest_events(clickstream_chunks(page_views, actions, chunk_size), gap)
+
+    def ingest_events(self, chunks: Iterable[pd.DataFrame], gap: pd.Timedelta = SESSION_GAP) -> Dict[str, int]:
+        """시각 순 이벤트 청크 스트림(clickstream_chunks 형태)을 세션으로 나누며 적재
+
+        세션이 닫힐 때마다 그 세션과 이벤트를 바로 적재하므로, 메모리는 청크 크기와 열린 세션 수에 비례한다.
+        """
+        next_id = (self._query("SELECT MAX(id) FROM user_sessions")[0][0] or 0) + 1
+        totals = {'sessions': 0, 'page_views': 0, 'actions': 0}
+        for events, sessions in sessionize(chunks, gap, start_id=next_id):
+            is_view = (events['event_type'] == 'page_view').to_numpy()
+            page_views = events[is_view].rename(columns={'timestamp': 'viewed_at'})
+            page_views['is_bounce'] = page_views['session_id'].isin(sessions.loc[sessions['is_bounce'], 'session_id'])
+            actions = events[~is_view].rename(columns={'timestamp': 'performed_at'})
+            sessions = sessions.assign(id=np.arange(next_id, next_id + len(sessions)))
+            next_id += len(sessions)
+            self.load({'user_sessions': sessions, 'page_view_events': page_views, 'user_action_events': actions})
+            totals['sessions'] += len(sessions)
+            totals['page_views'] += len(page_views)
+            totals['actions'] += len(actions)
+        return totals
+
+    def _refresh_scenarios(self):
+        """시나리오 이름으로 카테고리를 매핑하고 시나리오별 첫/마지막 단계 ID 를 기억"""
+        names = {profile['scenario_name']: profile['category'] for profile in CATEGORY_PROFILES}
+        self._categories = {}
+        self._scenario_categories = {}
+        for scenario_id, name in self._conn.execute("SELECT id, name FROM customer_journey_scenarios"):
+            if name in names:
+                self._categories[names[name]] = scenario_id
+                self._scenario_categories[scenario_id] = names[name]
+        stages = self._conn.execute("""
+            SELECT scenario_id, MIN(stage_order), MAX(stage_order) FROM journey_stages GROUP BY scenario_id
+        """).fetchall()
+        self._first_stages = [self._stage_id(scenario_id, first) for scenario_id, first, _ in stages]
+        self._stages = {}
+        for stage_id, scenario_id, name, order in self._conn.execute(
+            "SELECT id, scenario_id, stage_name, stage_order FROM journey_stages ORDER BY scenario_id, stage_order"
+        ):
+            self._stages.setdefault(scenario_id, []).append((order, name, stage_id))
+        self._final_stages = [self._stage_id(scenario_id, last) for scenario_id, _, last in stages]
+
+    def _stage_id(self, scenario_id: int, stage_order: int) -> int:
+        return self._conn.execute(
+            "SELECT id FROM journey_stages WHERE scenario_id = ? AND stage_order = ?", (scenario_id, stage_order)
+        ).fetchone()[0]
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _scenario_id(self, category: str) -> Optional[int]:
+        """카테고리의 시나리오 ID ('all' 이면 None)"""
+        if category == 'all':
+            return None
+        if category not in self._categories:
+            raise ValueError(f"알 수 없는 카테고리: {category}")
+        return self._categories[category]
+
+    def _user_filter(self, alias: str, category: str) -> Tuple[str, Tuple]:
+        """이벤트 테이블을 카테고리 사용자로 제한하는 JOIN 절"""
+        scenario_id = self._scenario_id(category)
+        if scenario_id is None:
+            return '', ()
+        return (f"JOIN user_scenarios us ON us.user_id = {alias}.user_id AND us.scenario_id = ?", (scenario_id,))
+
+    def _count(self, table: str, category: str, where: str = '', params: Tuple = ()) -> int:
+        join, join_params = self._user_filter('t', category)
+        return self._query(f"SELECT COUNT(*) FROM {table} t {join} {where}", join_params + params)[0][0]
+
+    def _stage_users(self, category: str, start: Optional[date] = None, end: Optional[date] = None,
+                     exact: bool = False) -> List[Tuple[int, str, int]]:
+        """(단계 순서, 단계명, 도달 사용자 수)
+
+        전체 기간은 증분 퍼널 엔진, 기간 지정은 일자별 단계 스케치 병합, exact 는 원시 테이블 COUNT(DISTINCT).
+        """
+        scenario_id = self._scenario_id(category)
+        scenarios = [scenario_id] if scenario_id is not None else sorted(self._stages)
+        if start is None and end is None and not exact:
+            return [stage for scenario in scenarios for stage in self._funnel.stage_counts(scenario)]
+        stages = [stage for scenario in scenarios for stage in self._stages.get(scenario, [])]
+        if not exact:
+            return [(order, name, self._sketches.distinct('stage', [stage_id], start, end))
+                    for order, name, stage_id in stages]
+        low, high = self._bounds(start, end)
+        counts = dict(self._query("""
+            SELECT stage_id, COUNT(DISTINCT user_id) FROM journey_stage_completions
+            WHERE is_successful = 1 AND completed_at >= ? AND completed_at < ?
+            GROUP BY stage_id
+        """, (low, high)))
+        return [(order, name, counts.get(stage_id, 0)) for order, name, stage_id in stages]
+
+    @staticmethod
+    def _bounds(start: Optional[date], end: Optional[date]) -> Tuple[int, int]:
+        """기간을 유닉스 초 [low, high) 로 변환 - end 는 그날 하루를 포함"""
+        low = int(pd.Timestamp(start).timestamp()) if start is not None else -2 ** 62
+        high = int((pd.Timestamp(end) + pd.Timedelta(days=1)).timestamp()) if end is not None else 2 ** 62
+        return low, high
+
+    def date_range(self, days: Optional[int] = None) -> Tuple[Optional[date], Optional[date]]:
+        """세션이 시작된 마지막 날까지 최근 days 일 - days 가 없으면 전체 기간 (None, None)"""
+        loaded = self._sketches.days('sessions')
+        if not days or not loaded:
+            return None, None
+        return loaded[-1] - timedelta(days=days - 1), loaded[-1]
+
+    @staticmethod
+    def _rate(numerator: float, denominator: float) -> float:
+        return round(numerator / denominator * 100, 1) if denominator else 0.0
+
+    def _activity(self, category: str, start: Optional[date], end: Optional[date], exact: bool) -> Dict[str, float]:
+        """기간 내 고유 사용자·방문자 수와 세션·페이지뷰·전환 합계
+
+        기본은 일자별 스케치와 카운터를 병합하고, exact 이면 원시 테이블을 직접 집계한다.
+        """
+        scenario_id = self._scenario_id(category)
+        if not exact:
+            keys = None if scenario_id is None else [scenario_id]
+            counts = {metric: self._sketches.distinct(metric, keys, start, end) for metric in ('users', 'visitors')}
+            for metric in ('sessions', 'page_views', 'conversions', 'purchases', 'revenue', 'leads'):
+                counts[metric] = self._sketches.total(metric, keys, start, end)
+            return counts
+        join, params = self._user_filter('t', category)
+        low, high = self._bounds(start, end)
+        users, sessions = self._query(f"""
+            SELECT COUNT(DISTINCT t.user_id), COUNT(*) FROM user_sessions t {join}
+            WHERE t.started_at >= ? AND t.started_at < ?
+        """, params + (low, high))[0]
+        visitors, page_views = self._query(f"""
+            SELECT COUNT(DISTINCT t.user_id), COUNT(*) FROM page_view_events t {join}
+            WHERE t.viewed_at >= ? AND t.viewed_at < ?
+        """, params + (low, high))[0]
+        conversions, purchases, revenue, leads = self._query(f"""
+            SELECT COUNT(*),
+                   COALESCE(SUM(t.conversion_type = 'purchase'), 0),
+                   COALESCE(SUM(CASE WHEN t.conversion_type = 'purchase' THEN t.conversion_value END), 0),
+                   COALESCE(SUM(t.conversion_type = 'lead'), 0)
+            FROM conversion_events t {join}
+            WHERE t.converted_at >= ? AND t.converted_at < ?
+        """, params + (low, high))[0]
+        return {'users': users, 'visitors': visitors, 'sessions': sessions, 'page_views': page_views,
+                'conversions': conversions, 'purchases': purchases, 'revenue': revenue, 'leads': leads}
+
+    def overview(self, category: str = 'all', start: Optional[date] = None, end: Optional[date] = None,
+                 exact: bool = False) -> Dict[str, Any]:
+        """대시보드 개요 지표 - total_users 는 기간 중 세션이 있는 고유 사용자 수
+
+        고유 개수는 HyperLogLog 추정치(오차는 analytics.sketch 참고)이며 exact=True 이면 정확히 센다.
+        """
+        activity = self._activity(category, start, end, exact)
+        data = {
+            'total_users': int(activity['users']),
+            'total_sessions': int(activity['sessions']),
+            'total_conversions': int(activity['conversions']),
+            'average_conversion_rate': self._rate(activity['conversions'], activity['users']),
+        }
+        data.update(self._category_extras(category, activity, start, end, exact))
+        return data
+
+    def _category_extras(self, category: str, activity: Dict[str, float], start: Optional[date] = None,
+                         end: Optional[date] = None, exact: bool = False) -> Dict[str, Any]:
+        """카테고리별 추가 개요 지표"""
+        if category == 'ecommerce':
+            return {'total_revenue': int(activity['revenue']),
+                    'average_order_value': int(round(activity['revenue'] / activity['purchases'])) if activity['purchases'] else 0}
+        if category == 'lead_generation':
+            stages = self._stage_users(category, start, end, exact)
+            # 리드 폼에 도달한 사용자 대비 제출 비율
+            return {'total_leads': int(activity['leads']), 'lead_conversion_rate': self._rate(stages[-1][2], stages[-2][2])}
+        if category == 'general_website':
+            return {'total_page_views': int(activity['page_views']), 'unique_visitors': int(activity['visitors'])}
+        return {}
+
+    def _distribution_keys(self, metric: str, category: str, page_category: Optional[str] = None) -> Optional[List]:
+        """카테고리(와 page_category)에 해당하는 분포 스케치 키 (None 이면 모든 키)"""
+        scenario_id = self._scenario_id(category)
+        if metric == 'completion_duration':
+            if scenario_id is None:
+                return None
+            return [stage_id for _, _, stage_id in self._stages.get(scenario_id, [])]
+        if scenario_id is None and page_category is None:
+            return None
+        return [key for key in self._sketches.keys(metric)
+                if (scenario_id is None or key[0] == scenario_id) and (page_category is None or key[1] == page_category)]
+
+    def _exact_percentiles(self, metric: str, category: str, start: Optional[date], end: Optional[date],
+                           page_category: Optional[str] = None) -> Dict[str, Any]:
+        """원시 테이블에서 읽은 값의 정확한 분위수 (감사용)"""
+        table, column, timestamp = DISTRIBUTION_METRICS[metric][:3]
+        join, params = self._user_filter('t', category)
+        low, high = self._bounds(start, end)
+        where = "AND t.page_category = ?" if page_category is not None else ''
+        with self._lock:
+            values = pd.read_sql_query(f"""
+                SELECT t.{column} AS value FROM {table} t {join}
+                WHERE t.{timestamp} >= ? AND t.{timestamp} < ? AND t.{column} IS NOT NULL {where}
+            """, self._conn, params=params + (low, high) + ((page_category,) if page_category is not None else ()))
+        values = values['value'].to_numpy(dtype=np.float64)
+        quantiles = np.quantile(values, PERCENTILES) if len(values) else np.full(len(PERCENTILES), np.nan)
+        return {'count': len(values), 'mean': values.mean() if len(values) else np.nan, 'quantiles': quantiles}
+
+    def _percentile_row(self, metric: str, category: str, start: Optional[date], end: Optional[date], exact: bool,
+                        page_category: Optional[str] = None) -> Dict[str, Any]:
+        if exact:
+            summary = self._exact_percentiles(metric, category, start, end, page_category)
+        else:
+            digest = self._sketches.quantiles(metric, self._distribution_keys(metric, category, page_category), start, end)
+            summary = {'count': digest.count, 'mean': digest.mean(), 'quantiles': digest.quantile(PERCENTILES)}
+        row = {'count': int(summary['count'])}
+        row.update({f"p{int(q * 100)}": (round(float(value), 1) if not np.isnan(value) else None)
+                    for q, value in zip(PERCENTILES, summary['quantiles'])})
+        row['mean'] = round(float(summary['mean']), 1) if summary['count'] else None
+        return row
+
+    def percentiles(self, category: str = 'all', start: Optional[date] = None, end: Optional[date] = None,
+                    exact: bool = False) -> Dict[str, Any]:
+        """체류 시간·스크롤 깊이·단계 완료 시간의 p50/p90/p99 와 평균, page_category 별 체류 시간 분포
+
+        기본은 일자별 t-digest 를 병합하고, exact 이면 원시 테이블 값으로 정확히 계산한다.
+        """
+        metrics = []
+        for metric, (_, _, _, label, unit) in DISTRIBUTION_METRICS.items():
+            metrics.append({'metric': metric, 'label': label, 'unit': unit,
+                            **self._percentile_row(metric, category, start, end, exact)})
+        page_categories = sorted({key[1] for key in self._sketches.keys('time_on_page')})
+        by_page = []
+        for page_category in page_categories:
+            row = self._percentile_row('time_on_page', category, start, end, exact, page_category)
+            if row['count']:
+                by_page.append({'page_category': page_category, **row})
+        return {'metrics': metrics, 'time_on_page_by_page_category': by_page}
+
+    def breakdown(self, category: str = 'all', fact: str = 'sessions', dimension: str = 'device_type',
+                  start: Optional[date] = None, end: Optional[date] = None, exact: bool = False,
+                  filter_dimension: Optional[str] = None, filter_values: Iterable = ()) -> Dict[str, Any]:
+        """롤업 큐브에서 팩트(세션·페이지 뷰·전환)를 차원별로 분해한 합계와 일별 추이
+
+        filter_dimension 이 filter_values 중 하나인 셀만 센다. 큐브는 합계만 담아 항상 정확하므로 exact 는 쓰지 않는다.
+        반환의 dimensions 는 필터 위젯용 차원별 값 목록이다.
+        """
+        if fact not in ROLLUP_FACTS:
+            raise ValueError(f"알 수 없는 팩트: {fact}")
+        dimensions = [name for name in ROLLUP_FACTS[fact]['dimensions'] if name != 'scenario']
+        if dimension not in dimensions:
+            raise ValueError(f"알 수 없는 차원: {dimension}")
+        filters = {}
+        scenario_id = self._scenario_id(category)
+        if scenario_id is not None:
+            filters['scenario'] = [scenario_id]
+        if filter_dimension in dimensions and filter_values:
+            filters[filter_dimension] = list(filter_values)
+        low = pd.Timestamp(start) if start is not None else None
+        high = pd.Timestamp(end) + pd.Timedelta(days=1) if end is not None else None
+        measures = list(ROLLUP_FACTS[fact]['measures'])
+        rows = self._rollups.query(fact, [dimension], filters, low, high).sort_values(measures[0], ascending=False)
+        trend = self._rollups.query(fact, ['bucket'], filters, low, high)
+        total = rows[measures[0]].sum()
+        return {
+            'fact': fact,
+            'dimension': dimension,
+            'measures': measures,
+            'rows': [{'value': row[dimension], **{measure: round(float(row[measure]), 1) for measure in measures},
+                      'share': self._rate(row[measures[0]], total)} for _, row in rows.iterrows()],
+            'trend': [{'date': bucket.strftime('%Y-%m-%d'), **{measure: round(float(value[measure]), 1)
+                                                                for measure in measures}}
+                      for bucket, value in trend.set_index('bucket').iterrows()],
+            'dimensions': {name: self._rollups.values(fact, name) for name in dimensions},
+        }
+
+    def funnels(self, category: str = 'all', start: Optional[date] = None, end: Optional[date] = None,
+                exact: bool = False) -> List[Dict[str, Any]]:
+        """퍼널 단계별 도달 사용자 수 - 'all' 은 모든 시나리오를 단계 순서별로 합산
+
+        conversion_rate 는 customer_journey_funnel 뷰와 같이 이전 단계 대비 비율이다.
+        """
+        stage_users = self._stage_users(category, start, end, exact)
+        if category != 'all':
+            rows = [(name, users) for _, name, users in stage_users]
+        else:
+            totals: Dict[int, int] = {}
+            for order, _, users in stage_users:
+                totals[order] = totals.get(order, 0) + users
+            rows = [(f"{order}단계", users) for order, users in sorted(totals.items())]
+        stages = []
+        previous = None
+        for name, users in rows:
+            stages.append({
+                'stage_name': name,
+                'users_reached': users,
+                'conversion_rate': round(users / previous * 100, 2) if previous else 0.0,
+            })
+            previous = users
+        return stages
+
+    def ordered_funnel(self, category: str = 'all', window_hours: float = 24 * 7) -> List[Dict[str, Any]]:
+        """순서·기간 제한 퍼널 - 첫 단계 완료 후 window_hours 안에 단계를 순서대로 밟은 사용자 기준
+
+        단계별 직전 단계 대비 전환율, 첫 단계 대비 전환율, 직전 단계로부터 걸린 시간 중앙값(분)을 함께 돌려준다.
+        'all' 은 모든 시나리오를 단계 순서 기준으로 함께 계산한다 (사용자는 하나의 시나리오에만 속한다).
+        """
+        scenario_id = self._scenario_id(category)
+        scenario_filter = "AND jsc.scenario_id = ?" if scenario_id is not None else ''
+        with self._lock:
+            completions = pd.read_sql_query(f"""
+                SELECT jsc.user_id, js.stage_order, jsc.completed_at
+                FROM journey_stage_completions jsc
+                JOIN journey_stages js ON js.id = jsc.stage_id
+                WHERE jsc.is_successful = 1 {scenario_filter}
+            """, self._conn, params=(scenario_id,) if scenario_id is not None else ())
+        if scenario_id is not None:
+            names = [name for _, name, _ in self._stages.get(scenario_id, [])]
+        else:
+            orders = sorted({order for stages in self._stages.values() for order, _, _ in stages})
+            names = [f"{order}단계" for order in orders]
+        steps = windowed_funnel(
+            pd.factorize(completions['user_id'])[0],
+            completions['stage_order'].to_numpy() - 1,
+            completions['completed_at'].to_numpy(),
+            len(names),
+            window_hours * 3600,
+        )
+        first = steps[0]['users_reached'] if steps else 0
+        result = []
+        previous = None
+        for name, step in zip(names, steps):
+            users = step['users_reached']
+            step_rate = self._rate(users, previous) if previous is not None else 100.0
+            result.append({
+                'stage_name': name,
+                'users_reached': users,
+                'step_conversion_rate': step_rate,
+                'overall_conversion_rate': self._rate(users, first),
+                'drop_off_rate': round(100 - step_rate, 1),
+                'median_minutes_from_previous': (round(step['median_seconds'] / 60, 1)
+                                                 if step['median_seconds'] is not None else None),
+            })
+            previous = users
+        return result
+
+    def paths(self, category: str = 'all', source: str = 'pages', top_k: int = 10, max_depth: int = MAX_DEPTH,
+              min_support: float = MIN_SUPPORT) -> Dict[str, Any]:
+        """세션별 페이지(또는 액션) 경로 상위 top_k 개와 Sankey 노드·링크
+
+        이벤트를 세션·시각 순으로 PATH_CHUNK_ROWS 행씩 읽어 접두사 트리에 흘려 넣으므로
+        메모리는 청크 크기와 지지도 min_support 로 가지치기한 트리 크기에만 비례한다.
+        """
+        if source not in PATH_SOURCES:
+            raise ValueError(f"알 수 없는 경로 원천: {source}")
+        table, column, timestamp = PATH_SOURCES[source]
+        join, params = self._user_filter('e', category)
+        trie = PathTrie(max_depth, min_support)
+        with self._lock:
+            frames = pd.read_sql_query(f"""
+                SELECT e.session_id, e.{column} AS token
+                FROM {table} e {join}
+                WHERE e.session_id IS NOT NULL AND e.{column} IS NOT NULL
+                ORDER BY e.session_id, e.{timestamp}
+            """, self._conn, params=params, chunksize=PATH_CHUNK_ROWS)
+            for chunk in session_chunks(frames):
+                trie.update(chunk['session_id'], chunk['token'])
+        return {
+            'sessions': trie.sessions,
+            'paths': trie.top_paths(top_k),
+            'sankey': trie.sankey(top_k),
+        }
+
+    def dropout(self, category: str = 'all', include_pages: bool = True) -> Dict[str, Any]:
+        """여정 단계(와 페이지 분류) 간 전이 마르코프 모델의 이탈 분석
+
+        상태는 성공한 단계 완료와 (include_pages 이면) 페이지 뷰의 page_category 이고 마지막 단계 완료가 전환이다.
+        반환: 시작 시점 전환 확률(%), 전환까지 기대 단계 수, 상태별 방문 수·이탈률·전환 확률·제거 효과·기대 단계 수
+        """
+        scenario_id = self._scenario_id(category)
+        scenarios = [scenario_id] if scenario_id is not None else sorted(self._stages)
+        stages = [(stage_id, name) for scenario in scenarios for _, name, stage_id in self._stages.get(scenario, [])]
+        final_stages = {self._stages[scenario][-1][2] for scenario in scenarios if self._stages.get(scenario)}
+        join, params = self._user_filter('e', category)
+        with self._lock:
+            completions = pd.read_sql_query(f"""
+                SELECT e.user_id, e.stage_id, e.completed_at AS at
+                FROM journey_stage_completions e {join}
+                WHERE e.is_successful = 1
+            """, self._conn, params=params)
+            views = pd.read_sql_query(f"""
+                SELECT e.user_id, e.page_category, e.viewed_at AS at
+                FROM page_view_events e {join}
+                WHERE e.page_category IS NOT NULL
+            """, self._conn, params=params) if include_pages else pd.DataFrame(columns=['user_id', 'page_category', 'at'])
+
+        # 상태 번호: 전환이 아닌 단계, 페이지 분류, 전환 순 (START·EXIT 는 transition_matrix 가 뒤에 붙인다)
+        stage_states = [(stage_id, name) for stage_id, name in stages if stage_id not in final_stages]
+        page_categories = sorted(views['page_category'].unique().tolist())
+        labels = [name for _, name in stage_states] + [f"페이지: {page}" for page in page_categories] + ['전환']
+        conversion = len(labels) - 1
+        stage_codes = {stage_id: code for code, (stage_id, _) in enumerate(stage_states)}
+        stage_codes.update({stage_id: conversion for stage_id in final_stages})
+        page_codes = {page: len(stage_states) + code for code, page in enumerate(page_categories)}
+
+        completions = completions[completions['stage_id'].isin(stage_codes)]
+        users = pd.factorize(pd.concat([completions['user_id'], views['user_id']], ignore_index=True))[0]
+        states = np.concatenate([completions['stage_id'].map(stage_codes).to_numpy(dtype=np.int64),
+                                 views['page_category'].map(page_codes).to_numpy(dtype=np.int64)])
+        times = np.concatenate([completions['at'].to_numpy(dtype=np.int64), views['at'].to_numpy(dtype=np.int64)])
+        from analytics.markov import DropoutModel, transition_matrix
+        counts = transition_matrix(users, states, times, len(labels), absorbing=[conversion])
+        model = DropoutModel(counts, conversion)
+
+        start = counts.shape[0] - 2
+        probability = model.conversion_probability().get(start, 0.0)
+        steps = model.expected_steps().get(start)
+        return {
+            'conversion_probability': round(probability * 100, 1),
+            'expected_steps_to_convert': round(steps, 2) if steps is not None else None,
+            'transitions': int(counts.sum()),
+            'states': model.table(labels, range(conversion)),
+        }
+
+    def retention(self, category: str = 'all', granularity: str = 'week', periods: int = 8) -> Dict[str, Any]:
+        """첫 방문 코호트 × 경과 기간(0 ~ periods) 재방문율 행렬과 전체 재방문율"""
+        if granularity not in self._retention:
+            raise ValueError(f"알 수 없는 기간 단위: {granularity}")
+        scenario_id = self._scenario_id(category)
+        users = None
+        if scenario_id is not None:
+            users = self._user_scenarios.index[self._user_scenarios.to_numpy() == scenario_id]
+        return self._retention[granularity].table(users, max_offset=periods)
+
+    def _kpi_formula(self, kpi_id: int, formula: Optional[str], category: Optional[str]) -> Any:
+        """KPI 계산식의 컴파일 결과 (컴파일할 수 없으면 오류 메시지)"""
+        cached = self._kpi_formulas.get(kpi_id)
+        if cached is None or cached[0] != formula:
+            try:
+                compiled: Any = compile_formula(formula, category)
+            except FormulaError as error:
+                compiled = str(error)
+            self._kpi_formulas[kpi_id] = (formula, compiled)
+        return self._kpi_formulas[kpi_id][1]
+
+    def measure_kpis(self) -> Dict[str, Any]:
+        """kpi_definitions 의 계산식을 롤업으로 평가해 kpi_measurements 에 일별 측정값 추가
+
+        KPI 마다 마지막으로 저장한 측정일 다음 날부터, 아직 쌓이는 중인 마지막 세션 일자 전날까지만 계산한다.
+        반환은 KPI 이름별 추가한 행 수와 계산할 수 없는 KPI 의 사유다.
+        """
+        definitions = self._query("SELECT id, name, calculation_formula, category FROM kpi_definitions")
+        formulas: Dict[int, CompiledFormula] = {}
+        skipped = {}
+        for kpi_id, name, formula, category in definitions:
+            compiled = self._kpi_formula(kpi_id, formula, category)
+            if isinstance(compiled, CompiledFormula):
+                formulas[kpi_id] = compiled
+            else:
+                skipped[name] = compiled
+        loaded = self._sketches.days('sessions')
+        if not loaded:
+            formulas = {}
+        last = dict(self._query(
+            "SELECT kpi_id, MAX(measurement_date) FROM kpi_measurements WHERE measurement_period = 'daily' GROUP BY kpi_id"
+        ))
+        since = {kpi_id: pd.Timestamp(last[kpi_id], unit='s') + pd.Timedelta(days=1) if kpi_id in last else None
+                 for kpi_id in formulas}
+        measurements = evaluate_kpis(formulas, self._rollups, since, sorted(self._scenario_categories),
+                                     pd.Timestamp(loaded[-1]) if loaded else None)
+        with self._lock:
+            self._conn.executemany("""
+                INSERT INTO kpi_measurements (kpi_id, scenario_id, measured_value, measurement_date,
+                                              measurement_period, data_source)
+                VALUES (?, ?, ?, ?, 'daily', 'rollup')
+            """, zip(measurements['kpi_id'].tolist(), measurements['scenario_id'].tolist(),
+                     measurements['measured_value'].tolist(),
+                     _column_values(pd.to_datetime(measurements['measurement_date']))))
+            self._conn.commit()
+        names = {kpi_id: name for kpi_id, name, _, _ in definitions}
+        counts = measurements['kpi_id'].value_counts().to_dict()
+        return {
+            'measured': {names[kpi_id]: int(counts.get(kpi_id, 0)) for kpi_id in formulas},
+            'skipped': skipped,
+        }
+
+    def _measure_pending_kpis(self):
+        """적재 뒤 아직 계산하지 않은 KPI 측정값 계산"""
+        with self._kpi_lock:
+            if self._kpis_pending:
+                self.measure_kpis()
+                self._kpis_pending = False
+
+    def kpi_summary(self, category: str = 'all', days: int = 30) -> List[Dict[str, Any]]:
+        """KPI 별 최근 days 일 일별 측정값과 목표 - 'all' 은 시나리오 평균 (daily_kpi_summary 와 같은 원천)"""
+        self._measure_pending_kpis()
+        scenario_id = self._scenario_id(category)
+        scenario_filter = "AND km.scenario_id = ?" if scenario_id is not None else ''
+        params = (scenario_id,) if scenario_id is not None else ()
+        with self._lock:
+            rows = pd.read_sql_query(f"""
+                SELECT kd.id, kd.name, kd.description, kd.calculation_formula, kd.unit, kd.target_value, kd.category,
+                       km.measurement_date, AVG(km.measured_value) AS value
+                FROM kpi_measurements km
+                JOIN kpi_definitions kd ON kd.id = km.kpi_id
+                WHERE km.measurement_period = 'daily' {scenario_filter}
+                GROUP BY kd.id, km.measurement_date
+                ORDER BY kd.id, km.measurement_date
+            """, self._conn, params=params)
+        summary = []
+        for (kpi_id, name), group in rows.groupby(['id', 'name'], sort=False):
+            group = group.tail(days)
+            first = group.iloc[0]
+            summary.append({
+                'id': int(kpi_id),
+                'name': name,
+                'description': first['description'],
+                'formula': first['calculation_formula'],
+                'unit': first['unit'],
+                'category': first['category'],
+                'target_value': float(first['target_value']) if pd.notna(first['target_value']) else None,
+                'current_value': round(float(group['value'].iloc[-1]), 2),
+                'trend': [{'date': pd.Timestamp(day, unit='s').strftime('%Y-%m-%d'), 'value': round(float(value), 2)}
+                          for day, value in zip(group['measurement_date'], group['value'])],
+            })
+        return summary
+
+    def kpi_trends(self, category: str = 'all', days: int = 30, resolution: str = 'day',
+                   start: Optional[float] = None, end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """구간별 전환율 - 그 구간에 첫 단계를 시작한 사용자 대비 마지막 단계를 완료한 사용자 비율
+
+        기본은 마지막 완료 시각부터 days 일 전까지의 일별 값이다. start·end(유닉스 초)를 주면 그 구간만
+        resolution(day, hour, minute) 단위로 나눠 계산한다 (차트 확대 구간을 더 잘게 다시 가져올 때).
+        """
+        if resolution not in TREND_RESOLUTIONS:
+            raise ValueError(f"지원하지 않는 해상도: {resolution}")
+        seconds, label = TREND_RESOLUTIONS[resolution]
+        scenario_id = self._scenario_id(category)
+        scenario_filter = "AND scenario_id = ?" if scenario_id is not None else ''
+        first = ', '.join(str(stage_id) for stage_id in self._first_stages) or 'NULL'
+        final = ', '.join(str(stage_id) for stage_id in self._final_stages) or 'NULL'
+        params = (scenario_id,) if scenario_id is not None else ()
+        if start is None:
+            latest = self._query(
+                f"SELECT MAX(completed_at) FROM journey_stage_completions WHERE 1 = 1 {scenario_filter}", params
+            )[0][0]
+            if latest is None:
+                return []
+            start = latest - days * 86400
+        end_filter = "AND completed_at < ?" if end is not None else ''
+        rows = self._query(f"""
+            SELECT completed_at / {seconds} * {seconds} AS bucket,
+                   SUM(stage_id IN ({first})),
+                   SUM(stage_id IN ({final}))
+            FROM journey_stage_completions
+            WHERE is_successful = 1 AND completed_at >= ? {end_filter} {scenario_filter}
+            GROUP BY bucket
+            ORDER BY bucket
+        """, (int(start),) + ((int(end),) if end is not None else ()) + params)
+        if not rows:
+            return []
+        labels = pd.to_datetime([bucket for bucket, _, _ in rows], unit='s').strftime(label)
+        trend = [{'date': day, 'value': self._rate(converted, started)}
+                 for day, (_, started, converted) in zip(labels, rows)]
+        return trend[-days:] if resolution == 'day' and end is None else trend
+
+    def recent_events(self, category: str = 'all', limit: int = 10) -> List[Dict[str, Any]]:
+        """페이지 뷰, 액션, 전환 이벤트 중 가장 최근 것 - 각 테이블의 시각 인덱스를 역순으로 훑는다"""
+        join, params = self._user_filter('t', category)
+        events = []
+        for row_id, user_id, page_title, viewed_at in self._query(f"""
+            SELECT t.id, t.user_id, t.page_title, t.viewed_at FROM page_view_events t {join}
+            ORDER BY t.viewed_at DESC LIMIT ?
+        """, params + (limit,)):
+            events.append((viewed_at, f"view_{row_id}", user_id, f"{page_title} 조회", None))
+        for row_id, user_id, action_name, performed_at in self._query(f"""
+            SELECT t.id, t.user_id, t.action_name, t.performed_at FROM user_action_events t {join}
+            ORDER BY t.performed_at DESC LIMIT ?
+        """, params + (limit,)):
+            events.append((performed_at, f"action_{row_id}", user_id, action_name, None))
+        for row_id, user_id, conversion_type, value, converted_at in self._query(f"""
+            SELECT t.id, t.user_id, t.conversion_type, t.conversion_value, t.converted_at FROM conversion_events t {join}
+            ORDER BY t.converted_at DESC LIMIT ?
+        """, params + (limit,)):
+            events.append((converted_at, f"conversion_{row_id}", user_id,
+                           CONVERSION_LABELS.get(conversion_type, conversion_type), value))
+        events.sort(key=lambda event: event[0], reverse=True)
+        user_categories = self._user_categories([event[2] for event in events[:limit]])
+        return [
+            {
+                'id': event_id,
+                'user_id': user_id,
+                'event_type': event_type,
+                'timestamp': pd.Timestamp(timestamp, unit='s').isoformat(),
+                'category': user_categories.get(user_id, category),
+                'value': value,
+            }
+            for timestamp, event_id, user_id, event_type, value in events[:limit]
+        ]
+
+    def _user_categories(self, user_ids: List[str]) -> Dict[str, str]:
+        if not user_ids:
+            return {}
+        placeholders = ', '.join('?' for _ in user_ids)
+        rows = self._query(
+            f"SELECT user_id, scenario_id FROM user_scenarios WHERE user_id IN ({placeholders})", tuple(user_ids)
+        )
+        return {user_id: self._scenario_categories.get(scenario_id) for user_id, scenario_id in rows}
+
+    def scenario_performance(self, category: str = 'all') -> List[Dict[str, Any]]:
+        """시나리오 성과 - 'all' 은 시나리오별, 카테고리는 첫 단계 세션의 유입 채널별"""
+        scenario_id = self._scenario_id(category)
+        first = ', '.join(str(stage_id) for stage_id in self._first_stages) or 'NULL'
+        final = ', '.join(str(stage_id) for stage_id in self._final_stages) or 'NULL'
+        if scenario_id is None:
+            rows = self._query(f"""
+                SELECT cjs.name,
+                       COUNT(DISTINCT CASE WHEN jsc.stage_id IN ({first}) THEN jsc.user_id END),
+                       COUNT(DISTINCT CASE WHEN jsc.stage_id IN ({final}) THEN jsc.user_id END)
+                FROM customer_journey_scenarios cjs
+                LEFT JOIN journey_stage_completions jsc ON jsc.scenario_id = cjs.id AND jsc.is_successful = 1
+                WHERE cjs.is_active = 1
+                GROUP BY cjs.id
+                ORDER BY cjs.id
+            """)
+        else:
+            rows = self._query(f"""
+                SELECT {CHANNEL_CASE} AS channel,
+                       COUNT(DISTINCT jsc.user_id),
+                       COUNT(DISTINCT CASE WHEN done.user_id IS NOT NULL THEN jsc.user_id END)
+                FROM journey_stage_completions jsc
+                JOIN user_sessions s ON s.session_id = jsc.session_id
+                LEFT JOIN journey_stage_completions done
+                    ON done.user_id = jsc.user_id AND done.stage_id IN ({final}) AND done.is_successful = 1
+                WHERE jsc.scenario_id = ? AND jsc.stage_id IN ({first}) AND jsc.is_successful = 1
+                GROUP BY channel
+                ORDER BY channel
+            """, (scenario_id,))
+        return [
+            {
+                'scenario_name': name,
+                'conversion_rate': self._rate(converted, total),
+                'total_users': total,
+                'converted_users': converted,
+            }
+            for name, total, converted in rows
+        ]
+
+    def category_metrics(self, category: str = 'all') -> Dict[str, Any]:
+        """카테고리별 상세 지표"""
+        join, params = self._user_filter('t', category)
+        if category == 'ecommerce':
+            stages = self._stage_users(category)
+            purchasers, repeaters = self._query(f"""
+                SELECT COUNT(*), SUM(purchases > 1) FROM (
+                    SELECT t.user_id, COUNT(*) AS purchases FROM conversion_events t {join}
+                    WHERE t.conversion_type = 'purchase' GROUP BY t.user_id
+                )
+            """, params)[0]
+            metrics = self._category_extras(category, self._activity(category, None, None, False))
+            metrics.update({
+                # 장바구니에 담았지만 구매하지 않은 비율
+                'cart_abandonment_rate': round(100 - self._rate(stages[-1][2], stages[1][2]), 1),
+                'repeat_purchase_rate': self._rate(repeaters or 0, purchasers),
+            })
+            return metrics
+        if category == 'lead_generation':
+            metrics = self._category_extras(category, self._activity(category, None, None, False))
+            clicks = self._count('user_action_events', category, "WHERE t.action_type = 'click'")
+            metrics['click_through_rate'] = self._rate(clicks, self._count('page_view_events', category))
+            return metrics
+        if category == 'general_website':
+            metrics = self._category_extras(category, self._activity(category, None, None, False))
+            sessions, bounces, duration = self._query(f"""
+                SELECT COUNT(*), SUM(bounced), AVG(t.ended_at - t.started_at) FROM user_sessions t
+                JOIN (SELECT session_id, MAX(is_bounce) AS bounced FROM page_view_events GROUP BY session_id) pv
+                    ON pv.session_id = t.session_id
+                {join}
+            """, params)[0]
+            metrics.update({
+                'bounce_rate': self._rate(bounces or 0, sessions),
+                'average_session_duration': int(round(duration or 0)),
+            })
+            return metrics
+        overview = self.overview(category)
+        return {key: overview[key] for key in
+                ('total_users', 'total_sessions', 'total_conversions', 'average_conversion_rate')}
+
+    def table_counts(self) -> Dict[str, int]:
+        """테이블별 행 수"""
+        return {table: self._query(f"SELECT COUNT(*) FROM {table}")[0][0]
+                for table in TABLE_ORDER if table in self._columns}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,441 @@
+"""database/schema.sql 형태의 대용량 합성 이벤트 데이터 생성기
+
+모든 테이블을 NumPy 배열 연산으로 한 번에 만들기 때문에 수백만 행도 몇 초 안에 생성된다.
+user_id/session_id 는 문자열을 엔티티당 한 번만 만들고 행에서는 Categorical 코드로 참조한다.
+
+    python -m analytics.synthetic --users 1000000 --days 30 --out data/synthetic
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 카테고리별 시나리오 프로필 - 단계별 계속 진행 확률로 퍼널 이탈을 만든다
+# stages: (단계명, 페이지 URL, 페이지 제목, 페이지 카테고리, 단계 유형, 예상 소요 시간(분), 이전 단계 대비 진행 확률)
+CATEGORY_PROFILES: List[Dict[str, Any]] = [
+    {
+        'category': 'ecommerce',
+        'scenario_name': 'E-commerce 구매 여정',
+        'description': '상품 탐색부터 결제 완료까지의 여정',
+        'weight': 0.45,
+        'stages': [
+            ('상품 페이지 방문', '/products', '상품 목록', 'product', 'page_view', 3, 1.0),
+            ('장바구니 추가', '/cart', '장바구니', 'cart', 'action', 2, 0.65),
+            ('결제 페이지 진입', '/checkout', '결제', 'checkout', 'page_view', 3, 0.69),
+            ('결제 완료', '/order/complete', '주문 완료', 'checkout', 'conversion', 2, 0.70),
+        ],
+        'browse_pages': [
+            ('/', '홈', 'home'),
+            ('/search', '검색', 'search'),
+            ('/products/detail', '상품 상세', 'product'),
+            ('/reviews', '리뷰', 'content'),
+        ],
+        'actions': [('click', '상품 클릭'), ('add_to_cart', '장바구니 담기'), ('search', '상품 검색'), ('wishlist', '찜하기')],
+        'conversion_type': 'purchase',
+        'conversion_value': (np.log(85000), 0.6),
+    },
+    {
+        'category': 'lead_generation',
+        'scenario_name': '잠재고객 확보 여정',
+        'description': '랜딩 페이지 방문부터 리드 제출까지의 여정',
+        'weight': 0.25,
+        'stages': [
+            ('랜딩 페이지 방문', '/landing', '랜딩', 'landing', 'page_view', 2, 1.0),
+            ('콘텐츠 소비', '/resources', '자료실', 'content', 'page_view', 5, 0.75),
+            ('리드 폼 노출', '/contact/form', '상담 신청', 'form', 'page_view', 2, 0.67),
+            ('리드 제출 완료', '/contact/thanks', '신청 완료', 'form', 'conversion', 1, 0.32),
+        ],
+        'browse_pages': [
+            ('/', '홈', 'home'),
+            ('/blog', '블로그', 'content'),
+            ('/webinar', '웨비나', 'content'),
+            ('/pricing', '요금제', 'pricing'),
+        ],
+        'actions': [('click', 'CTA 클릭'), ('form_focus', '폼 입력 시작'), ('download', '백서 다운로드'), ('scroll', '스크롤')],
+        'conversion_type': 'lead',
+        'conversion_value': None,
+    },
+    {
+        'category': 'general_website',
+        'scenario_name': '일반 웹사이트 여정',
+        'description': '홈페이지 방문부터 연락처 입력까지의 여정',
+        'weight': 0.30,
+        'stages': [
+            ('홈페이지 방문', '/', '홈', 'home', 'page_view', 1, 1.0),
+            ('콘텐츠 페이지 방문', '/blog', '블로그', 'content', 'page_view', 4, 0.80),
+            ('연락처 페이지 방문', '/contact', '연락처', 'contact', 'page_view', 2, 0.50),
+            ('연락처 정보 입력', '/contact/submit', '문의 완료', 'contact', 'conversion', 2, 0.10),
+        ],
+        'browse_pages': [
+            ('/about', '회사 소개', 'about'),
+            ('/services', '서비스', 'content'),
+            ('/news', '소식', 'content'),
+            ('/search', '검색', 'search'),
+        ],
+        'actions': [('click', '링크 클릭'), ('search', '사이트 검색'), ('share', '공유하기'), ('scroll', '스크롤')],
+        'conversion_type': 'signup',
+        'conversion_value': None,
+    },
+]
+
+DEVICE_TYPES = (['desktop', 'mobile', 'tablet'], [0.42, 0.52, 0.06])
+BROWSERS = (['Chrome', 'Safari', 'Samsung Internet', 'Edge', 'Firefox'], [0.55, 0.25, 0.10, 0.07, 0.03])
+OPERATING_SYSTEMS = (['Windows', 'iOS', 'Android', 'macOS', 'Linux'], [0.33, 0.27, 0.28, 0.10, 0.02])
+LOCATIONS = (
+    [('South Korea', 'Seoul'), ('South Korea', 'Busan'), ('South Korea', 'Incheon'),
+     ('South Korea', 'Daegu'), ('Japan', 'Tokyo'), ('United States', 'New York')],
+    [0.52, 0.15, 0.10, 0.08, 0.09, 0.06],
+)
+REFERRERS = ([None, 'https://www.google.com/', 'https://search.naver.com/', 'https://www.instagram.com/',
+              'https://www.facebook.com/'], [0.35, 0.25, 0.25, 0.10, 0.05])
+
+# KPI 정의 - database/sample_data.sql 과 같은 (이름, 설명, 계산식, 단위, 목표, 최소, 최대, 분류)
+KPI_DEFINITIONS = [
+    ('전환율', '각 단계별 사용자 전환율', '완료된 사용자 수 / 시작한 사용자 수 * 100', '%', 15.0, 0.0, 100.0, 'conversion'),
+    ('드롭아웃율', '각 단계에서 이탈하는 사용자 비율', '이탈한 사용자 수 / 시작한 사용자 수 * 100', '%', 10.0, 0.0, 100.0, 'conversion'),
+    ('평균 체류시간', '페이지별 평균 체류 시간', '총 체류시간 / 페이지 뷰 수', '초', 180.0, 0.0, 3600.0, 'engagement'),
+    ('재방문율', '30일 내 재방문하는 사용자 비율', '재방문 사용자 수 / 총 사용자 수 * 100', '%', 30.0, 0.0, 100.0, 'retention'),
+    ('고객 생애 가치', '고객 한 명당 평균 수익', '총 수익 / 고객 수', '원', 50000.0, 0.0, 1000000.0, 'revenue'),
+    ('만족도 점수', '고객 만족도 조사 평균 점수', '만족도 점수 합계 / 응답 수', '점', 4.5, 1.0, 5.0, 'satisfaction'),
+    ('페이지 뷰 수', '페이지별 방문자 수', '페이지 뷰 이벤트 수', '회', 1000.0, 0.0, 100000.0, 'engagement'),
+    ('이탈률', '페이지를 떠나는 사용자 비율', '이탈한 사용자 수 / 방문한 사용자 수 * 100', '%', 20.0, 0.0, 100.0, 'engagement'),
+]
+
+# 세션 내 퍼널 순서를 벗어나 임의 페이지를 보는 비율
+BROWSE_PROBABILITY = 0.3
+# 이탈한 사용자 중 실패한 단계 완료 시도를 기록하는 비율
+FAILED_ATTEMPT_RATE = 0.3
+
+
+def _group_starts(counts: np.ndarray) -> np.ndarray:
+    """그룹 크기 배열에서 각 그룹 시작 위치"""
+    return np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+
+
+def _within_group_index(counts: np.ndarray) -> np.ndarray:
+    """np.repeat 로 펼친 행의 그룹 내 순번 (0부터)"""
+    return np.arange(counts.sum(), dtype=np.int64) - np.repeat(_group_starts(counts), counts)
+
+
+def _group_cumsum(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """그룹별 누적합 (모든 그룹 크기가 1 이상이어야 함)"""
+    total = np.cumsum(values)
+    starts = _group_starts(counts)
+    return total - np.repeat(total[starts] - values[starts], counts)
+
+
+def _choice(rng: np.random.Generator, options: tuple, size: int) -> np.ndarray:
+    """(값 목록, 확률) 에서 코드 배열 추출"""
+    values, weights = options
+    return rng.choice(len(values), size=size, p=weights)
+
+
+def _categorical(codes: np.ndarray, values: list) -> pd.Categorical:
+    """코드 배열을 Categorical 로 변환 (None 값은 결측으로)"""
+    categories = list(dict.fromkeys(value for value in values if value is not None))
+    remap = np.array([categories.index(value) if value is not None else -1 for value in values])
+    return pd.Categorical.from_codes(remap[codes], categories=categories)
+
+
+def _timestamps(base: pd.Timestamp, seconds: np.ndarray) -> np.ndarray:
+    """기준 시각 + 초 오프셋을 datetime64[ns] 로 변환"""
+    return (base.value + np.round(seconds * 1e9).astype(np.int64)).astype('datetime64[ns]')
+
+
+def _ids(prefix: str, count: int, width: int) -> pd.CategoricalDtype:
+    """prefix_0000001 형태의 식별자 목록 - 여러 테이블이 같은 dtype 을 재사용해 검증을 한 번만 하도록"""
+    return pd.CategoricalDtype([f"{prefix}{number:0{width}d}" for number in range(1, count + 1)])
+
+
+def scenario_tables(created_at: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+    """CATEGORY_PROFILES 로 customer_journey_scenarios / journey_stages 테이블 생성"""
+    created_at = created_at or pd.Timestamp(datetime.now()).floor('s')
+    scenarios = pd.DataFrame({
+        'id': np.arange(1, len(CATEGORY_PROFILES) + 1),
+        'name': [profile['scenario_name'] for profile in CATEGORY_PROFILES],
+        'description': [profile['description'] for profile in CATEGORY_PROFILES],
+        'business_goal': None,
+        'target_audience': None,
+        'customer_persona': None,
+        'created_at': created_at,
+        'updated_at': created_at,
+        'is_active': True,
+    })
+    rows = []
+    for scenario_id, profile in enumerate(CATEGORY_PROFILES, start=1):
+        for order, (name, _, _, _, stage_type, duration, _) in enumerate(profile['stages'], start=1):
+            rows.append({
+                'scenario_id': scenario_id,
+                'stage_name': name,
+                'stage_order': order,
+                'stage_type': stage_type,
+                'description': None,
+                'expected_duration_minutes': duration,
+            })
+    stages = pd.DataFrame(rows)
+    stages.insert(0, 'id', np.arange(1, len(stages) + 1))
+    stages['created_at'] = created_at
+    stages['updated_at'] = created_at
+    return {'customer_journey_scenarios': scenarios, 'journey_stages': stages}
+
+
+def kpi_tables(created_at: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+    """KPI_DEFINITIONS 로 kpi_definitions 테이블 생성"""
+    created_at = created_at or pd.Timestamp(datetime.now()).floor('s')
+    definitions = pd.DataFrame(KPI_DEFINITIONS, columns=['name', 'description', 'calculation_formula', 'unit',
+                                                         'target_value', 'min_value', 'max_value', 'category'])
+    definitions.insert(0, 'id', np.arange(1, len(definitions) + 1))
+    definitions['created_at'] = created_at
+    definitions['updated_at'] = created_at
+    return {'kpi_definitions': definitions}
+
+
+def generate_dataset(n_users: int = 10_000, days: int = 30, seed: int = 42,
+                     end: Optional[datetime] = None, sessions_per_user: float = 2.5,
+                     pages_per_session: float = 4.0, actions_per_session: float = 1.5) -> Dict[str, pd.DataFrame]:
+    """schema.sql 테이블 형태의 합성 데이터셋 생성
+
+    같은 seed 와 end 로 호출하면 항상 같은 데이터가 만들어진다.
+    end 를 주지 않으면 오늘 0시를 기간의 끝으로 쓴다.
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp(datetime.now()).normalize()
+    start = end - pd.Timedelta(days=days)
+    horizon = days * 86400.0
+    n_categories = len(CATEGORY_PROFILES)
+    tables = scenario_tables(start)
+    tables.update(kpi_tables(start))
+
+    # 카테고리별 조회 테이블 (단계 수가 다르면 0 확률로 채움)
+    max_stages = max(len(profile['stages']) for profile in CATEGORY_PROFILES)
+    stage_counts = np.array([len(profile['stages']) for profile in CATEGORY_PROFILES])
+    continue_rates = np.zeros((n_categories, max_stages))
+    expected_minutes = np.ones((n_categories, max_stages))
+    stage_ids = np.zeros((n_categories, max_stages), dtype=np.int64)
+    page_urls, page_titles, page_categories = [], [], []
+
+    def page_index(url: str, title: str, page_category: str) -> int:
+        # 카테고리 사이에 같은 URL 은 하나의 페이지로 취급
+        if url not in page_urls:
+            page_urls.append(url)
+            page_titles.append(title)
+            page_categories.append(page_category)
+        return page_urls.index(url)
+
+    funnel_pages = np.zeros((n_categories, max_stages), dtype=np.int64)
+    n_browse = len(CATEGORY_PROFILES[0]['browse_pages'])
+    browse_pages = np.zeros((n_categories, n_browse), dtype=np.int64)
+    stage_id = 1
+    for c, profile in enumerate(CATEGORY_PROFILES):
+        for k, (_, url, title, page_category, _, minutes, rate) in enumerate(profile['stages']):
+            continue_rates[c, k] = rate
+            expected_minutes[c, k] = minutes
+            stage_ids[c, k] = stage_id
+            stage_id += 1
+            funnel_pages[c, k] = page_index(url, title, page_category)
+        # 단계가 적은 카테고리는 마지막 단계 페이지로 채움
+        funnel_pages[c, len(profile['stages']):] = funnel_pages[c, len(profile['stages']) - 1]
+        for b, (url, title, page_category) in enumerate(profile['browse_pages']):
+            browse_pages[c, b] = page_index(url, title, page_category)
+
+    # 사용자
+    user_category = rng.choice(n_categories, size=n_users, p=[profile['weight'] for profile in CATEGORY_PROFILES])
+    first_seen = rng.uniform(0, horizon, n_users)
+    user_ids = _ids('user_', n_users, 7)
+
+    # 퍼널 도달 깊이 - 연속으로 다음 단계에 진행한 횟수
+    advanced = rng.random((n_users, max_stages)) < continue_rates[user_category]
+    depth = np.cumprod(advanced, axis=1).sum(axis=1)
+    depth = np.maximum(depth, 1)
+
+    # 세션 - 첫 방문 이후 지수 분포 간격으로 재방문, 기간을 넘는 세션은 버림
+    sessions_per = 1 + rng.poisson(max(sessions_per_user - 1, 0), n_users)
+    session_user = np.repeat(np.arange(n_users), sessions_per)
+    gaps = rng.exponential(horizon / (2 * sessions_per_user), len(session_user))
+    gaps[_group_starts(sessions_per)] = 0.0
+    session_start = first_seen[session_user] + _group_cumsum(gaps, sessions_per)
+    keep = session_start < horizon
+    session_user = session_user[keep]
+    session_start = session_start[keep]
+    sessions_per = np.bincount(session_user, minlength=n_users)
+    n_sessions = len(session_user)
+    first_session = _group_starts(sessions_per)
+    session_ids = _ids('sess_', n_sessions, 8)
+
+    # 페이지 뷰 - 세션 안에서 퍼널 순서대로 진행하되 일부는 임의 페이지 탐색
+    views_per = rng.geometric(1 / pages_per_session, n_sessions)
+    view_session = np.repeat(np.arange(n_sessions), views_per)
+    view_user = session_user[view_session]
+    view_category = user_category[view_user]
+    step = _within_group_index(views_per)
+    funnel_step = np.minimum(step, depth[view_user] - 1)
+    browsing = rng.random(len(view_session)) < BROWSE_PROBABILITY
+    page = np.where(
+        browsing,
+        browse_pages[view_category, rng.integers(0, n_browse, len(view_session))],
+        funnel_pages[view_category, funnel_step],
+    )
+    time_on_page = np.clip(rng.lognormal(np.log(45), 1.0, len(view_session)), 1, 3600).astype(np.int64)
+    view_offset = session_start[view_session] + _group_cumsum(time_on_page.astype(float), views_per) - time_on_page
+    view_starts = _group_starts(views_per)
+    view_ends = view_starts + views_per - 1
+    session_end = view_offset[view_ends] + time_on_page[view_ends]
+
+    sessions_user_codes = pd.Categorical.from_codes(session_user, dtype=user_ids)
+    view_session_codes = pd.Categorical.from_codes(view_session, dtype=session_ids)
+    location = _choice(rng, LOCATIONS, n_sessions)
+    tables['users'] = pd.DataFrame({
+        'id': np.arange(1, n_users + 1),
+        'user_id': user_ids.categories.to_numpy(),
+        'email': None,
+        'first_name': None,
+        'last_name': None,
+        'created_at': _timestamps(start, first_seen),
+        'updated_at': _timestamps(start, first_seen),
+        'is_active': True,
+    })
+    tables['user_sessions'] = pd.DataFrame({
+        'id': np.arange(1, n_sessions + 1),
+        'user_id': sessions_user_codes,
+        'session_id': session_ids.categories.to_numpy(),
+        'started_at': _timestamps(start, session_start),
+        'ended_at': _timestamps(start, session_end),
+        'user_agent': None,
+        'ip_address': None,
+        'referrer_url': _categorical(_choice(rng, REFERRERS, n_sessions), REFERRERS[0]),
+        'landing_page': _categorical(page[view_starts], page_urls),
+        'device_type': _categorical(_choice(rng, DEVICE_TYPES, n_sessions), DEVICE_TYPES[0]),
+        'browser': _categorical(_choice(rng, BROWSERS, n_sessions), BROWSERS[0]),
+        'os': _categorical(_choice(rng, OPERATING_SYSTEMS, n_sessions), OPERATING_SYSTEMS[0]),
+        'country': _categorical(location, [country for country, _ in LOCATIONS[0]]),
+        'city': _categorical(location, [city for _, city in LOCATIONS[0]]),
+    })
+    tables['page_view_events'] = pd.DataFrame({
+        'id': np.arange(1, len(view_session) + 1),
+        'session_id': view_session_codes,
+        'user_id': pd.Categorical.from_codes(view_user, dtype=user_ids),
+        'page_url': _categorical(page, page_urls),
+        'page_title': _categorical(page, page_titles),
+        'page_category': _categorical(page, page_categories),
+        'viewed_at': _timestamps(start, view_offset),
+        'time_on_page_seconds': time_on_page,
+        'scroll_depth_percentage': (rng.beta(2, 2, len(view_session)) * 100).astype(np.int64),
+        'is_bounce': (views_per == 1)[view_session],
+    })
+
+    # 액션 이벤트 - 세션 안의 임의 시점, 임의 페이지 뷰에서 발생
+    actions_per = rng.poisson(actions_per_session, n_sessions)
+    action_session = np.repeat(np.arange(n_sessions), actions_per)
+    action_category = user_category[session_user[action_session]]
+    n_action_types = len(CATEGORY_PROFILES[0]['actions'])
+    action_kind = rng.integers(0, n_action_types, len(action_session))
+    action_codes = action_category * n_action_types + action_kind
+    action_types = [kind for profile in CATEGORY_PROFILES for kind, _ in profile['actions']]
+    action_names = [name for profile in CATEGORY_PROFILES for _, name in profile['actions']]
+    action_view = view_starts[action_session] + (rng.random(len(action_session)) * views_per[action_session]).astype(np.int64)
+    action_offset = view_offset[action_view] + rng.random(len(action_session)) * time_on_page[action_view]
+    tables['user_action_events'] = pd.DataFrame({
+        'id': np.arange(1, len(action_session) + 1),
+        'session_id': pd.Categorical.from_codes(action_session, dtype=session_ids),
+        'user_id': pd.Categorical.from_codes(session_user[action_session], dtype=user_ids),
+        'action_type': _categorical(action_codes, action_types),
+        'action_name': _categorical(action_codes, action_names),
+        'element_id': None,
+        'element_class': None,
+        'element_text': None,
+        'page_url': _categorical(page[action_view], page_urls),
+        'action_data': None,
+        'performed_at': _timestamps(start, action_offset),
+    })
+
+    # 여정 단계 완료 - 첫 세션 시작부터 단계별 소요 시간을 누적
+    completion_user = np.repeat(np.arange(n_users), depth)
+    completion_category = user_category[completion_user]
+    completion_order = _within_group_index(depth)
+    duration = np.ceil(rng.exponential(expected_minutes[completion_category, completion_order])).astype(np.int64)
+    completion_offset = session_start[first_session[completion_user]] + _group_cumsum(duration * 60.0, depth)
+
+    # 다음 단계에서 실패한 시도 (is_successful = false)
+    dropped = np.flatnonzero((depth < stage_counts[user_category]) & (rng.random(n_users) < FAILED_ATTEMPT_RATE))
+    last_completion = _group_starts(depth)[dropped] + depth[dropped] - 1
+    failed_duration = np.ceil(rng.exponential(expected_minutes[user_category[dropped], depth[dropped]])).astype(np.int64)
+
+    all_users = np.concatenate([completion_user, dropped])
+    all_categories = user_category[all_users]
+    all_orders = np.concatenate([completion_order, depth[dropped]])
+    all_durations = np.concatenate([duration, failed_duration])
+    all_offsets = np.concatenate([completion_offset, completion_offset[last_completion] + failed_duration * 60.0])
+    successful = np.concatenate([np.ones(len(completion_user), bool), np.zeros(len(dropped), bool)])
+    order = np.argsort(all_offsets, kind='stable')
+    tables['journey_stage_completions'] = pd.DataFrame({
+        'id': np.arange(1, len(all_users) + 1),
+        'user_id': pd.Categorical.from_codes(all_users[order], dtype=user_ids),
+        'session_id': pd.Categorical.from_codes(first_session[all_users][order], dtype=session_ids),
+        'stage_id': stage_ids[all_categories, all_orders][order],
+        'scenario_id': all_categories[order] + 1,
+        'completed_at': _timestamps(start, all_offsets[order]),
+        'completion_duration_minutes': all_durations[order],
+        'is_successful': successful[order],
+        'failure_reason': pd.Categorical.from_codes(np.where(successful[order], -1, 0), categories=['이탈']),
+    })
+
+    # 전환 - 마지막 단계까지 완료한 사용자
+    converted = np.flatnonzero(depth == stage_counts[user_category])
+    converted_category = user_category[converted]
+    values = np.full(len(converted), np.nan)
+    for c, profile in enumerate(CATEGORY_PROFILES):
+        if profile['conversion_value'] is not None:
+            mask = converted_category == c
+            mean, sigma = profile['conversion_value']
+            values[mask] = np.round(rng.lognormal(mean, sigma, mask.sum()), -2)
+    conversion_types = [profile['conversion_type'] for profile in CATEGORY_PROFILES]
+    final_completion = _group_starts(depth)[converted] + depth[converted] - 1
+    tables['conversion_events'] = pd.DataFrame({
+        'id': np.arange(1, len(converted) + 1),
+        'session_id': pd.Categorical.from_codes(first_session[converted], dtype=session_ids),
+        'user_id': pd.Categorical.from_codes(converted, dtype=user_ids),
+        'conversion_type': _categorical(converted_category, conversion_types),
+        'conversion_value': values,
+        'conversion_currency': 'KRW',
+        'conversion_data': None,
+        'converted_at': _timestamps(start, completion_offset[final_completion]),
+    })
+
+    return tables
+
+
+def write_parquet(tables: Dict[str, pd.DataFrame], directory: str) -> List[str]:
+    """테이블별 Parquet 파일 저장"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, frame in tables.items():
+        path = os.path.join(directory, f"{name}.parquet")
+        frame.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    """합성 데이터 생성 CLI"""
+    parser = argparse.ArgumentParser(description="schema.sql 형태의 합성 이벤트 데이터 생성")
+    parser.add_argument('--users', type=int, default=100_000, help="사용자 수")
+    parser.add_argument('--days', type=int, default=30, help="기간 (일)")
+    parser.add_argument('--seed', type=int, default=42, help="난수 시드")
+    parser.add_argument('--out', default='data/synthetic', help="Parquet 저장 디렉터리")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    tables = generate_dataset(args.users, args.days, args.seed)
+    generated = time.perf_counter() - started
+    write_parquet(tables, args.out)
+    for name, frame in tables.items():
+        print(f"{name:28s} {len(frame):>12,} 행")
+    print(f"생성 {generated:.2f}초 · 저장 {time.perf_counter() - started - generated:.2f}초 → {args.out}")
+
+
+if __name__ == '__main__':
+    main()
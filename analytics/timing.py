@@ -0,0 +1,166 @@
+"""핫패스 타이밍 계측
+
+데이터 가져오기, DataFrame 변환, 차트 생성, 렌더링 구간을 이름 붙은 스팬으로 재서
+
+- 화면용으로는 스팬별 최근 window 개 표본의 p50/p95 와 지연 히스토그램을
+- 수집기용으로는 프로세스 시작 이후 누적 히스토그램을 Prometheus 텍스트 형식으로
+
+제공한다. 계측이 꺼져 있으면 span() 은 공유 no-op 객체를, timed() 래퍼는 원래 함수를 바로 호출하므로
+시간 측정도 잠금도 일어나지 않는다.
+"""
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List
+
+# 스팬 지연 히스토그램 구간 상한 (ms)
+SPAN_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+METRIC_NAME = 'dashboard_span_duration_seconds'
+
+
+class _NullSpan:
+    """계측이 꺼져 있을 때 쓰는 아무 일도 하지 않는 스팬"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'started')
+
+    def __init__(self, recorder: 'SpanRecorder', name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _SpanStats:
+    __slots__ = ('recent', 'buckets', 'total', 'count')
+
+    def __init__(self, window: int):
+        self.recent: Deque[float] = deque(maxlen=window)
+        self.buckets = [0] * (len(SPAN_BUCKETS_MS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class SpanRecorder:
+    """스레드 안전한 스팬 지연 집계기 (프로세스당 하나)"""
+
+    def __init__(self, window: int = 500, enabled: bool = False):
+        self.window = window
+        self.enabled = enabled
+        self._spans: Dict[str, _SpanStats] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str):
+        """with 블록 실행 시간을 name 스팬으로 기록"""
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        """함수 실행 시간을 name 스팬으로 기록하는 데코레이터"""
+        def decorate(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - started)
+            return wrapper
+        return decorate
+
+    def record(self, name: str, seconds: float) -> None:
+        """스팬 표본 하나 추가"""
+        latency_ms = seconds * 1000
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = _SpanStats(self.window)
+            stats.recent.append(latency_ms)
+            stats.buckets[bisect_left(SPAN_BUCKETS_MS, latency_ms)] += 1
+            stats.total += seconds
+            stats.count += 1
+
+    def reset(self) -> None:
+        """모든 스팬 기록 삭제"""
+        with self._lock:
+            self._spans.clear()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """스팬별 최근 표본 요약 - 느린 순 (p95 기준)"""
+        with self._lock:
+            spans = {name: (sorted(stats.recent), stats.count) for name, stats in self._spans.items()}
+        labels = [f"≤{bound}ms" for bound in SPAN_BUCKETS_MS] + [f">{SPAN_BUCKETS_MS[-1]}ms"]
+        rows = []
+        for name, (latencies, count) in spans.items():
+            if not latencies:
+                continue
+            histogram = [0] * len(labels)
+            for latency in latencies:
+                histogram[bisect_left(SPAN_BUCKETS_MS, latency)] += 1
+            rows.append({
+                'span': name,
+                'count': count,
+                'samples': len(latencies),
+                'mean_ms': round(sum(latencies) / len(latencies), 2),
+                'p50_ms': round(latencies[len(latencies) // 2], 2),
+                'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+                'max_ms': round(latencies[-1], 2),
+                'histogram': dict(zip(labels, histogram)),
+            })
+        return sorted(rows, key=lambda row: row['p95_ms'], reverse=True)
+
+    def to_prometheus(self) -> str:
+        """누적 히스토그램을 Prometheus 텍스트 노출 형식으로"""
+        with self._lock:
+            spans = {name: (list(stats.buckets), stats.total, stats.count) for name, stats in self._spans.items()}
+        lines = [
+            f"# HELP {METRIC_NAME} Dashboard hot-path span duration in seconds.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        bounds = [f"{bound / 1000:g}" for bound in SPAN_BUCKETS_MS] + ['+Inf']
+        for name in sorted(spans):
+            buckets, total, count = spans[name]
+            label = name.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            cumulative = 0
+            for bound, hits in zip(bounds, buckets):
+                cumulative += hits
+                lines.append(f'{METRIC_NAME}_bucket{{span="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_sum{{span="{label}"}} {total:.6f}')
+            lines.append(f'{METRIC_NAME}_count{{span="{label}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """Prometheus 텍스트 파일로 내보내기 - 수집기가 반쯤 쓴 파일을 읽지 않도록 임시 파일을 바꿔치기한다"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            handle.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+
+# DASHBOARD_TIMING=1 이면 시작부터 계측, DASHBOARD_TIMING_EXPORT 경로가 있으면 화면을 그릴 때마다 내보낸다
+recorder = SpanRecorder(enabled=os.getenv('DASHBOARD_TIMING') == '1')
+TIMING_EXPORT_PATH = os.getenv('DASHBOARD_TIMING_EXPORT')
+span = recorder.span
+timed = recorder.timed
@@ -0,0 +1,96 @@
+"""카테고리별 대시보드 데이터 사전 계산 (캐시 워머)"""
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from analytics.cache import TTLCache
+
+
+class CacheWarmer:
+    """(엔드포인트, 카테고리) 조합을 백그라운드에서 미리 계산해 캐시에 채워 두는 워머
+
+    시작하면 먼저 모든 조합을 한 번 계산해 두므로 어떤 카테고리로 바꿔도 캐시에서 바로 그려진다.
+    이후 interval 마다는 최근 idle_after 초 안에 조회된 키 중 곧 만료될 항목(남은 TTL < lead_time)만
+    다시 계산하므로, 접속한 세션이 없으면 아무것도 계산하지 않아 저장소 잠금을 잡지 않는다.
+    """
+
+    def __init__(self, cache: TTLCache, load: Callable[[str, str], Dict[str, Any]],
+                 endpoints: List[str], categories: List[str],
+                 interval: float = 5.0, lead_time: Optional[float] = None, idle_after: float = 300.0):
+        self.cache = cache
+        self.load = load
+        self.endpoints = endpoints
+        self.categories = categories
+        self.interval = interval
+        self.lead_time = interval * 2 if lead_time is None else lead_time
+        self.idle_after = idle_after
+        self.runs = 0
+        self.warmed = 0
+        self.errors = 0
+        self.last_run: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'CacheWarmer':
+        """워머 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='cache-warmer', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """워머 스레드 중지"""
+        self._stop.set()
+
+    def _run(self) -> None:
+        self.warm(seed=True)
+        while not self._stop.wait(self.interval):
+            self.warm()
+
+    def warm(self, seed: bool = False) -> int:
+        """곧 만료되거나 비어 있는 항목을 다시 계산하고, 갱신한 항목 수 반환
+
+        seed 이면 조회 여부와 관계없이 모든 조합을, 아니면 최근에 조회된 키만 계산한다.
+        """
+        warmed = 0
+        errors = 0
+        for category in self.categories:
+            params = {'category': category}
+            for endpoint in self.endpoints:
+                if not seed:
+                    accessed = self.cache.last_accessed(endpoint, params)
+                    if accessed is None or time.time() - accessed > self.idle_after:
+                        continue
+                remaining = self.cache.expires_in(endpoint, params)
+                if remaining is not None and remaining > self.lead_time:
+                    continue
+                try:
+                    value = self.load(endpoint, category)
+                except Exception:
+                    errors += 1
+                    continue
+                if isinstance(value, dict) and value.get('success'):
+                    self.cache.set(endpoint, params, value)
+                    warmed += 1
+                else:
+                    errors += 1
+        with self._lock:
+            self.runs += 1
+            self.warmed += warmed
+            self.errors += errors
+            self.last_run = datetime.now()
+        return warmed
+
+    def stats(self) -> Dict[str, Any]:
+        """워머 실행 통계"""
+        with self._lock:
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'runs': self.runs,
+                'warmed': self.warmed,
+                'errors': self.errors,
+                'last_run': self.last_run,
+            }
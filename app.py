@@ -1,15 +1,20 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import requests
 import os
-import json
 from datetime import datetime, timedelta
-import random
 from typing import Dict, List, Any, Optional
-import time
+import inspect
+from functools import lru_cache, partial
+
+from analytics.cache import SharedCache
+from analytics.concurrency import fetch_concurrently
+from analytics.downsample import TREND_POINT_BUDGET, WEBGL_THRESHOLD, downsample_points
+from analytics.figures import FigureCache, memoized_figure
+from analytics.paths import MAX_DEPTH as MAX_PATH_DEPTH
+from analytics.store import TREND_RESOLUTIONS, AnalyticsStore
+from analytics.timing import TIMING_EXPORT_PATH, recorder as span_recorder, span, timed
+from analytics.warmer import CacheWarmer
 
 # 페이지 설정
 st.set_page_config(
@@ -99,9 +104,10 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# 환경 설정 - Streamlit Cloud에서는 항상 모의 데이터 사용
+# 환경 설정 - Streamlit Cloud에서는 내장 분석 저장소 사용
+@st.cache_resource
 def is_streamlit_cloud_environment():
-    """Streamlit Cloud 환경인지 확인"""
+    """Streamlit Cloud 환경인지 확인 - 환경 변수는 프로세스 동안 바뀌지 않으므로 한 번만 확인"""
     cloud_indicators = [
         os.getenv('STREAMLIT_CLOUD') == 'true',
         os.getenv('STREAMLIT_SHARING_MODE') == 'streamlit',
@@ -117,179 +123,183 @@ IS_STREAMLIT_CLOUD = is_streamlit_cloud_environment()
 # 세션 상태 초기화
 if 'selected_category' not in st.session_state:
     st.session_state.selected_category = 'all'
+if 'selected_period' not in st.session_state:
+    st.session_state.selected_period = 0
+if 'exact_counts' not in st.session_state:
+    st.session_state.exact_counts = False
 if 'show_admin_panel' not in st.session_state:
     st.session_state.show_admin_panel = False
 if 'last_refresh' not in st.session_state:
     st.session_state.last_refresh = datetime.now()
+if 'refreshed_at' not in st.session_state:
+    # 사용자가 직접 새로고침한 시각 - 이보다 오래된 공유 캐시 항목은 쓰지 않음
+    st.session_state.refreshed_at = None
 
-# 모의 데이터 생성 함수들
-def generate_mock_overview(category: str = 'all') -> Dict[str, Any]:
-    """모의 대시보드 개요 데이터 생성"""
-    base_data = {
-        'total_users': random.randint(50000, 150000),
-        'total_sessions': random.randint(80000, 200000),
-        'total_conversions': random.randint(5000, 15000),
-        'average_conversion_rate': round(random.uniform(5.0, 12.0), 1)
-    }
-    
-    if category == 'ecommerce':
-        base_data.update({
-            'total_revenue': random.randint(50000000, 200000000),
-            'average_order_value': random.randint(80000, 150000)
-        })
-    elif category == 'lead_generation':
-        base_data.update({
-            'total_leads': random.randint(2000, 8000),
-            'lead_conversion_rate': round(random.uniform(15.0, 35.0), 1)
-        })
-    elif category == 'general_website':
-        base_data.update({
-            'total_page_views': random.randint(150000, 400000),
-            'unique_visitors': random.randint(30000, 80000)
-        })
-    
-    return base_data
-
-def generate_mock_funnel_data(category: str = 'all') -> List[Dict[str, Any]]:
-    """모의 퍼널 데이터 생성"""
-    if category == 'ecommerce':
-        stages = [
-            {'stage_name': '홈페이지 방문', 'users_reached': 10000},
-            {'stage_name': '상품 탐색', 'users_reached': 7500},
-            {'stage_name': '장바구니 추가', 'users_reached': 4500},
-            {'stage_name': '결제 페이지', 'users_reached': 2800},
-            {'stage_name': '구매 완료', 'users_reached': 2100}
-        ]
-    elif category == 'lead_generation':
-        stages = [
-            {'stage_name': '랜딩페이지 방문', 'users_reached': 8000},
-            {'stage_name': '콘텐츠 확인', 'users_reached': 6000},
-            {'stage_name': '이메일 입력', 'users_reached': 3500},
-            {'stage_name': '이메일 인증', 'users_reached': 2800},
-            {'stage_name': '리드 등록', 'users_reached': 2200}
-        ]
-    else:
-        stages = [
-            {'stage_name': '웹사이트 방문', 'users_reached': 12000},
-            {'stage_name': '페이지 탐색', 'users_reached': 9000},
-            {'stage_name': '콘텐츠 소비', 'users_reached': 6500},
-            {'stage_name': '행동 완료', 'users_reached': 4200}
-        ]
-    
-    return stages
-
-def generate_mock_kpi_trends(category: str = 'all') -> List[Dict[str, Any]]:
-    """모의 KPI 트렌드 데이터 생성"""
-    trends = []
-    base_date = datetime.now() - timedelta(days=30)
-    
-    for i in range(30):
-        date = base_date + timedelta(days=i)
-        if category == 'ecommerce':
-            value = random.uniform(8.0, 15.0)
-        elif category == 'lead_generation':
-            value = random.uniform(12.0, 25.0)
-        else:
-            value = random.uniform(6.0, 12.0)
-        
-        trends.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'value': round(value, 1)
-        })
-    
-    return trends
+# 카테고리 목록
+CATEGORIES = {
+    'all': '전체',
+    'ecommerce': 'E-commerce',
+    'lead_generation': '잠재고객 확보',
+    'general_website': '일반 웹사이트'
+}
 
-def generate_mock_recent_events(category: str = 'all') -> List[Dict[str, Any]]:
-    """모의 최근 이벤트 데이터 생성"""
-    events = []
-    event_types = {
-        'ecommerce': ['상품 조회', '장바구니 추가', '구매 완료', '리뷰 작성'],
-        'lead_generation': ['페이지 방문', '이메일 구독', '다운로드', '문의하기'],
-        'general_website': ['페이지 방문', '링크 클릭', '검색', '다운로드']
-    }
-    
-    for i in range(10):
-        event_type = random.choice(event_types.get(category, ['페이지 방문', '링크 클릭']))
-        events.append({
-            'id': f'event_{i+1}',
-            'user_id': f'user_{random.randint(1000, 9999)}',
-            'event_type': event_type,
-            'timestamp': (datetime.now() - timedelta(minutes=random.randint(1, 1440))).isoformat(),
-            'category': category,
-            'value': random.randint(1, 100) if event_type in ['구매 완료', '다운로드'] else None
-        })
-    
-    return sorted(events, key=lambda x: x['timestamp'], reverse=True)
+# 내장 분석 저장소 설정 - ANALYTICS_DATA_DIR 에 Parquet 데이터셋이 있으면 사용하고 없으면 합성 데이터 생성
+ANALYTICS_DATA_DIR = os.getenv('ANALYTICS_DATA_DIR')
+ANALYTICS_SYNTHETIC_USERS = int(os.getenv('ANALYTICS_SYNTHETIC_USERS', '20000'))
 
-def generate_mock_scenario_performance(category: str = 'all') -> List[Dict[str, Any]]:
-    """모의 시나리오 성과 데이터 생성"""
-    scenarios = {
-        'ecommerce': ['신규 고객', '재방문 고객', '프리미엄 고객'],
-        'lead_generation': ['이메일 캠페인', '소셜미디어', '검색 광고'],
-        'general_website': ['직접 방문', '검색 엔진', '소셜 미디어']
-    }
-    
-    performance = []
-    for scenario in scenarios.get(category, ['시나리오 1', '시나리오 2', '시나리오 3']):
-        performance.append({
-            'scenario_name': scenario,
-            'conversion_rate': round(random.uniform(5.0, 25.0), 1),
-            'total_users': random.randint(1000, 10000),
-            'converted_users': random.randint(100, 2000)
-        })
-    
-    return performance
-
-def generate_mock_category_metrics(category: str = 'all') -> Dict[str, Any]:
-    """모의 카테고리별 메트릭 데이터 생성"""
-    if category == 'ecommerce':
-        return {
-            'total_revenue': random.randint(50000000, 200000000),
-            'average_order_value': random.randint(80000, 150000),
-            'cart_abandonment_rate': round(random.uniform(20.0, 40.0), 1),
-            'repeat_purchase_rate': round(random.uniform(15.0, 35.0), 1)
-        }
-    elif category == 'lead_generation':
-        return {
-            'total_leads': random.randint(2000, 8000),
-            'lead_conversion_rate': round(random.uniform(15.0, 35.0), 1),
-            'email_open_rate': round(random.uniform(20.0, 45.0), 1),
-            'click_through_rate': round(random.uniform(2.0, 8.0), 1)
-        }
-    elif category == 'general_website':
-        return {
-            'total_page_views': random.randint(150000, 400000),
-            'unique_visitors': random.randint(30000, 80000),
-            'bounce_rate': round(random.uniform(30.0, 60.0), 1),
-            'average_session_duration': random.randint(120, 480)
-        }
-    else:
-        return {
-            'total_users': random.randint(50000, 150000),
-            'total_sessions': random.randint(80000, 200000),
-            'total_conversions': random.randint(5000, 15000),
-            'average_conversion_rate': round(random.uniform(5.0, 12.0), 1)
-        }
-
-# 데이터 가져오기 함수 - 항상 모의 데이터 사용
-def fetch_data(endpoint: str, category: str = 'all') -> Dict[str, Any]:
-    """데이터 가져오기 - 항상 모의 데이터 사용"""
-    if 'overview' in endpoint:
-        return {'success': True, 'data': generate_mock_overview(category)}
-    elif 'funnels' in endpoint:
-        return {'success': True, 'data': generate_mock_funnel_data(category)}
-    elif 'kpi-trends' in endpoint:
-        return {'success': True, 'data': generate_mock_kpi_trends(category)}
-    elif 'recent-events' in endpoint:
-        return {'success': True, 'data': generate_mock_recent_events(category)}
-    elif 'scenario-performance' in endpoint:
-        return {'success': True, 'data': generate_mock_scenario_performance(category)}
-    elif 'category-metrics' in endpoint:
-        return {'success': True, 'data': generate_mock_category_metrics(category)}
-    else:
+@st.cache_resource(show_spinner="분석 데이터를 적재하는 중...")
+def get_analytics_store() -> AnalyticsStore:
+    """원시 이벤트를 담은 내장 분석 저장소 (프로세스당 하나)"""
+    if ANALYTICS_DATA_DIR and os.path.isdir(ANALYTICS_DATA_DIR):
+        return AnalyticsStore.from_parquet(ANALYTICS_DATA_DIR)
+    return AnalyticsStore.from_synthetic(ANALYTICS_SYNTHETIC_USERS)
+
+# 엔드포인트별 저장소 집계 메서드
+STORE_QUERIES = {
+    'dashboard/overview': AnalyticsStore.overview,
+    'dashboard/funnels': AnalyticsStore.funnels,
+    'dashboard/kpi-trends': AnalyticsStore.kpi_trends,
+    'dashboard/recent-events': AnalyticsStore.recent_events,
+    'dashboard/scenario-performance': AnalyticsStore.scenario_performance,
+    'dashboard/category-metrics': AnalyticsStore.category_metrics,
+    'dashboard/breakdown': AnalyticsStore.breakdown,
+    'journey/ordered-funnel': AnalyticsStore.ordered_funnel,
+    'journey/paths': AnalyticsStore.paths,
+    'journey/dropout': AnalyticsStore.dropout,
+    'retention/cohorts': AnalyticsStore.retention,
+    'kpi/percentiles': AnalyticsStore.percentiles,
+    'kpi/measurements': AnalyticsStore.kpi_summary,
+}
+
+# 기간 선택 (최근 N일, 0 은 전체 기간) - 기간을 받는 엔드포인트는 일자별 스케치를 병합해 집계
+PERIODS = {0: '전체 기간', 30: '최근 30일', 7: '최근 7일', 1: '최근 1일'}
+DATE_RANGE_ENDPOINTS = ('dashboard/overview', 'dashboard/funnels', 'kpi/percentiles', 'dashboard/breakdown')
+
+# KPI 트렌드 확대 - 구간을 좁히면 구간 수가 이 값을 넘지 않는 가장 잘은 해상도로 다시 가져온다
+ZOOM_MAX_BUCKETS = 20_000
+TREND_RESOLUTION_LABELS = {'day': '일', 'hour': '시간', 'minute': '분'}
+
+# 드릴다운 - 롤업 큐브 팩트·차원·측정값 이름
+ROLLUP_FACTS = {'sessions': '세션', 'page_views': '페이지뷰', 'conversions': '전환'}
+ROLLUP_DIMENSIONS = {
+    'device_type': '기기',
+    'browser': '브라우저',
+    'country': '국가',
+    'page_category': '페이지 분류',
+    'conversion_type': '전환 유형'
+}
+ROLLUP_MEASURES = {
+    'sessions': '세션 수',
+    'duration_seconds': '총 세션 시간 (초)',
+    'page_views': '페이지뷰',
+    'time_on_page_seconds': '총 체류 시간 (초)',
+    'bounces': '이탈 페이지뷰',
+    'conversions': '전환 수',
+    'conversion_value': '전환 금액'
+}
+
+# 데이터 가져오기 함수 - 내장 저장소에서 집계
+def load_data(endpoint: str, category: str = 'all', store: Optional[AnalyticsStore] = None,
+              days: int = 0, exact: bool = False, **options) -> Dict[str, Any]:
+    """저장소에서 엔드포인트 데이터 집계
+
+    워커 스레드에서는 cache_resource 를 부를 수 없으므로 store 를 직접 넘긴다.
+    exact 이면 고유 개수를 스케치 추정 대신 원시 테이블에서 정확히 센다 (감사용).
+    나머지 options 는 집계 메서드에 그대로 전달한다 (예: window_hours).
+    """
+    query = STORE_QUERIES.get(endpoint)
+    if query is None:
         return {'success': False, 'error': 'Unknown endpoint'}
+    store = store or get_analytics_store()
+    kwargs = dict(options)
+    if endpoint in DATE_RANGE_ENDPOINTS:
+        start, end = store.date_range(days)
+        kwargs.update(start=start, end=end, exact=exact)
+    try:
+        with span(f"query:{endpoint}"):
+            return {'success': True, 'data': query(store, category, **kwargs)}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+@lru_cache(maxsize=None)
+def option_defaults(endpoint: str) -> Dict[str, Any]:
+    """엔드포인트 옵션의 기본값 - 집계 메서드의 키워드 기본값과 load_data 의 days/exact"""
+    query = STORE_QUERIES.get(endpoint)
+    parameters = inspect.signature(query).parameters.values() if query is not None else []
+    defaults = {param.name: param.default for param in parameters if param.default is not inspect.Parameter.empty}
+    defaults.update(days=0, exact=False)
+    return defaults
+
+@st.cache_resource
+def get_data_cache() -> SharedCache:
+    """모든 세션이 공유하는 데이터 캐시"""
+    return SharedCache()
+
+@st.cache_resource
+def get_figure_cache() -> FigureCache:
+    """모든 세션이 공유하는 차트 Figure 캐시 - 같은 입력이면 Figure 를 다시 만들지 않음"""
+    return FigureCache()
+
+def refresh_data():
+    """캐시를 비우고 마지막 새로고침 시각 갱신"""
+    get_data_cache().invalidate()
+    st.session_state.last_refresh = datetime.now()
+    st.session_state.refreshed_at = st.session_state.last_refresh.timestamp()
+
+def fetch_data(endpoint: str, category: str = 'all', cache: Optional[SharedCache] = None,
+               not_before: Optional[float] = None, store: Optional[AnalyticsStore] = None,
+               **options) -> Dict[str, Any]:
+    """데이터 가져오기 - 캐시가 유효하면 캐시에서 반환
+
+    워커 스레드에서는 세션 상태에 접근할 수 없으므로 cache, not_before, store 를 직접 넘긴다.
+    options(days, exact 등)는 기본값과 다를 때만 캐시 키에 넣어 기본값 키가 워머가 미리 채우는 키와 같게 한다.
+    """
+    if cache is None:
+        cache = get_data_cache()
+        not_before = st.session_state.refreshed_at
+        store = get_analytics_store()
+    defaults = option_defaults(endpoint)
+    params = {'category': category}
+    params.update({
+        name: value for name, value in options.items()
+        if name not in defaults or value != defaults[name]
+    })
+    with span(f"fetch:{endpoint}"):
+        return cache.fetch(endpoint, params, partial(load_data, endpoint, category, store, **options), not_before)
+
+# 대시보드 패널별 엔드포인트
+DASHBOARD_ENDPOINTS = {
+    'overview': 'dashboard/overview',
+    'funnels': 'dashboard/funnels',
+    'kpi_trends': 'dashboard/kpi-trends',
+    'recent_events': 'dashboard/recent-events',
+    'scenario_performance': 'dashboard/scenario-performance',
+    'category_metrics': 'dashboard/category-metrics'
+}
+
+def fetch_dashboard_data(category: str = 'all', days: int = 0, exact: bool = False) -> Dict[str, Dict[str, Any]]:
+    """대시보드 패널 데이터를 동시에 가져오기"""
+    cache = get_data_cache()
+    not_before = st.session_state.refreshed_at
+    store = get_analytics_store()
+    with span('fetch:dashboard'):
+        return fetch_concurrently({
+            panel: partial(fetch_data, endpoint, category, cache, not_before, store, days=days, exact=exact)
+            for panel, endpoint in DASHBOARD_ENDPOINTS.items()
+        })
+
+@st.cache_resource
+def get_cache_warmer() -> CacheWarmer:
+    """카테고리별 패널 데이터를 백그라운드에서 미리 계산해 두는 워머 (프로세스당 하나)
+
+    시작할 때 모든 카테고리를 한 번 계산하고, 이후에는 최근에 조회된 키만 만료 전에 갱신한다.
+    """
+    load = partial(load_data, store=get_analytics_store())
+    return CacheWarmer(get_data_cache(), load, list(DASHBOARD_ENDPOINTS.values()), list(CATEGORIES)).start()
 
 # 차트 생성 함수들
+@timed('chart:funnel')
+@memoized_figure('funnel', get_figure_cache)
 def create_funnel_chart(funnel_data: List[Dict[str, Any]]) -> go.Figure:
     """퍼널 차트 생성"""
     stages = [stage['stage_name'] for stage in funnel_data]
@@ -313,23 +323,31 @@ def create_funnel_chart(funnel_data: List[Dict[str, Any]]) -> go.Figure:
     
     return fig
 
-def create_kpi_trend_chart(trend_data: List[Dict[str, Any]]) -> go.Figure:
-    """KPI 트렌드 차트 생성"""
-    dates = [item['date'] for item in trend_data]
-    values = [item['value'] for item in trend_data]
+@timed('chart:kpi_trend')
+@memoized_figure('kpi_trend', get_figure_cache)
+def create_kpi_trend_chart(trend_data: List[Dict[str, Any]], budget: int = TREND_POINT_BUDGET) -> go.Figure:
+    """KPI 트렌드 차트 생성 - 긴 시계열은 LTTB 로 budget 개까지 줄이고 WebGL 로 그린다"""
+    points = downsample_points(trend_data, budget)
+    dates = [item['date'] for item in points]
+    values = [item['value'] for item in points]
+    long_series = len(points) > WEBGL_THRESHOLD
+    trace = go.Scattergl if long_series else go.Scatter
     
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
+    fig.add_trace(trace(
         x=dates,
         y=values,
-        mode='lines+markers',
+        mode='lines' if long_series else 'lines+markers',
         name='전환율',
-        line=dict(color='#667eea', width=3),
+        line=dict(color='#667eea', width=2 if long_series else 3),
         marker=dict(size=6)
     ))
     
+    title = "KPI 트렌드 분석"
+    if len(points) < len(trend_data):
+        title += f" ({len(trend_data):,}개 중 {len(points):,}개 표시)"
     fig.update_layout(
-        title="KPI 트렌드 분석",
+        title=title,
         xaxis_title="날짜",
         yaxis_title="전환율 (%)",
         height=500,
@@ -338,6 +356,34 @@ def create_kpi_trend_chart(trend_data: List[Dict[str, Any]]) -> go.Figure:
     
     return fig
 
+@timed('chart:kpi_measurement')
+@memoized_figure('kpi_measurement', get_figure_cache)
+def create_kpi_measurement_chart(kpi: Dict[str, Any]) -> go.Figure:
+    """KPI 측정값 트렌드와 목표선 차트 생성"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=[item['date'] for item in kpi['trend']],
+        y=[item['value'] for item in kpi['trend']],
+        mode='lines+markers',
+        name=kpi['name'],
+        line=dict(color='#667eea', width=2)
+    ))
+    if kpi['target_value'] is not None:
+        fig.add_hline(y=kpi['target_value'], line_dash='dash', line_color='#ff7f0e',
+                      annotation_text=f"목표 {kpi['target_value']:g}{kpi['unit']}")
+    
+    fig.update_layout(
+        title=f"{kpi['name']} 트렌드",
+        yaxis_title=kpi['unit'],
+        height=250,
+        showlegend=False,
+        margin=dict(l=40, r=20, t=40, b=30)
+    )
+    
+    return fig
+
+@timed('chart:scenario_comparison')
+@memoized_figure('scenario_comparison', get_figure_cache)
 def create_scenario_comparison_chart(scenario_data: List[Dict[str, Any]]) -> go.Figure:
     """시나리오 비교 차트 생성"""
     scenarios = [item['scenario_name'] for item in scenario_data]
@@ -363,6 +409,175 @@ def create_scenario_comparison_chart(scenario_data: List[Dict[str, Any]]) -> go.
     
     return fig
 
+@timed('chart:path_sankey')
+@memoized_figure('path_sankey', get_figure_cache)
+def create_path_sankey(sankey: Dict[str, Any]) -> go.Figure:
+    """세션 경로 Sankey 다이어그램 생성"""
+    labels = [f"{node['depth'] + 1}. {node['label']}" if node['depth'] is not None else node['label']
+              for node in sankey['nodes']]
+    
+    fig = go.Figure(data=[go.Sankey(
+        arrangement='snap',
+        node=dict(
+            label=labels,
+            pad=15,
+            thickness=18,
+            color=['#ef4444' if node['depth'] is None else '#667eea' for node in sankey['nodes']]
+        ),
+        link=dict(
+            source=[link['source'] for link in sankey['links']],
+            target=[link['target'] for link in sankey['links']],
+            value=[link['value'] for link in sankey['links']],
+            color='rgba(102, 126, 234, 0.25)'
+        )
+    )])
+    
+    fig.update_layout(
+        title="주요 세션 경로",
+        height=550,
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    return fig
+
+@timed('chart:removal_effect')
+@memoized_figure('removal_effect', get_figure_cache)
+def create_removal_effect_chart(states: List[Dict[str, Any]]) -> go.Figure:
+    """상태별 제거 효과 차트 생성"""
+    states = sorted(states, key=lambda state: state['removal_effect'])
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            x=[state['removal_effect'] for state in states],
+            y=[state['state'] for state in states],
+            orientation='h',
+            marker_color='#764ba2',
+            text=[f"{state['removal_effect']}%" for state in states],
+            textposition='auto'
+        )
+    ])
+    
+    fig.update_layout(
+        title="단계 제거 시 전환 감소율",
+        xaxis_title="제거 효과 (%)",
+        height=max(400, 28 * len(states) + 100),
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    return fig
+
+@timed('chart:percentile')
+@memoized_figure('percentile', get_figure_cache)
+def create_percentile_chart(rows: List[Dict[str, Any]]) -> go.Figure:
+    """페이지 분류별 체류 시간 분위수 차트 생성"""
+    categories = [row['page_category'] for row in rows]
+    
+    fig = go.Figure()
+    for name, color in (('p50', '#667eea'), ('p90', '#764ba2'), ('p99', '#f093fb')):
+        fig.add_trace(go.Bar(
+            x=categories,
+            y=[row[name] for row in rows],
+            name=name,
+            marker_color=color
+        ))
+    
+    fig.update_layout(
+        title="페이지 분류별 체류 시간 분위수",
+        xaxis_title="페이지 분류",
+        yaxis_title="체류 시간 (초)",
+        barmode='group',
+        height=450,
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    return fig
+
+@timed('chart:breakdown')
+@memoized_figure('breakdown', get_figure_cache)
+def create_breakdown_chart(breakdown: Dict[str, Any]) -> go.Figure:
+    """차원별 분해 차트 생성"""
+    measure = breakdown['measures'][0]
+    rows = breakdown['rows']
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            x=[str(row['value']) for row in rows],
+            y=[row[measure] for row in rows],
+            marker_color='#667eea',
+            text=[f"{row['share']}%" for row in rows],
+            textposition='auto'
+        )
+    ])
+    
+    fig.update_layout(
+        title=f"{ROLLUP_DIMENSIONS[breakdown['dimension']]}별 {ROLLUP_MEASURES[measure]}",
+        xaxis_title=ROLLUP_DIMENSIONS[breakdown['dimension']],
+        yaxis_title=ROLLUP_MEASURES[measure],
+        height=400,
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    return fig
+    
+@timed('chart:breakdown_trend')
+@memoized_figure('breakdown_trend', get_figure_cache)
+def create_breakdown_trend_chart(breakdown: Dict[str, Any]) -> go.Figure:
+    """분해 대상 측정값의 일별 추이 차트 생성"""
+    measure = breakdown['measures'][0]
+    trend = breakdown['trend']
+    
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=[point['date'] for point in trend],
+            y=[point[measure] for point in trend],
+            mode='lines',
+            line=dict(color='#764ba2', width=2),
+            name=ROLLUP_MEASURES[measure]
+        )
+    ])
+    
+    fig.update_layout(
+        title=f"일별 {ROLLUP_MEASURES[measure]}",
+        xaxis_title="날짜",
+        yaxis_title=ROLLUP_MEASURES[measure],
+        height=400,
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    return fig
+    
+@timed('chart:retention_heatmap')
+@memoized_figure('retention_heatmap', get_figure_cache)
+def create_retention_heatmap(retention: Dict[str, Any]) -> go.Figure:
+    """코호트 재방문율 히트맵 생성"""
+    unit = '주' if retention['granularity'] == 'week' else '일'
+    cohorts = [f"{cohort} ({size:,}명)" for cohort, size in zip(retention['cohorts'], retention['cohort_sizes'])]
+    offsets = [f"{offset}{unit}차" for offset in retention['offsets']]
+    
+    fig = go.Figure(data=go.Heatmap(
+        z=retention['rates'],
+        x=offsets,
+        y=cohorts,
+        colorscale='Blues',
+        zmin=0,
+        zmax=100,
+        text=[[f"{rate}%" if rate is not None else "" for rate in row] for row in retention['rates']],
+        texttemplate="%{text}",
+        hovertemplate="코호트 %{y}<br>%{x}: %{z}%<extra></extra>",
+        colorbar=dict(title="재방문율 (%)")
+    ))
+    
+    fig.update_layout(
+        title="첫 방문 코호트별 재방문율",
+        xaxis_title=f"첫 방문 후 경과 ({unit})",
+        yaxis_title="첫 방문 코호트",
+        yaxis=dict(autorange='reversed'),
+        height=max(400, 40 * len(cohorts) + 150),
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    return fig
+
 # 메트릭 카드 컴포넌트
 def metric_card(title: str, value: str, change: str = None, change_type: str = "positive"):
     """메트릭 카드 컴포넌트"""
@@ -377,46 +592,111 @@ def metric_card(title: str, value: str, change: str = None, change_type: str = "
     </div>
     """, unsafe_allow_html=True)
 
+def render_chart(fig: go.Figure, name: str):
+    """차트 렌더링 (Plotly JSON 직렬화 포함) 을 render 스팬으로 계측"""
+    with span(f"render:{name}"):
+        st.plotly_chart(fig, use_container_width=True)
+
 # 관리자 패널
 def admin_panel():
     """관리자 패널"""
     st.markdown("### 🔧 관리자 패널")
     
-    col1, col2, col3 = st.columns(3)
+    manage_tab, performance_tab = st.tabs(["⚙️ 관리", "⏱️ 성능"])
     
-    with col1:
-        st.subheader("📊 데이터 생성")
-        if st.button("새로운 이벤트 생성", key="admin_generate_event"):
-            st.success("새로운 이벤트가 생성되었습니다!")
-            st.session_state.last_refresh = datetime.now()
+    with manage_tab:
+        col1, col2, col3 = st.columns(3)
     
-    with col2:
-        st.subheader("🔄 데이터 새로고침")
-        if st.button("데이터 새로고침", key="admin_refresh_data"):
-            st.success("데이터가 새로고침되었습니다!")
-            st.session_state.last_refresh = datetime.now()
+        with col1:
+            st.subheader("📊 데이터 생성")
+            if st.button("새로운 이벤트 생성", key="admin_generate_event"):
+                st.success("새로운 이벤트가 생성되었습니다!")
+                refresh_data()
     
-    with col3:
-        st.subheader("⚙️ 시스템 설정")
-        auto_refresh = st.checkbox("자동 새로고침", value=True, key="admin_auto_refresh")
-        if auto_refresh:
-            st.info("5분마다 자동 새로고침")
+        with col2:
+            st.subheader("🔄 데이터 새로고침")
+            if st.button("데이터 새로고침", key="admin_refresh_data"):
+                refresh_data()
+                st.success("데이터가 새로고침되었습니다!")
+            cache_stats = get_data_cache().stats()
+            st.caption(
+                f"캐시 적중 {cache_stats['hits']}회 · 미스 {cache_stats['misses']}회 "
+                f"({cache_stats['hit_rate']}%) · 항목 {cache_stats['size']}개"
+            )
+            figure_stats = get_figure_cache().stats()
+            st.caption(
+                f"차트 캐시 적중 {figure_stats['hits']}회 ({figure_stats['hit_rate']}%) · "
+                f"항목 {figure_stats['size']}개 · {figure_stats['bytes'] / 2 ** 20:.1f}MB · "
+                f"삭제 {figure_stats['evictions']}회"
+            )
+            warmer_stats = get_cache_warmer().stats()
+            if warmer_stats['last_run']:
+                st.caption(
+                    f"사전 계산 {warmer_stats['warmed']}건 · "
+                    f"마지막 실행 {warmer_stats['last_run'].strftime('%H:%M:%S')}"
+                )
+    
+        with col3:
+            st.subheader("⚙️ 시스템 설정")
+            auto_refresh = st.checkbox("자동 새로고침", value=True, key="admin_auto_refresh")
+            if auto_refresh:
+                st.info("5분마다 자동 새로고침")
+            st.session_state.exact_counts = st.checkbox(
+                "정확한 고유 개수 집계 (감사용)",
+                value=st.session_state.exact_counts,
+                key="admin_exact_counts",
+                help="사용자·방문자 수를 HyperLogLog 추정(오차 약 1.6%) 대신 원시 이벤트에서 직접 셉니다. 느립니다."
+            )
+    
+    with performance_tab:
+        performance_panel()
+
+def performance_panel():
+    """핫패스 스팬 지연 요약 - 계측은 켜져 있는 동안에만 쌓인다"""
+    span_recorder.enabled = st.checkbox(
+        "성능 계측 켜기",
+        value=span_recorder.enabled,
+        key="admin_timing_enabled",
+        help="데이터 가져오기·DataFrame 변환·차트 생성·렌더링 구간 시간을 잽니다. 프로세스 전체에 적용됩니다."
+    )
+    spans = span_recorder.snapshot()
+    if not spans:
+        st.info("아직 기록된 스팬이 없습니다. 계측을 켠 뒤 페이지를 이동해 보세요.")
+        return
+    
+    st.dataframe(pd.DataFrame(spans).drop(columns=['histogram']).rename(columns={
+        'span': '스팬', 'count': '누적 호출', 'samples': '최근 표본',
+        'mean_ms': '평균 (ms)', 'p50_ms': 'p50 (ms)', 'p95_ms': 'p95 (ms)', 'max_ms': '최대 (ms)'
+    }), use_container_width=True, hide_index=True)
+    
+    selected = st.selectbox("지연 분포", [row['span'] for row in spans], key="admin_timing_span")
+    histogram = next(row['histogram'] for row in spans if row['span'] == selected)
+    st.bar_chart(pd.Series(histogram, name="samples"))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "Prometheus 형식 내보내기",
+            data=span_recorder.to_prometheus(),
+            file_name="dashboard_spans.prom",
+            mime="text/plain",
+            key="admin_timing_export"
+        )
+    with col2:
+        if st.button("기록 초기화", key="admin_timing_reset"):
+            span_recorder.reset()
+            st.rerun()
+    if TIMING_EXPORT_PATH:
+        st.caption(f"화면을 그릴 때마다 {TIMING_EXPORT_PATH} 로 내보냅니다.")
 
 # 카테고리 선택기
 def category_selector(key_suffix=""):
     """카테고리 선택기"""
-    categories = {
-        'all': '전체',
-        'ecommerce': 'E-commerce',
-        'lead_generation': '잠재고객 확보',
-        'general_website': '일반 웹사이트'
-    }
-    
     selected = st.selectbox(
         "카테고리 선택",
-        options=list(categories.keys()),
-        format_func=lambda x: categories[x],
-        index=list(categories.keys()).index(st.session_state.selected_category),
+        options=list(CATEGORIES.keys()),
+        format_func=lambda x: CATEGORIES[x],
+        index=list(CATEGORIES.keys()).index(st.session_state.selected_category),
         key=f"category_selector{key_suffix}"
     )
     
@@ -441,62 +721,74 @@ def dashboard_page():
     
     # 카테고리 선택
     category_selector("_dashboard")
+    st.session_state.selected_period = st.selectbox(
+        "기간",
+        options=list(PERIODS.keys()),
+        format_func=lambda x: PERIODS[x],
+        index=list(PERIODS.keys()).index(st.session_state.selected_period),
+        key="period_selector_dashboard"
+    )
     
     # 데이터 로딩
     with st.spinner("데이터를 불러오는 중..."):
         # 모든 데이터 병렬로 가져오기
-        overview_data = fetch_data('dashboard/overview', st.session_state.selected_category)
-        funnel_data = fetch_data('dashboard/funnels', st.session_state.selected_category)
-        kpi_trends = fetch_data('dashboard/kpi-trends', st.session_state.selected_category)
-        recent_events = fetch_data('dashboard/recent-events', st.session_state.selected_category)
-        scenario_performance = fetch_data('dashboard/scenario-performance', st.session_state.selected_category)
-        category_metrics = fetch_data('dashboard/category-metrics', st.session_state.selected_category)
-    
-    # 데이터 검증
-    if not all([overview_data['success'], funnel_data['success'], kpi_trends['success'], 
-                recent_events['success'], scenario_performance['success'], category_metrics['success']]):
-        st.error("일부 데이터를 불러오는데 실패했습니다.")
-        return
-    
-    # 개요 메트릭
-    st.subheader("📈 핵심 지표")
-    overview = overview_data['data']
+        panels = fetch_dashboard_data(
+            st.session_state.selected_category,
+            st.session_state.selected_period,
+            st.session_state.exact_counts
+        )
     
-    col1, col2, col3, col4 = st.columns(4)
+    overview_data = panels['overview']
+    funnel_data = panels['funnels']
+    kpi_trends = panels['kpi_trends']
+    recent_events = panels['recent_events']
+    scenario_performance = panels['scenario_performance']
     
-    with col1:
-        metric_card("총 사용자", f"{overview['total_users']:,}", "+12.5%")
-    with col2:
-        metric_card("총 세션", f"{overview['total_sessions']:,}", "+8.3%")
-    with col3:
-        metric_card("총 전환", f"{overview['total_conversions']:,}", "+15.2%")
-    with col4:
-        metric_card("평균 전환율", f"{overview['average_conversion_rate']}%", "+2.1%")
-    
-    # 카테고리별 추가 메트릭
-    if st.session_state.selected_category == 'ecommerce' and 'total_revenue' in overview:
-        st.subheader("💰 E-commerce 추가 지표")
-        col1, col2 = st.columns(2)
-        with col1:
-            metric_card("총 매출", f"₩{overview['total_revenue']:,}", "+18.5%")
-        with col2:
-            metric_card("평균 주문 금액", f"₩{overview['average_order_value']:,}", "+5.2%")
+    # 데이터 검증 - 실패한 패널만 제외하고 나머지는 그대로 표시
+    failed_panels = [panel for panel, result in panels.items() if not result['success']]
+    if failed_panels:
+        st.warning(f"일부 데이터를 불러오는데 실패했습니다: {', '.join(failed_panels)}")
     
-    elif st.session_state.selected_category == 'lead_generation' and 'total_leads' in overview:
-        st.subheader("🎯 리드 생성 추가 지표")
-        col1, col2 = st.columns(2)
-        with col1:
-            metric_card("총 리드", f"{overview['total_leads']:,}", "+22.1%")
-        with col2:
-            metric_card("리드 전환율", f"{overview['lead_conversion_rate']}%", "+3.8%")
-    
-    elif st.session_state.selected_category == 'general_website' and 'total_page_views' in overview:
-        st.subheader("🌐 웹사이트 추가 지표")
-        col1, col2 = st.columns(2)
+    # 개요 메트릭
+    if overview_data['success']:
+        st.subheader("📈 핵심 지표")
+        overview = overview_data['data']
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
         with col1:
-            metric_card("총 페이지뷰", f"{overview['total_page_views']:,}", "+12.3%")
+            metric_card("총 사용자", f"{overview['total_users']:,}", "+12.5%")
         with col2:
-            metric_card("순 방문자", f"{overview.get('unique_visitors', 0):,}", "+8.7%")
+            metric_card("총 세션", f"{overview['total_sessions']:,}", "+8.3%")
+        with col3:
+            metric_card("총 전환", f"{overview['total_conversions']:,}", "+15.2%")
+        with col4:
+            metric_card("평균 전환율", f"{overview['average_conversion_rate']}%", "+2.1%")
+        
+        # 카테고리별 추가 메트릭
+        if st.session_state.selected_category == 'ecommerce' and 'total_revenue' in overview:
+            st.subheader("💰 E-commerce 추가 지표")
+            col1, col2 = st.columns(2)
+            with col1:
+                metric_card("총 매출", f"₩{overview['total_revenue']:,}", "+18.5%")
+            with col2:
+                metric_card("평균 주문 금액", f"₩{overview['average_order_value']:,}", "+5.2%")
+        
+        elif st.session_state.selected_category == 'lead_generation' and 'total_leads' in overview:
+            st.subheader("🎯 리드 생성 추가 지표")
+            col1, col2 = st.columns(2)
+            with col1:
+                metric_card("총 리드", f"{overview['total_leads']:,}", "+22.1%")
+            with col2:
+                metric_card("리드 전환율", f"{overview['lead_conversion_rate']}%", "+3.8%")
+        
+        elif st.session_state.selected_category == 'general_website' and 'total_page_views' in overview:
+            st.subheader("🌐 웹사이트 추가 지표")
+            col1, col2 = st.columns(2)
+            with col1:
+                metric_card("총 페이지뷰", f"{overview['total_page_views']:,}", "+12.3%")
+            with col2:
+                metric_card("순 방문자", f"{overview.get('unique_visitors', 0):,}", "+8.7%")
     
     # 차트 섹션
     st.subheader("📊 분석 차트")
@@ -504,29 +796,140 @@ def dashboard_page():
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(create_funnel_chart(funnel_data['data']), use_container_width=True)
+        if funnel_data['success']:
+            render_chart(create_funnel_chart(funnel_data['data']), 'funnel')
+        else:
+            st.error(f"퍼널 데이터를 불러오지 못했습니다: {funnel_data.get('error')}")
     
     with col2:
-        st.plotly_chart(create_kpi_trend_chart(kpi_trends['data']), use_container_width=True)
+        if kpi_trends['success']:
+            render_chart(create_kpi_trend_chart(kpi_trends['data']), 'kpi_trend')
+        else:
+            st.error(f"KPI 트렌드를 불러오지 못했습니다: {kpi_trends.get('error')}")
     
     # 시나리오 비교 및 최근 이벤트
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(create_scenario_comparison_chart(scenario_performance['data']), use_container_width=True)
+        if scenario_performance['success']:
+            render_chart(create_scenario_comparison_chart(scenario_performance['data']), 'scenario_comparison')
+        else:
+            st.error(f"시나리오 성과를 불러오지 못했습니다: {scenario_performance.get('error')}")
     
     with col2:
         st.subheader("📋 최근 사용자 이벤트")
-        events_df = pd.DataFrame(recent_events['data'])
-        if not events_df.empty:
-            events_df['timestamp'] = pd.to_datetime(events_df['timestamp']).dt.strftime('%Y-%m-%d %H:%M')
-            st.dataframe(
-                events_df[['user_id', 'event_type', 'timestamp']].head(10),
-                use_container_width=True,
-                hide_index=True
-            )
+        if not recent_events['success']:
+            st.error(f"최근 이벤트를 불러오지 못했습니다: {recent_events.get('error')}")
         else:
-            st.info("최근 이벤트가 없습니다.")
+            with span('frame:recent_events'):
+                events_df = pd.DataFrame(recent_events['data'])
+                if not events_df.empty:
+                    events_df['timestamp'] = pd.to_datetime(events_df['timestamp']).dt.strftime('%Y-%m-%d %H:%M')
+            if not events_df.empty:
+                st.dataframe(
+                    events_df[['user_id', 'event_type', 'timestamp']].head(10),
+                    use_container_width=True,
+                    hide_index=True
+                )
+            else:
+                st.info("최근 이벤트가 없습니다.")
+    
+    drilldown_section()
+
+def drilldown_section():
+    """롤업 큐브 기반 드릴다운 - 팩트를 차원별로 나누고 다른 차원 값으로 거르기"""
+    st.subheader("🔎 드릴다운")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        fact = st.selectbox(
+            "대상",
+            options=list(ROLLUP_FACTS.keys()),
+            format_func=lambda x: ROLLUP_FACTS[x],
+            key="drilldown_fact"
+        )
+    dimensions = [name for name in ROLLUP_DIMENSIONS
+                  if name not in ('page_category', 'conversion_type')
+                  or name == {'page_views': 'page_category', 'conversions': 'conversion_type'}.get(fact)]
+    with col2:
+        dimension = st.selectbox(
+            "분해 기준",
+            options=dimensions,
+            format_func=lambda x: ROLLUP_DIMENSIONS[x],
+            key=f"drilldown_dimension_{fact}"
+        )
+    with col3:
+        filter_dimension = st.selectbox(
+            "필터 기준",
+            options=['none'] + [name for name in dimensions if name != dimension],
+            format_func=lambda x: '없음' if x == 'none' else ROLLUP_DIMENSIONS[x],
+            key=f"drilldown_filter_dimension_{fact}_{dimension}"
+        )
+    
+    breakdown = fetch_data('dashboard/breakdown', st.session_state.selected_category, fact=fact, dimension=dimension,
+                           days=st.session_state.selected_period)
+    if not breakdown['success']:
+        st.error(f"드릴다운 데이터를 불러오지 못했습니다: {breakdown.get('error')}")
+        return
+    
+    if filter_dimension != 'none':
+        filter_values = st.multiselect(
+            f"{ROLLUP_DIMENSIONS[filter_dimension]} 값",
+            options=breakdown['data']['dimensions'][filter_dimension],
+            key=f"drilldown_filter_values_{fact}_{filter_dimension}"
+        )
+        if filter_values:
+            breakdown = fetch_data('dashboard/breakdown', st.session_state.selected_category, fact=fact,
+                                   dimension=dimension, days=st.session_state.selected_period,
+                                   filter_dimension=filter_dimension, filter_values=tuple(filter_values))
+            if not breakdown['success']:
+                st.error(f"드릴다운 데이터를 불러오지 못했습니다: {breakdown.get('error')}")
+                return
+    
+    data = breakdown['data']
+    if not data['rows']:
+        st.info("조건에 맞는 데이터가 없습니다.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        render_chart(create_breakdown_chart(data), 'breakdown')
+    with col2:
+        render_chart(create_breakdown_trend_chart(data), 'breakdown_trend')
+    st.dataframe(pd.DataFrame(data['rows']).rename(columns={
+        'value': ROLLUP_DIMENSIONS[dimension], 'share': '비중 (%)', **ROLLUP_MEASURES
+    }), use_container_width=True, hide_index=True)
+
+def kpi_trend_zoom(daily: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """확대 구간 슬라이더 - 전체 구간이면 일별 값을, 좁힌 구간이면 더 잘은 해상도로 다시 가져온 값을 반환"""
+    if len(daily) < 2:
+        return daily
+    first = datetime.strptime(daily[0]['date'], '%Y-%m-%d')
+    last = datetime.strptime(daily[-1]['date'], '%Y-%m-%d') + timedelta(days=1)
+    start, end = st.slider(
+        "확대 구간",
+        min_value=first,
+        max_value=last,
+        value=(first, last),
+        step=timedelta(hours=1),
+        format="MM/DD HH:mm",
+        key="kpi_trend_zoom"
+    )
+    if (start, end) == (first, last) or end <= start:
+        return daily
+    
+    span_seconds = (end - start).total_seconds()
+    resolution = next(
+        (name for name, (seconds, _) in reversed(TREND_RESOLUTIONS.items()) if span_seconds / seconds <= ZOOM_MAX_BUCKETS),
+        'day'
+    )
+    zoomed = fetch_data('dashboard/kpi-trends', st.session_state.selected_category, resolution=resolution,
+                        start=pd.Timestamp(start).timestamp(), end=pd.Timestamp(end).timestamp())
+    if not zoomed['success']:
+        st.error(f"확대 구간을 불러오지 못했습니다: {zoomed.get('error')}")
+        return daily
+    st.caption(f"{TREND_RESOLUTION_LABELS[resolution]} 단위 · {len(zoomed['data']):,}개 구간")
+    return zoomed['data']
 
 # KPI 분석 페이지
 def kpi_analytics_page():
@@ -537,45 +940,234 @@ def kpi_analytics_page():
     kpi_data = fetch_data('dashboard/kpi-trends', st.session_state.selected_category)
     
     if kpi_data['success']:
-        st.plotly_chart(create_kpi_trend_chart(kpi_data['data']), use_container_width=True)
+        render_chart(create_kpi_trend_chart(kpi_trend_zoom(kpi_data['data'])), 'kpi_trend')
         
         # KPI 상세 분석
         st.subheader("📊 KPI 상세 분석")
         df = pd.DataFrame(kpi_data['data'])
         df['date'] = pd.to_datetime(df['date'])
         
-        col1, col2, col3 = st.columns(3)
+        retention = fetch_data('retention/cohorts', st.session_state.selected_category)
+        
+        col1, col2, col3, col4 = st.columns(4)
         with col1:
             st.metric("평균 전환율", f"{df['value'].mean():.1f}%")
         with col2:
             st.metric("최고 전환율", f"{df['value'].max():.1f}%")
         with col3:
             st.metric("최저 전환율", f"{df['value'].min():.1f}%")
+        with col4:
+            if retention['success']:
+                st.metric("재방문율", f"{retention['data']['return_rate']:.1f}%",
+                          help="두 주 이상 방문한 사용자 비율 - 자세한 코호트는 재방문 분석 페이지에서 볼 수 있습니다.")
     else:
         st.error("KPI 데이터를 불러오는데 실패했습니다.")
+    
+    # kpi_definitions 계산식으로 매일 채우는 kpi_measurements
+    st.subheader("🎯 KPI 목표 대비")
+    measurements = fetch_data('kpi/measurements', st.session_state.selected_category)
+    
+    if measurements['success'] and measurements['data']:
+        kpis = measurements['data']
+        kpi_category = st.selectbox(
+            "KPI 분류",
+            options=['all'] + sorted({kpi['category'] for kpi in kpis}),
+            format_func=lambda x: KPI_CATEGORIES.get(x, x),
+            key="kpi_measurement_category"
+        )
+        for kpi in kpis:
+            if kpi_category != 'all' and kpi['category'] != kpi_category:
+                continue
+            with st.expander(f"📊 {kpi['name']} - {KPI_CATEGORIES.get(kpi['category'], kpi['category'])}"):
+                col1, col2 = st.columns([1, 2])
+                with col1:
+                    delta = kpi['current_value'] - kpi['target_value'] if kpi['target_value'] is not None else None
+                    st.metric(
+                        label=f"{kpi['name']} ({kpi['trend'][-1]['date']})",
+                        value=f"{kpi['current_value']:,.1f}{kpi['unit']}",
+                        delta=f"{delta:+,.1f}{kpi['unit']}" if delta is not None else None
+                    )
+                    st.write(f"**설명:** {kpi['description']}")
+                    st.caption(f"계산식: {kpi['formula']}")
+                with col2:
+                    render_chart(create_kpi_measurement_chart(kpi), 'kpi_measurement')
+    elif measurements['success']:
+        st.info("아직 측정된 KPI 가 없습니다.")
+    else:
+        st.error(f"KPI 측정값을 불러오지 못했습니다: {measurements.get('error')}")
+    
+    # 체류·완료 시간 분포 - 평균 대신 분위수로 긴 꼬리를 드러낸다
+    st.subheader("⏱️ 체류·완료 시간 분포")
+    period = st.selectbox(
+        "기간",
+        options=list(PERIODS.keys()),
+        format_func=lambda x: PERIODS[x],
+        key="kpi_percentile_period"
+    )
+    percentiles = fetch_data('kpi/percentiles', st.session_state.selected_category,
+                             days=period, exact=st.session_state.exact_counts)
+    
+    if percentiles['success']:
+        data = percentiles['data']
+        cols = st.columns(len(data['metrics']))
+        for col, metric in zip(cols, data['metrics']):
+            with col:
+                p50 = f"{metric['p50']:.1f}{metric['unit']}" if metric['p50'] is not None else "-"
+                st.metric(f"{metric['label']} (중앙값)", p50,
+                          help=f"p90 {metric['p90']}{metric['unit']} · p99 {metric['p99']}{metric['unit']} · "
+                               f"평균 {metric['mean']}{metric['unit']}")
+        st.dataframe(pd.DataFrame(data['metrics']).drop(columns=['metric']).rename(columns={
+            'label': '지표', 'unit': '단위', 'count': '건수', 'mean': '평균'
+        }), use_container_width=True, hide_index=True)
+        if data['time_on_page_by_page_category']:
+            render_chart(create_percentile_chart(data['time_on_page_by_page_category']), 'percentile')
+    else:
+        st.error("분포 데이터를 불러오는데 실패했습니다.")
+
+# KPI 분류 이름 (kpi_definitions.category)
+KPI_CATEGORIES = {
+    'all': '전체',
+    'conversion': '전환',
+    'engagement': '참여도',
+    'retention': '유지',
+    'revenue': '수익',
+    'satisfaction': '만족도'
+}
+
+# 고객 여정 맵 페이지 - 전환 기간 (시간)
+CONVERSION_WINDOWS = {1: '1시간', 24: '1일', 24 * 7: '7일', 24 * 30: '30일'}
+# 경로 분석 기준
+PATH_SOURCES = {'pages': '페이지 순서', 'actions': '액션 순서'}
 
-# 고객 여정 맵 페이지
 def customer_journey_page():
     """고객 여정 맵 페이지"""
     st.markdown('<h1 class="main-header">🗺️ 고객 여정 맵</h1>', unsafe_allow_html=True)
     
-    # 퍼널 데이터 가져오기
-    funnel_data = fetch_data('dashboard/funnels', st.session_state.selected_category)
+    window_hours = st.selectbox(
+        "전환 기간",
+        options=list(CONVERSION_WINDOWS.keys()),
+        format_func=lambda x: CONVERSION_WINDOWS[x],
+        index=2,
+        key="journey_conversion_window",
+        help="첫 단계 완료 후 이 기간 안에 단계를 순서대로 완료한 사용자만 다음 단계 도달로 셉니다."
+    )
+    
+    # 순서·기간 제한 퍼널 데이터 가져오기
+    funnel_data = fetch_data('journey/ordered-funnel', st.session_state.selected_category, window_hours=window_hours)
     
     if funnel_data['success']:
-        st.plotly_chart(create_funnel_chart(funnel_data['data']), use_container_width=True)
+        render_chart(create_funnel_chart(funnel_data['data']), 'funnel')
         
         # 여정 단계별 상세 분석
         st.subheader("📋 여정 단계별 분석")
-        df = pd.DataFrame(funnel_data['data'])
-        
-        # 전환율 계산
-        df['conversion_rate'] = (df['users_reached'] / df['users_reached'].iloc[0] * 100).round(1)
-        df['drop_off_rate'] = (100 - df['conversion_rate']).round(1)
+        df = pd.DataFrame(funnel_data['data']).rename(columns={
+            'stage_name': '단계',
+            'users_reached': '도달 사용자',
+            'step_conversion_rate': '이전 단계 대비 전환율 (%)',
+            'overall_conversion_rate': '첫 단계 대비 전환율 (%)',
+            'drop_off_rate': '이탈률 (%)',
+            'median_minutes_from_previous': '이전 단계부터 소요 시간 중앙값 (분)'
+        })
         
         st.dataframe(df, use_container_width=True, hide_index=True)
     else:
         st.error("퍼널 데이터를 불러오는데 실패했습니다.")
+    
+    # 세션 경로 분석
+    st.subheader("🔀 주요 세션 경로")
+    col1, col2 = st.columns(2)
+    with col1:
+        source = st.selectbox(
+            "경로 기준",
+            options=list(PATH_SOURCES.keys()),
+            format_func=lambda x: PATH_SOURCES[x],
+            key="journey_path_source"
+        )
+    with col2:
+        top_k = st.slider("표시할 경로 수", min_value=5, max_value=30, value=10, step=5, key="journey_path_top_k")
+    
+    paths = fetch_data('journey/paths', st.session_state.selected_category, source=source, top_k=top_k)
+    
+    if paths['success'] and paths['data']['paths']:
+        render_chart(create_path_sankey(paths['data']['sankey']), 'path_sankey')
+        st.dataframe(pd.DataFrame([{
+            '경로': ' → '.join(path['path']),
+            '세션 수': path['sessions'],
+            '비율 (%)': path['share']
+        } for path in paths['data']['paths']]), use_container_width=True, hide_index=True)
+        st.caption(f"세션 {paths['data']['sessions']:,}개의 처음 {MAX_PATH_DEPTH}단계 경로 기준 (연속된 같은 페이지는 한 번으로 셈)")
+    elif paths['success']:
+        st.info("경로 데이터가 없습니다.")
+    else:
+        st.error("경로 데이터를 불러오는데 실패했습니다.")
+    
+    # 마르코프 이탈 분석
+    st.subheader("📉 이탈 분석")
+    include_pages = st.checkbox("페이지 분류를 상태에 포함", value=True, key="journey_dropout_include_pages",
+                                help="여정 단계 사이의 페이지 뷰(page_category)도 전이 상태로 셉니다.")
+    dropout = fetch_data('journey/dropout', st.session_state.selected_category, include_pages=include_pages)
+    
+    if dropout['success'] and dropout['data']['states']:
+        data = dropout['data']
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("시작 시점 전환 확률", f"{data['conversion_probability']:.1f}%")
+        with col2:
+            steps = data['expected_steps_to_convert']
+            st.metric("전환까지 기대 단계 수", f"{steps:.1f}" if steps is not None else "-")
+        with col3:
+            st.metric("전이 수", f"{data['transitions']:,}")
+        
+        render_chart(create_removal_effect_chart(data['states']), 'removal_effect')
+        st.dataframe(pd.DataFrame(data['states']).rename(columns={
+            'state': '상태',
+            'visits': '방문 수',
+            'exit_rate': '이탈률 (%)',
+            'conversion_probability': '전환 확률 (%)',
+            'removal_effect': '제거 효과 (%)',
+            'expected_steps_to_convert': '전환까지 기대 단계 수'
+        }), use_container_width=True, hide_index=True)
+    elif dropout['success']:
+        st.info("이탈 분석 데이터가 없습니다.")
+    else:
+        st.error("이탈 분석 데이터를 불러오는데 실패했습니다.")
+
+# 재방문 분석 페이지 - 기간 단위별 표시할 경과 기간 수
+RETENTION_GRANULARITIES = {'week': ('주 단위', 8), 'day': ('일 단위', 14)}
+
+def retention_page():
+    """재방문 분석 페이지"""
+    st.markdown('<h1 class="main-header">🔁 재방문 분석</h1>', unsafe_allow_html=True)
+    
+    granularity = st.selectbox(
+        "기간 단위",
+        options=list(RETENTION_GRANULARITIES.keys()),
+        format_func=lambda x: RETENTION_GRANULARITIES[x][0],
+        key="retention_granularity"
+    )
+    
+    retention = fetch_data('retention/cohorts', st.session_state.selected_category,
+                           granularity=granularity, periods=RETENTION_GRANULARITIES[granularity][1])
+    
+    if retention['success']:
+        data = retention['data']
+        unit = '주' if granularity == 'week' else '일'
+        first_return = [row[1] for row in data['rates'] if len(row) > 1 and row[1] is not None]
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("재방문율", f"{data['return_rate']:.1f}%")
+        with col2:
+            st.metric(f"1{unit}차 평균 재방문율", f"{sum(first_return) / len(first_return):.1f}%" if first_return else "-")
+        with col3:
+            st.metric("코호트 사용자", f"{sum(data['cohort_sizes']):,}명")
+        
+        if data['cohorts']:
+            render_chart(create_retention_heatmap(data), 'retention_heatmap')
+        else:
+            st.info("세션 데이터가 없습니다.")
+    else:
+        st.error("재방문 데이터를 불러오는데 실패했습니다.")
 
 # 설정 페이지
 def settings_page():
@@ -615,35 +1207,29 @@ def sidebar():
     # 시스템 상태 표시
     if IS_STREAMLIT_CLOUD:
         st.sidebar.success("☁️ Streamlit Cloud 모드")
-        st.sidebar.info("🔄 모의 데이터 사용 중")
+        st.sidebar.info("🗄️ 내장 분석 저장소 사용 중")
     else:
         st.sidebar.success("🖥️ 로컬 환경")
-        st.sidebar.info("🔗 실제 API 연결")
+        st.sidebar.info("🗄️ 내장 분석 저장소 사용 중")
     
     st.sidebar.markdown("---")
     
     # 네비게이션
     page = st.sidebar.selectbox(
         "페이지 선택",
-        ["📊 대시보드", "📈 KPI 분석", "🗺️ 고객 여정 맵", "⚙️ 설정"]
+        ["📊 대시보드", "📈 KPI 분석", "🗺️ 고객 여정 맵", "🔁 재방문 분석", "⚙️ 설정"],
+        key="sidebar_page_selector"
     )
     
     st.sidebar.markdown("---")
     
     # 카테고리 선택
     st.sidebar.subheader("📂 카테고리")
-    categories = {
-        'all': '전체',
-        'ecommerce': 'E-commerce',
-        'lead_generation': '잠재고객 확보',
-        'general_website': '일반 웹사이트'
-    }
-    
     selected_category = st.sidebar.selectbox(
         "카테고리 선택",
-        options=list(categories.keys()),
-        format_func=lambda x: categories[x],
-        index=list(categories.keys()).index(st.session_state.selected_category),
+        options=list(CATEGORIES.keys()),
+        format_func=lambda x: CATEGORIES[x],
+        index=list(CATEGORIES.keys()).index(st.session_state.selected_category),
         key="sidebar_category_selector"
     )
     
@@ -659,7 +1245,7 @@ def sidebar():
     st.sidebar.text(f"{st.session_state.last_refresh.strftime('%H:%M:%S')}")
     
     if st.sidebar.button("🔄 새로고침"):
-        st.session_state.last_refresh = datetime.now()
+        refresh_data()
         st.rerun()
     
     return page
@@ -671,14 +1257,24 @@ def main():
     page = sidebar()
     
     # 페이지 라우팅
-    if page == "📊 대시보드":
-        dashboard_page()
-    elif page == "📈 KPI 분석":
-        kpi_analytics_page()
-    elif page == "🗺️ 고객 여정 맵":
-        customer_journey_page()
-    elif page == "⚙️ 설정":
-        settings_page()
+    with span(f"page:{page}"):
+        if page == "📊 대시보드":
+            dashboard_page()
+        elif page == "📈 KPI 분석":
+            kpi_analytics_page()
+        elif page == "🗺️ 고객 여정 맵":
+            customer_journey_page()
+        elif page == "🔁 재방문 분석":
+            retention_page()
+        elif page == "⚙️ 설정":
+            settings_page()
+    
+    # 첫 화면을 그린 뒤 모든 카테고리 데이터를 백그라운드에서 한 번 미리 계산하고,
+    # 이후에는 최근에 조회된 키만 만료 전에 다시 계산
+    get_cache_warmer()
+    
+    if span_recorder.enabled and TIMING_EXPORT_PATH:
+        span_recorder.write_prometheus(TIMING_EXPORT_PATH)
 
 if __name__ == "__main__":
     main()
@@ -11,5 +11,6 @@ router.get('/kpi-trends', asyncHandler(DashboardController.getKPITrends));
 router.get('/recent-events', asyncHandler(DashboardController.getRecentEvents));
 router.get('/scenario-performance', asyncHandler(DashboardController.getScenarioPerformance));
 router.get('/category-metrics', asyncHandler(DashboardController.getCategoryMetrics));
+router.get('/bundle', asyncHandler(DashboardController.getBundle));
 
 export default router; 
\ No newline at end of file
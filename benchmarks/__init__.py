@@ -0,0 +1 @@
+"""대시보드 페이지·차트 성능 벤치마크"""
@@ -0,0 +1,119 @@
+"""벤치마크용 대역 백엔드
+
+streamlit/app.py 가 호출하는 Node 백엔드의 대시보드 API(/api/dashboard/*, /health)와 분석 API(ANALYTICS_QUERIES)를
+내장 분석 저장소(AnalyticsStore) 집계로 흉내 내는 로컬 HTTP 서버다. 응답 형태는 백엔드와 같은
+{success, data, message, timestamp} 봉투이고 번들 API 도 지원한다.
+"""
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from analytics.store import AnalyticsStore
+
+# 대시보드 API 경로 → 저장소 집계 메서드
+DASHBOARD_QUERIES = {
+    'overview': AnalyticsStore.overview,
+    'funnels': AnalyticsStore.funnels,
+    'kpi-trends': AnalyticsStore.kpi_trends,
+    'recent-events': AnalyticsStore.recent_events,
+    'scenario-performance': AnalyticsStore.scenario_performance,
+    'category-metrics': AnalyticsStore.category_metrics,
+}
+# 대시보드 밖의 분석 API 경로 → 저장소 집계 메서드 (app.py 와 같은 계산)
+ANALYTICS_QUERIES = {
+    'kpi/measurements': AnalyticsStore.kpi_summary,
+    'journey/paths': AnalyticsStore.paths,
+}
+# 번들 패널 이름 → 대시보드 API 경로
+BUNDLE_PANELS = {panel.replace('-', '_'): panel for panel in DASHBOARD_QUERIES}
+
+
+def _options(params: Dict[str, str]) -> Dict[str, Any]:
+    """category 외 쿼리 파라미터를 집계 메서드 인자로 - 정수 문자열은 정수로"""
+    return {name: int(value) if value.isdigit() else value for name, value in params.items() if name != 'category'}
+
+
+def _envelope(data: Any, message: str = '') -> Dict[str, Any]:
+    return {'success': True, 'data': data, 'message': message, 'timestamp': datetime.now().isoformat()}
+
+
+class StandInBackend:
+    """저장소를 대시보드 API 로 제공하는 스레드 HTTP 서버 - port 0 이면 빈 포트를 쓴다"""
+
+    def __init__(self, store: AnalyticsStore, host: str = '127.0.0.1', port: int = 0):
+        self.store = store
+        self.requests = 0
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = backend.handle(self.path)
+                payload = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def handle(self, path: str) -> Tuple[int, Dict[str, Any]]:
+        """요청 경로를 (HTTP 상태, 응답 본문) 으로 처리"""
+        self.requests += 1
+        url = urlparse(path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        category = params.get('category', 'all')
+        if url.path in ('/health', '/api/health'):
+            return 200, {'status': 'healthy', 'timestamp': datetime.now().isoformat()}
+        if url.path[len('/api/'):] in ANALYTICS_QUERIES:
+            try:
+                query = ANALYTICS_QUERIES[url.path[len('/api/'):]]
+                return 200, _envelope(query(self.store, category, **_options(params)))
+            except (TypeError, ValueError) as error:
+                return 400, {'success': False, 'error': str(error)}
+        if not url.path.startswith('/api/dashboard/'):
+            return 404, {'success': False, 'error': 'Not found'}
+        endpoint = url.path[len('/api/dashboard/'):]
+        try:
+            if endpoint == 'bundle':
+                panels = [panel.strip() for panel in params.get('panels', '').split(',') if panel.strip()]
+                panel_data, panel_errors = {}, {}
+                for panel in panels or list(BUNDLE_PANELS):
+                    if panel not in BUNDLE_PANELS:
+                        panel_errors[panel] = f"알 수 없는 패널: {panel}"
+                        continue
+                    try:
+                        panel_data[panel] = DASHBOARD_QUERIES[BUNDLE_PANELS[panel]](self.store, category)
+                    except ValueError as error:
+                        panel_errors[panel] = str(error)
+                return 200, _envelope({'panels': panel_data, 'errors': panel_errors})
+            if endpoint not in DASHBOARD_QUERIES:
+                return 404, {'success': False, 'error': 'Not found'}
+            return 200, _envelope(DASHBOARD_QUERIES[endpoint](self.store, category))
+        except ValueError as error:
+            return 400, {'success': False, 'error': str(error)}
+
+    def start(self) -> 'StandInBackend':
+        """백그라운드 스레드에서 서버 시작"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name='stand-in-backend', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """서버 중지"""
+        self._server.shutdown()
+        self._server.server_close()
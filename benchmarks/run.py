@@ -0,0 +1,327 @@
+"""페이지 재실행·차트 생성 벤치마크
+
+app.py 와 streamlit/app.py 를 Streamlit 앱 테스트 하네스(AppTest)로 화면 없이 실행해 페이지별 재실행 시간을,
+차트 생성 함수는 입력 크기별 생성 시간을 잰다. 데이터 크기(이벤트 수)마다 별도 프로세스에서 실행하므로
+캐시·백그라운드 스레드·메모리가 크기 사이에 섞이지 않는다.
+
+    python -m benchmarks.run --sizes 10,1000,100000 --repeats 20
+    python -m benchmarks.run --compare benchmarks/results/<기준>.json benchmarks/results/<비교>.json
+
+- 페이지: 첫 실행(startup, 저장소 적재 포함), 페이지별 첫 실행(cold), 이후 재실행 p50/p95, 재실행 1회의 최대 메모리
+  (재실행은 같은 프로세스에서 새 세션으로 스크립트를 다시 실행한다 - cache_resource 와 공유 캐시는 유지된다)
+- 차트: 입력 항목 수가 데이터 크기와 같은 페이로드로 생성 p50/p95, 1회의 최대 메모리
+- app.py 는 ANALYTICS_SYNTHETIC_USERS 로 합성 데이터를, streamlit/app.py 는 같은 합성 데이터를 담은 대역 백엔드를 쓴다.
+- 최대 메모리는 tracemalloc 으로 잰 파이썬 할당 최댓값이고, max_rss_mb 는 크기별 프로세스 전체의 최대 RSS 다.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_REPEATS = 20
+# 이 크기 이상의 차트 입력은 생성 한 번이 오래 걸리므로 반복 수를 줄인다
+LARGE_SIZE = 1_000_000
+LARGE_SIZE_REPEATS = 3
+# 기준 대비 이 배율을 넘게 느려지면 회귀로 본다
+REGRESSION_RATIO = 1.2
+
+# 앱별 페이지 함수 → 사이드바 메뉴 이름
+PAGES = {
+    'app.py': {
+        'dashboard_page': '📊 대시보드',
+        'kpi_analytics_page': '📈 KPI 분석',
+        'customer_journey_page': '🗺️ 고객 여정 맵',
+    },
+    'streamlit/app.py': {
+        'dashboard_page': '대시보드',
+        'kpi_analytics_page': 'KPI 분석',
+        'customer_journey_page': '고객 여정 맵',
+    },
+}
+CHARTS = {
+    'app.py': ('create_funnel_chart', 'create_kpi_trend_chart', 'create_scenario_comparison_chart'),
+    'streamlit/app.py': ('create_funnel_chart', 'create_kpi_trend_chart'),
+}
+# 이벤트로 세는 테이블
+EVENT_TABLES = ('page_view_events', 'user_action_events', 'conversion_events', 'journey_stage_completions')
+
+
+def events_per_user(sample_users: int = 2_000) -> float:
+    """합성 데이터의 사용자당 이벤트 수"""
+    from analytics.synthetic import generate_dataset
+    tables = generate_dataset(sample_users, seed=0)
+    return sum(len(tables[table]) for table in EVENT_TABLES) / sample_users
+
+
+def users_for(events: int, per_user: float) -> int:
+    return max(1, int(round(events / per_user)))
+
+
+def chart_payload(chart: str, size: int) -> List[Dict[str, Any]]:
+    """차트 생성 함수 입력 - 항목 size 개"""
+    rng = np.random.default_rng(size)
+    if chart == 'create_funnel_chart':
+        users = np.sort(rng.integers(1, 100_000, size))[::-1]
+        rates = np.round(np.concatenate(([100.0], users[1:] / users[:-1] * 100)), 1)
+        return [{'stage_name': f"단계 {index + 1}", 'users_reached': int(value), 'conversion_rate': float(rate)}
+                for index, (value, rate) in enumerate(zip(users.tolist(), rates.tolist()))]
+    if chart == 'create_kpi_trend_chart':
+        dates = pd.date_range('2020-01-01', periods=size, freq='min').strftime('%Y-%m-%d %H:%M').tolist()
+        values = np.round(rng.uniform(5, 40, size), 1).tolist()
+        return [{'date': day, 'value': value} for day, value in zip(dates, values)]
+    if chart == 'create_scenario_comparison_chart':
+        totals = rng.integers(100, 100_000, size)
+        converted = (totals * rng.uniform(0.01, 0.5, size)).astype(int)
+        return [{'scenario_name': f"시나리오 {index + 1}", 'conversion_rate': round(done / total * 100, 1),
+                 'total_users': int(total), 'converted_users': int(done)}
+                for index, (total, done) in enumerate(zip(totals.tolist(), converted.tolist()))]
+    raise ValueError(f"알 수 없는 차트: {chart}")
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    return {'p50_ms': round(float(np.percentile(samples, 50)) * 1000, 2),
+            'p95_ms': round(float(np.percentile(samples, 95)) * 1000, 2)}
+
+
+def _timed(call: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    call()
+    return time.perf_counter() - started
+
+
+# 하네스는 0.1초 간격으로 스크립트 종료를 확인하므로 종료 시각을 스크립트 실행 스레드에서 직접 기록한다
+_finished_at: Dict[str, float] = {}
+
+
+def _record_script_finish():
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+    original = LocalScriptRunner._on_script_finished
+    if getattr(original, 'records_finish', False):
+        return
+
+    def on_script_finished(self, *args, **kwargs):
+        _finished_at['time'] = time.perf_counter()
+        return original(self, *args, **kwargs)
+
+    on_script_finished.records_finish = True
+    LocalScriptRunner._on_script_finished = on_script_finished
+
+
+def _script_time(at) -> float:
+    """AppTest 스크립트 실행 1회의 시작부터 종료까지 시간"""
+    _finished_at.pop('time', None)
+    started = time.perf_counter()
+    at.run()
+    return _finished_at.get('time', time.perf_counter()) - started
+
+
+def _peak_memory_mb(call: Callable[[], Any]) -> float:
+    """call 1회 동안의 파이썬 할당 최댓값 (MB)"""
+    tracemalloc.start()
+    try:
+        call()
+        return round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def _load_module(app: str):
+    """앱 스크립트를 모듈로 읽기 - 차트 생성 함수만 쓴다 (Streamlit 런타임 밖이라 경고가 나올 수 있다)"""
+    path = os.path.join(ROOT, app)
+    name = 'bench_' + app.replace('/', '_').replace('.py', '')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _app_errors(at) -> List[str]:
+    return [str(element.value)[:200] for element in list(at.exception) + list(at.error)]
+
+
+def bench_pages(app: str, size: int, repeats: int, timeout: float) -> List[Dict[str, Any]]:
+    """앱 페이지별 재실행 시간과 메모리"""
+    from streamlit.testing.v1 import AppTest
+
+    _record_script_finish()
+    per_user = events_per_user()
+    users = users_for(size, per_user)
+    os.environ.pop('ANALYTICS_DATA_DIR', None)
+    os.environ['ANALYTICS_SYNTHETIC_USERS'] = str(users)
+    backend = None
+    selected = {'page': next(iter(PAGES[app].values()))}
+    if app == 'streamlit/app.py':
+        import streamlit_option_menu
+        from analytics.store import AnalyticsStore
+        from benchmarks.backend import StandInBackend
+        backend = StandInBackend(AnalyticsStore.from_synthetic(users)).start()
+        os.environ['BACKEND_URL'] = backend.url
+        # option_menu 는 사용자 정의 컴포넌트라 하네스에서 고를 수 없으므로 선택한 페이지를 돌려주게 한다
+        streamlit_option_menu.option_menu = lambda *args, **kwargs: selected['page']
+
+    def session(label: str):
+        # 하네스는 format_func 가 있는 selectbox 를 다시 실행하지 못하므로 매번 새 세션으로 스크립트를 실행한다
+        selected['page'] = label
+        at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=timeout)
+        if app == 'app.py':
+            at.session_state['sidebar_page_selector'] = label
+        return at
+
+    rows = []
+    base = {'app': app, 'target': 'page', 'size': size, 'users': users}
+    at = session(selected['page'])
+    startup = _script_time(at)
+    rows.append({**base, 'name': 'startup', 'cold_ms': round(startup * 1000, 2), 'errors': _app_errors(at)})
+    for function, label in PAGES[app].items():
+        try:
+            at = session(label)
+            cold = _script_time(at)
+            samples = []
+            for _ in range(repeats):
+                at = session(label)
+                samples.append(_script_time(at))
+            at = session(label)
+            rows.append({**base, 'name': function, 'cold_ms': round(cold * 1000, 2), **_summary(samples),
+                         'peak_memory_mb': _peak_memory_mb(at.run), 'errors': _app_errors(at)})
+        except Exception as error:
+            # 하네스 자체 오류(시간 초과 등)는 그 페이지만 실패로 남기고 계속한다
+            rows.append({**base, 'name': function, 'errors': [f"{type(error).__name__}: {error}"]})
+    if backend is not None:
+        backend.stop()
+    return rows
+
+
+def bench_charts(app: str, size: int, repeats: int) -> List[Dict[str, Any]]:
+    """차트 생성 함수별 입력 크기에 따른 생성 시간과 메모리"""
+    module = _load_module(app)
+    repeats = repeats if size < LARGE_SIZE else min(repeats, LARGE_SIZE_REPEATS)
+    rows = []
+    for chart in CHARTS[app]:
+        payload = chart_payload(chart, size)
+        build = getattr(module, chart)
+        samples = [_timed(lambda: build(payload)) for _ in range(repeats)]
+        rows.append({'app': app, 'target': 'chart', 'name': chart, 'size': size, **_summary(samples),
+                     'peak_memory_mb': _peak_memory_mb(lambda: build(payload)), 'errors': []})
+    return rows
+
+
+def run_worker(app: str, size: int, repeats: int, timeout: float) -> List[Dict[str, Any]]:
+    """한 앱·한 크기 벤치마크 (별도 프로세스에서 실행)"""
+    rows = bench_pages(app, size, repeats, timeout) + bench_charts(app, size, repeats)
+    max_rss_mb = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return [{**row, 'max_rss_mb': max_rss_mb} for row in rows]
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'local'
+
+
+def run(apps: List[str], sizes: List[int], repeats: int, timeout: float) -> Dict[str, Any]:
+    """앱 × 크기마다 작업 프로세스를 띄워 결과 모으기"""
+    results = []
+    for app in apps:
+        for size in sizes:
+            started = time.perf_counter()
+            command = [sys.executable, '-m', 'benchmarks.run', '--worker', app, '--size', str(size),
+                       '--repeats', str(repeats), '--timeout', str(timeout)]
+            try:
+                process = subprocess.run(command, cwd=ROOT, capture_output=True, text=True,
+                                         timeout=timeout * (len(PAGES[app]) * (repeats + 2) + 1))
+                if process.returncode == 0:
+                    rows = json.loads(process.stdout.strip().splitlines()[-1])
+                else:
+                    rows = [{'app': app, 'size': size, 'target': 'worker', 'name': 'failed',
+                             'errors': [process.stderr.strip()[-2000:]]}]
+            except subprocess.TimeoutExpired:
+                rows = [{'app': app, 'size': size, 'target': 'worker', 'name': 'timeout', 'errors': ['시간 초과']}]
+            results.extend(rows)
+            print(f"{app:18s} {size:>12,} 이벤트 · {time.perf_counter() - started:7.1f}초", file=sys.stderr)
+    return {
+        'commit': _commit(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': repeats,
+        'results': results,
+    }
+
+
+def compare(base_path: str, head_path: str, ratio: float = REGRESSION_RATIO) -> List[Dict[str, Any]]:
+    """두 결과 파일의 같은 (앱, 대상, 이름, 크기) 항목별 p50/p95 배율 - ratio 를 넘으면 회귀"""
+    with open(base_path, encoding='utf-8') as f:
+        base = {(row['app'], row['target'], row['name'], row['size']): row for row in json.load(f)['results']}
+    with open(head_path, encoding='utf-8') as f:
+        head = json.load(f)['results']
+    rows = []
+    for row in head:
+        previous = base.get((row['app'], row['target'], row['name'], row['size']))
+        if previous is None or 'p50_ms' not in row or 'p50_ms' not in previous:
+            continue
+        change = {metric: round(row[metric] / previous[metric], 2) if previous[metric] else None
+                  for metric in ('p50_ms', 'p95_ms')}
+        rows.append({'app': row['app'], 'target': row['target'], 'name': row['name'], 'size': row['size'],
+                     'p50_ratio': change['p50_ms'], 'p95_ratio': change['p95_ms'],
+                     'regression': any(value is not None and value > ratio for value in change.values())})
+    return rows
+
+
+def main():
+    """벤치마크 CLI"""
+    parser = argparse.ArgumentParser(description="페이지 재실행·차트 생성 벤치마크")
+    parser.add_argument('--apps', default=','.join(PAGES), help="쉼표로 구분한 앱 스크립트")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES), help="쉼표로 구분한 이벤트 수")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="재실행 반복 수")
+    parser.add_argument('--timeout', type=float, default=600, help="재실행 1회 제한 시간 (초)")
+    parser.add_argument('--out', help="결과 JSON 경로 (기본 benchmarks/results/<커밋>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'), help="두 결과 파일 비교")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.size, args.repeats, args.timeout), ensure_ascii=False))
+        return
+    if args.compare:
+        rows = compare(*args.compare)
+        for row in rows:
+            flag = ' ← 회귀' if row['regression'] else ''
+            print(f"{row['app']:18s} {row['target']:5s} {row['name']:34s} {row['size']:>12,} "
+                  f"p50 ×{row['p50_ratio']} p95 ×{row['p95_ratio']}{flag}")
+        sys.exit(1 if any(row['regression'] for row in rows) else 0)
+
+    report = run([app.strip() for app in args.apps.split(',')], [int(size) for size in args.sizes.split(',')],
+                 args.repeats, args.timeout)
+    out = args.out or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    for row in report['results']:
+        timing = f"p50 {row['p50_ms']:>10.2f}ms p95 {row['p95_ms']:>10.2f}ms" if 'p50_ms' in row else \
+            f"cold {row.get('cold_ms', 0):>10.2f}ms"
+        errors = f" 오류 {len(row['errors'])}건" if row.get('errors') else ''
+        print(f"{row['app']:18s} {row['target']:6s} {row['name']:34s} {row['size']:>12,} {timing}{errors}")
+    print(f"→ {out}")
+
+
+if __name__ == '__main__':
+    main()
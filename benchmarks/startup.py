@@ -0,0 +1,176 @@
+"""콜드 스타트 벤치마크와 임포트 시간 프로파일
+
+새 작업 프로세스가 첫 화면을 그리기까지의 시간을 잰다. 반복마다 새 인터프리터를 띄우므로
+모듈 임포트와 cache_resource 초기화가 매번 처음부터 다시 일어난다.
+
+    python -m benchmarks.startup --repeats 5
+    python -m benchmarks.startup --compare benchmarks/results/startup-<기준>.json benchmarks/results/startup-<비교>.json
+
+- imports: 앱 스크립트의 모듈 최상위 import 문만 실행한 시간. 서버가 이미 올려 둔 Streamlit 은 미리 임포트해 빼고,
+  -X importtime 으로 잰 최상위 모듈별 누적 시간을 modules 에 함께 남긴다 (함수 안의 지연 임포트는 포함되지 않는다).
+- cold_start: 새 프로세스의 첫 세션 스크립트 실행 시간 (첫 화면) - 앱 모듈 임포트, 프로세스 단위 초기화, 첫 페이지 렌더링 포함
+- warm_start: 같은 프로세스에서 새 세션을 하나 더 열었을 때의 첫 화면 시간 - 프로세스 단위 초기화가 세션 사이에 재사용되는지 본다
+- streamlit/app.py 는 부모 프로세스에 띄운 대역 백엔드(benchmarks/backend.py)에 붙는다.
+
+결과는 run.py 와 같은 형식이라 --compare 로 p50/p95 회귀를 확인한다.
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.run import (PAGES, RESULTS_DIR, ROOT, _app_errors, _commit, _record_script_finish,
+                            _script_time, _summary, compare)
+
+DEFAULT_REPEATS = 5
+DEFAULT_USERS = 1_000
+# 모듈별 누적 임포트 시간을 남길 개수
+TOP_MODULES = 10
+
+_IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+_MARKER = '-- app imports --'
+
+
+def module_imports(app: str) -> str:
+    """앱 스크립트의 모듈 최상위 import 문만 모은 소스"""
+    with open(os.path.join(ROOT, app), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return '\n'.join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def profile_imports(app: str) -> Tuple[float, Dict[str, float]]:
+    """새 인터프리터에서 앱 import 문 실행 - (전체 초, 최상위 모듈별 누적 ms)"""
+    source = f"import streamlit, sys\nsys.stderr.write({_MARKER!r} + '\\n')\n{module_imports(app)}"
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join([ROOT, os.path.join(ROOT, os.path.dirname(app))])}
+    started = time.perf_counter()
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', source], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - started
+    stderr = process.stderr.split(_MARKER, 1)[-1]
+    modules = {}
+    for match in _IMPORT_LINE.finditer(stderr):
+        if not match.group(3):
+            modules[match.group(4)] = int(match.group(2)) / 1000
+    return sum(modules.values()) / 1000 or elapsed, modules
+
+
+def run_worker(app: str, timeout: float) -> Dict[str, Any]:
+    """한 프로세스에서 첫 세션과 두 번째 세션의 첫 화면 시간 (별도 프로세스에서 실행)"""
+    from streamlit.testing.v1 import AppTest
+
+    _record_script_finish()
+    at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=timeout)
+    cold = _script_time(at)
+    errors = _app_errors(at)
+    at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=timeout)
+    warm = _script_time(at)
+    return {'cold_start': cold, 'warm_start': warm, 'errors': errors + _app_errors(at)}
+
+
+def bench_startup(app: str, users: int, repeats: int, timeout: float, env: Dict[str, str]) -> List[Dict[str, Any]]:
+    """앱 하나의 임포트 프로파일과 콜드/웜 스타트 반복 측정"""
+    base = {'app': app, 'target': 'startup', 'size': users}
+    imports, modules = [], {}
+    for _ in range(repeats):
+        total, per_module = profile_imports(app)
+        imports.append(total)
+        for name, ms in per_module.items():
+            modules.setdefault(name, []).append(ms)
+    top = sorted(((name, float(np.median(samples))) for name, samples in modules.items()),
+                 key=lambda item: item[1], reverse=True)[:TOP_MODULES]
+    rows = [{**base, 'name': 'imports', **_summary(imports),
+             'modules': {name: round(ms, 2) for name, ms in top}, 'errors': []}]
+
+    samples: Dict[str, List[float]] = {'cold_start': [], 'warm_start': []}
+    errors: List[str] = []
+    for _ in range(repeats):
+        command = [sys.executable, '-m', 'benchmarks.startup', '--worker', app, '--timeout', str(timeout)]
+        process = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout * 2)
+        if process.returncode != 0:
+            errors.append(process.stderr.strip()[-2000:])
+            continue
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        errors.extend(result['errors'])
+        for name in samples:
+            samples[name].append(result[name])
+    for name, values in samples.items():
+        rows.append({**base, 'name': name, **(_summary(values) if values else {}), 'errors': sorted(set(errors))})
+    return rows
+
+
+def run(apps: List[str], users: int, repeats: int, timeout: float) -> Dict[str, Any]:
+    """앱마다 임포트 프로파일과 콜드 스타트 측정"""
+    env = {**os.environ, 'ANALYTICS_SYNTHETIC_USERS': str(users)}
+    env.pop('ANALYTICS_DATA_DIR', None)
+    backend = None
+    if 'streamlit/app.py' in apps:
+        from analytics.store import AnalyticsStore
+        from benchmarks.backend import StandInBackend
+        backend = StandInBackend(AnalyticsStore.from_synthetic(users)).start()
+        env['BACKEND_URL'] = backend.url
+    results = []
+    try:
+        for app in apps:
+            started = time.perf_counter()
+            results.extend(bench_startup(app, users, repeats, timeout, env))
+            print(f"{app:18s} · {time.perf_counter() - started:7.1f}초", file=sys.stderr)
+    finally:
+        if backend is not None:
+            backend.stop()
+    return {
+        'commit': _commit(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': repeats,
+        'results': results,
+    }
+
+
+def main():
+    """콜드 스타트 벤치마크 CLI"""
+    parser = argparse.ArgumentParser(description="콜드 스타트·임포트 시간 벤치마크")
+    parser.add_argument('--apps', default=','.join(PAGES), help="쉼표로 구분한 앱 스크립트")
+    parser.add_argument('--users', type=int, default=DEFAULT_USERS, help="합성 데이터 사용자 수")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="새 프로세스 반복 수")
+    parser.add_argument('--timeout', type=float, default=300, help="첫 화면 1회 제한 시간 (초)")
+    parser.add_argument('--out', help="결과 JSON 경로 (기본 benchmarks/results/startup-<커밋>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'), help="두 결과 파일 비교")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.timeout), ensure_ascii=False))
+        return
+    if args.compare:
+        rows = compare(*args.compare)
+        for row in rows:
+            flag = ' ← 회귀' if row['regression'] else ''
+            print(f"{row['app']:18s} {row['name']:12s} p50 ×{row['p50_ratio']} p95 ×{row['p95_ratio']}{flag}")
+        sys.exit(1 if any(row['regression'] for row in rows) else 0)
+
+    report = run([app.strip() for app in args.apps.split(',')], args.users, args.repeats, args.timeout)
+    out = args.out or os.path.join(RESULTS_DIR, f"startup-{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    for row in report['results']:
+        timing = f"p50 {row['p50_ms']:>9.2f}ms p95 {row['p95_ms']:>9.2f}ms" if 'p50_ms' in row else '측정 실패'
+        errors = f" 오류 {len(row['errors'])}건" if row.get('errors') else ''
+        print(f"{row['app']:18s} {row['name']:12s} {timing}{errors}")
+        for name, ms in row.get('modules', {}).items():
+            print(f"{'':18s}   {name:30s} {ms:>9.2f}ms")
+    print(f"→ {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,22 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import requests
-import json
+import os
+import sys
+from concurrent.futures import wait
 from datetime import datetime, timedelta
+from functools import partial
 from streamlit_option_menu import option_menu
 import time
 
+# 저장소 루트의 공용 analytics 패키지 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics.api_client import ApiClient, split_bundle
+from analytics.cache import SharedCache
+from analytics.health import HealthMonitor
+from analytics.concurrency import fetch_concurrently
+from analytics.downsample import TREND_POINT_BUDGET, WEBGL_THRESHOLD, downsample_points
+from analytics.figures import FigureCache, memoized_figure
+from analytics.timing import TIMING_EXPORT_PATH, recorder as span_recorder, span, timed
+
 # 페이지 설정
 st.set_page_config(
     page_title="고객 분석 시스템",
@@ -62,24 +69,206 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # API 설정
-API_BASE_URL = "http://localhost:3001/api"
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:3001")
+API_BASE_URL = f"{BACKEND_URL}/api"
+HEALTH_CHECK_URL = f"{BACKEND_URL}/health"
+HEALTH_CHECK_INTERVAL = 15
 
 # 세션 상태 초기화
 if 'selected_category' not in st.session_state:
     st.session_state.selected_category = 'all'
 if 'show_journey_map' not in st.session_state:
     st.session_state.show_journey_map = False
+if 'last_refresh' not in st.session_state:
+    st.session_state.last_refresh = datetime.now()
+if 'refreshed_at' not in st.session_state:
+    # 사용자가 직접 새로고침한 시각 - 이보다 오래된 공유 캐시 항목은 쓰지 않음
+    st.session_state.refreshed_at = None
+
+# API 호출 타임아웃 (초)
+API_TIMEOUT = 10
+DASHBOARD_TOTAL_TIMEOUT = 15
+# 백그라운드 갱신을 기다리는 동안 화면을 다시 확인하는 간격 (초)
+REVALIDATION_POLL = 0.5
+
+@st.cache_resource
+def get_api_client():
+    """모든 세션이 공유하는 API 클라이언트 - keep-alive 연결 풀, 재시도, 서킷 브레이커"""
+    return ApiClient(API_BASE_URL, read_timeout=API_TIMEOUT)
+
+def request_api_data(endpoint, params=None, timeout=API_TIMEOUT, client=None):
+    """API 호출 - 실패 시 화면에 그리지 않고 오류 응답 반환
+
+    워커 스레드에서는 client 를 메인 스레드에서 받아 넘긴다. 재시도를 포함한 전체 시간이
+    timeout 초를 넘지 않으므로 fetch_concurrently 가 포기한 호출이 워커를 계속 잡고 있지 않는다.
+    """
+    client = client or get_api_client()
+    return client.get(endpoint, params, timeout=timeout, deadline=time.monotonic() + timeout)
+
+@st.cache_resource
+def get_health_monitor():
+    """백엔드 상태 모니터 - 프로세스당 하나의 백그라운드 스레드에서 주기적으로 확인"""
+    return HealthMonitor(HEALTH_CHECK_URL, interval=HEALTH_CHECK_INTERVAL).start()
+
+@st.cache_resource
+def get_shared_api_cache():
+    """모든 세션이 공유하는 API 캐시 - 동시에 들어온 같은 요청은 한 번만 호출"""
+    return SharedCache()
+
+@st.cache_resource
+def get_figure_cache():
+    """모든 세션이 공유하는 차트 Figure 캐시 - 같은 입력이면 Figure 를 다시 만들지 않음"""
+    return FigureCache()
+
+def cached_request_api_data(endpoint, params, cache, not_before, client=None):
+    """캐시를 거쳐 API 호출 - 세션 상태 대신 캐시를 직접 받으므로 워커 스레드에서도 사용 가능"""
+    loader = partial(request_api_data, endpoint, params, API_TIMEOUT, client)
+    return cache.fetch(endpoint, params, loader, not_before, API_TIMEOUT)
+
+def refresh_api_data():
+    """공유 API 캐시를 비우고 마지막 새로고침 시각 갱신"""
+    get_shared_api_cache().invalidate()
+    st.session_state.last_refresh = datetime.now()
+    st.session_state.refreshed_at = st.session_state.last_refresh.timestamp()
 
 def fetch_api_data(endpoint, params=None):
     """API 데이터 가져오기"""
-    try:
-        url = f"{API_BASE_URL}/{endpoint}"
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"API 호출 오류: {str(e)}")
+    with span(f"fetch:{endpoint}"):
+        result = cached_request_api_data(
+            endpoint, params, get_shared_api_cache(), st.session_state.refreshed_at
+        )
+    if not result.get('success') and 'error' in result:
+        st.error(result['error'])
         return None
+    return result
+
+# 대시보드 패널별 엔드포인트
+DASHBOARD_PANELS = {
+    "overview": "dashboard/overview",
+    "funnels": "dashboard/funnels",
+    "kpi_trends": "dashboard/kpi-trends",
+    "recent_events": "dashboard/recent-events",
+}
+
+@timed('fetch:dashboard')
+def fetch_dashboard_data(category, stale_while_revalidate=False):
+    """대시보드 패널 데이터를 동시에 가져오기
+
+    stale_while_revalidate 이면 만료된 패널은 마지막 성공 응답에 stale_age(초)를 붙여
+    바로 반환하고, 백그라운드 갱신 future 목록을 함께 반환한다.
+    """
+    params = {"category": category}
+    cache = get_shared_api_cache()
+    client = get_api_client()
+    not_before = st.session_state.refreshed_at
+    
+    panels = {}
+    pending = []
+    missing = {}
+    for panel, endpoint in DASHBOARD_PANELS.items():
+        last_good = cache.peek_last_good(endpoint, params) if stale_while_revalidate else None
+        if last_good is not None:
+            fresh = cache.get(endpoint, params, not_before)
+            if fresh is not None:
+                panels[panel] = fresh
+            else:
+                stored_at, value = last_good
+                panels[panel] = {**value, 'stale_age': time.time() - stored_at}
+                loader = partial(request_api_data, endpoint, params, API_TIMEOUT, client)
+                pending.append(cache.revalidate(endpoint, params, loader, not_before, API_TIMEOUT))
+            continue
+        missing[panel] = endpoint
+    
+    # 보여줄 이전 데이터가 없는 패널만 기다려서 가져오기 - 번들 한 번, 안 되면 패널별 동시 호출.
+    # 둘을 합쳐 DASHBOARD_TOTAL_TIMEOUT 안에 끝나도록 남은 시간만큼만 기다린다
+    if missing:
+        deadline = time.monotonic() + DASHBOARD_TOTAL_TIMEOUT
+        bundled = None
+        if len(missing) > 1:
+            bundled = fetch_dashboard_bundle(category, list(missing), cache, not_before, client, deadline)
+        if bundled is None:
+            remaining = round(max(0.0, deadline - time.monotonic()), 1)
+            call_timeout = min(API_TIMEOUT, remaining)
+            calls = {
+                panel: partial(cache.fetch, endpoint, params,
+                               partial(request_api_data, endpoint, params, call_timeout, client),
+                               not_before, call_timeout)
+                for panel, endpoint in missing.items()
+            }
+            bundled = fetch_concurrently(calls, call_timeout=call_timeout, total_timeout=remaining)
+        panels.update(bundled)
+    
+    return {panel: panels[panel] for panel in DASHBOARD_PANELS}, pending
+
+@st.cache_resource
+def get_backend_features():
+    """백엔드 기능 지원 여부 - 번들 API 가 없는 백엔드면 다시 시도하지 않음"""
+    return {"bundle": True}
+
+def fetch_dashboard_bundle(category, panels, cache, not_before, client, deadline):
+    """번들 API 로 여러 패널을 한 번에 가져와 패널별 응답으로 나누기
+
+    번들 호출도 워커 스레드에서 API_TIMEOUT 초까지만 기다린다. 나눈 응답은 패널별 캐시에도 저장한다.
+    번들 API 를 지원하지 않거나 번들 호출 자체가 실패하면 (타임아웃, 5xx, 서킷 열림) None 을 반환해
+    호출 측이 패널별로 다시 가져오게 한다.
+    """
+    features = get_backend_features()
+    if not features["bundle"]:
+        return None
+    
+    params = {"category": category, "panels": ",".join(panels)}
+    timeout = min(API_TIMEOUT, max(0.0, deadline - time.monotonic()))
+    loader = partial(request_api_data, "dashboard/bundle", params, timeout, client)
+    bundle = fetch_concurrently(
+        {"bundle": partial(cache.fetch, "dashboard/bundle", params, loader, not_before, timeout)},
+        call_timeout=timeout,
+        total_timeout=timeout
+    )["bundle"]
+    if not bundle.get('success'):
+        if bundle.get('status') == 404:
+            features["bundle"] = False
+        return None
+    
+    result = split_bundle(bundle, panels)
+    for panel, envelope in result.items():
+        if envelope['success']:
+            cache.set(DASHBOARD_PANELS[panel], {"category": category}, envelope)
+    return result
+
+def staleness_badge(panel_data):
+    """이전 데이터를 보여주는 중이면 경과 시간 표시"""
+    if 'stale_age' in panel_data:
+        st.caption(f"⏱️ {panel_data['stale_age']:.0f}초 전 데이터 · 갱신 중...")
+
+def check_revalidation(pending, timeout=API_TIMEOUT, poll=REVALIDATION_POLL):
+    """백그라운드 갱신 대기 - 이전 데이터를 먼저 그려 둔 뒤 최대 timeout 초 기다렸다가
+    갱신에 성공한 패널이 있으면 화면을 다시 그린다.
+
+    poll 초마다 안내 문구를 다시 그리므로, 기다리는 동안 들어온 상호작용은 곧바로 반영된다.
+    """
+    if not pending:
+        return
+    status = st.empty()
+    deadline = time.monotonic() + timeout
+    not_done = set(pending)
+    while not_done:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        status.caption("🔄 백그라운드에서 갱신 중입니다. 끝나면 새 데이터로 다시 그립니다.")
+        _, not_done = wait(not_done, timeout=min(poll, remaining))
+    refreshed = [
+        future for future in pending
+        if future.done() and future.exception() is None and (future.result() or {}).get('success')
+    ]
+    if refreshed:
+        st.rerun()
+    status.warning("백엔드 응답이 늦어 이전 데이터를 표시하고 있습니다.")
+
+def render_chart(fig, name):
+    """차트 렌더링 (Plotly JSON 직렬화 포함) 을 render 스팬으로 계측"""
+    with span(f"render:{name}"):
+        st.plotly_chart(fig, use_container_width=True)
 
 def create_metric_card(title, value, unit="", change=None, change_type="neutral"):
     """메트릭 카드 생성"""
@@ -102,8 +291,11 @@ def create_metric_card(title, value, unit="", change=None, change_type="neutral"
             else:
                 st.info(f"{change:+.1f}%")
 
+@timed('chart:funnel')
+@memoized_figure('funnel', get_figure_cache)
 def create_funnel_chart(funnel_data):
     """퍼널 차트 생성"""
+    import plotly.graph_objects as go
     if not funnel_data:
         return None
     
@@ -130,27 +322,36 @@ def create_funnel_chart(funnel_data):
     
     return fig
 
-def create_kpi_trend_chart(kpi_data):
-    """KPI 트렌드 차트 생성"""
+@timed('chart:kpi_trend')
+@memoized_figure('kpi_trend', get_figure_cache)
+def create_kpi_trend_chart(kpi_data, budget=TREND_POINT_BUDGET):
+    """KPI 트렌드 차트 생성 - 긴 시계열은 LTTB 로 budget 개까지 줄이고 WebGL 로 그린다"""
+    import plotly.graph_objects as go
     if not kpi_data:
         return None
     
     fig = go.Figure()
     
     # 단일 KPI 트렌드 데이터 처리
-    dates = [item['date'] for item in kpi_data]
-    values = [item['value'] for item in kpi_data]
+    points = downsample_points(kpi_data, budget)
+    dates = [item['date'] for item in points]
+    values = [item['value'] for item in points]
+    long_series = len(points) > WEBGL_THRESHOLD
+    trace = go.Scattergl if long_series else go.Scatter
     
-    fig.add_trace(go.Scatter(
+    fig.add_trace(trace(
         x=dates,
         y=values,
-        mode='lines+markers',
+        mode='lines' if long_series else 'lines+markers',
         name='KPI 트렌드',
-        line=dict(width=3)
+        line=dict(width=2 if long_series else 3)
     ))
     
+    title = "KPI 트렌드"
+    if len(points) < len(kpi_data):
+        title += f" ({len(kpi_data):,}개 중 {len(points):,}개 표시)"
     fig.update_layout(
-        title="KPI 트렌드",
+        title=title,
         xaxis_title="날짜",
         yaxis_title="값",
         height=400,
@@ -159,8 +360,43 @@ def create_kpi_trend_chart(kpi_data):
     
     return fig
 
+@timed('chart:path_sankey')
+@memoized_figure('path_sankey', get_figure_cache)
+def create_path_sankey(sankey):
+    """세션 경로 Sankey 다이어그램 생성"""
+    import plotly.graph_objects as go
+    labels = [f"{node['depth'] + 1}. {node['label']}" if node['depth'] is not None else node['label']
+              for node in sankey['nodes']]
+    
+    fig = go.Figure(data=[go.Sankey(
+        arrangement='snap',
+        node=dict(
+            label=labels,
+            pad=15,
+            thickness=18,
+            color=['#ef4444' if node['depth'] is None else '#667eea' for node in sankey['nodes']]
+        ),
+        link=dict(
+            source=[link['source'] for link in sankey['links']],
+            target=[link['target'] for link in sankey['links']],
+            value=[link['value'] for link in sankey['links']],
+            color='rgba(102, 126, 234, 0.25)'
+        )
+    )])
+    
+    fig.update_layout(
+        title="주요 세션 경로",
+        height=550,
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    return fig
+
+@timed('chart:customer_journey_map')
+@memoized_figure('customer_journey_map', get_figure_cache)
 def create_customer_journey_map():
-    """고객 여정 맵 생성"""
+    """고객 여정 맵 생성 - 도형과 주석을 모아 레이아웃에 한 번에 넣는다"""
+    import plotly.graph_objects as go
     journey_stages = [
         {"stage": "인지", "description": "브랜드/제품 인지", "metrics": {"방문자": 15000, "전환율": 8.5}},
         {"stage": "관심", "description": "제품 정보 탐색", "metrics": {"체류시간": 180, "페이지뷰": 4.2}},
@@ -169,7 +405,8 @@ def create_customer_journey_map():
         {"stage": "유지", "description": "고객 유지", "metrics": {"재구매": 512, "만족도": 4.6}}
     ]
     
-    fig = go.Figure()
+    shapes = []
+    annotations = []
     
     # 여정 단계별 박스 그리기
     for i, stage in enumerate(journey_stages):
@@ -177,68 +414,71 @@ def create_customer_journey_map():
         y_pos = 0
         
         # 메인 박스
-        fig.add_shape(
+        shapes.append(dict(
             type="rect",
             x0=x_pos-0.8, y0=y_pos-0.4,
             x1=x_pos+0.8, y1=y_pos+0.4,
             line=dict(color="blue", width=2),
             fillcolor="lightblue",
             opacity=0.7
-        )
+        ))
         
         # 단계명
-        fig.add_annotation(
+        annotations.append(dict(
             x=x_pos, y=y_pos+0.6,
             text=stage["stage"],
             showarrow=False,
             font=dict(size=14, color="blue")
-        )
+        ))
         
         # 설명
-        fig.add_annotation(
+        annotations.append(dict(
             x=x_pos, y=y_pos,
             text=stage["description"],
             showarrow=False,
             font=dict(size=10)
-        )
+        ))
         
         # 메트릭
         metrics_text = "<br>".join([f"{k}: {v}" for k, v in stage["metrics"].items()])
-        fig.add_annotation(
+        annotations.append(dict(
             x=x_pos, y=y_pos-0.6,
             text=metrics_text,
             showarrow=False,
             font=dict(size=8),
             align="center"
-        )
+        ))
         
         # 화살표 (마지막 단계 제외)
         if i < len(journey_stages) - 1:
-            fig.add_shape(
+            shapes.append(dict(
                 type="line",
                 x0=x_pos+0.8, y0=y_pos,
                 x1=x_pos+1.2, y1=y_pos,
                 line=dict(color="gray", width=2)
-            )
-            fig.add_annotation(
+            ))
+            annotations.append(dict(
                 x=x_pos+1, y=y_pos+0.1,
                 text="→",
                 showarrow=False,
                 font=dict(size=16)
-            )
+            ))
     
-    fig.update_layout(
+    fig = go.Figure(layout=dict(
         title="고객 여정 맵",
+        shapes=shapes,
+        annotations=annotations,
         xaxis=dict(showgrid=False, showticklabels=False, range=[-1, len(journey_stages)*2-1]),
         yaxis=dict(showgrid=False, showticklabels=False, range=[-1, 1]),
         height=300,
         showlegend=False
-    )
+    ))
     
     return fig
 
 def dashboard_page():
     """대시보드 페이지"""
+    import pandas as pd
     st.markdown('<h1 class="main-header">📊 고객 분석 대시보드</h1>', unsafe_allow_html=True)
     
     # 카테고리 선택
@@ -255,11 +495,20 @@ def dashboard_page():
         }[x]
     )
     
-    # API 데이터 가져오기
-    overview_data = fetch_api_data("dashboard/overview", {"category": category})
+    stale_while_revalidate = st.toggle(
+        "이전 데이터 먼저 표시",
+        value=True,
+        help="만료된 패널은 마지막으로 받은 데이터를 바로 보여주고 백그라운드에서 갱신합니다.",
+        key="dashboard_stale_while_revalidate"
+    )
+    
+    # API 데이터 동시에 가져오기 - 가장 느린 호출 시간만큼만 대기
+    panels, pending = fetch_dashboard_data(category, stale_while_revalidate)
+    overview_data = panels["overview"]
     
-    if overview_data and overview_data.get('success'):
+    if overview_data.get('success'):
         data = overview_data['data']
+        staleness_badge(overview_data)
         
         # 메트릭 카드들
         col1, col2, col3, col4 = st.columns(4)
@@ -275,87 +524,64 @@ def dashboard_page():
         
         with col4:
             create_metric_card("평균 전환율", data['average_conversion_rate'], "%")
-        
-        # 차트들
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 퍼널 차트
-            funnel_data = fetch_api_data("dashboard/funnels", {"category": category})
-            if funnel_data and funnel_data.get('success'):
-                fig = create_funnel_chart(funnel_data['data'])
-                if fig:
-                    st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # KPI 트렌드
-            kpi_data = fetch_api_data("dashboard/kpi-trends", {"category": category})
-            if kpi_data and kpi_data.get('success'):
-                fig = create_kpi_trend_chart(kpi_data['data'])
-                if fig:
-                    st.plotly_chart(fig, use_container_width=True)
-        
-        # 최근 이벤트 테이블
-        st.subheader("📋 최근 이벤트")
-        events_data = fetch_api_data("dashboard/recent-events", {"category": category})
-        if events_data and events_data.get('success'):
+    else:
+        st.error(f"대시보드 개요 데이터를 불러올 수 없습니다. {overview_data.get('error', '')}")
+    
+    # 차트들
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # 퍼널 차트
+        funnel_data = panels["funnels"]
+        if funnel_data.get('success'):
+            staleness_badge(funnel_data)
+            fig = create_funnel_chart(funnel_data['data'])
+            if fig:
+                render_chart(fig, 'funnel')
+        else:
+            st.error(f"퍼널 데이터를 불러올 수 없습니다. {funnel_data.get('error', '')}")
+    
+    with col2:
+        # KPI 트렌드
+        kpi_data = panels["kpi_trends"]
+        if kpi_data.get('success'):
+            staleness_badge(kpi_data)
+            fig = create_kpi_trend_chart(kpi_data['data'])
+            if fig:
+                render_chart(fig, 'kpi_trend')
+        else:
+            st.error(f"KPI 트렌드를 불러올 수 없습니다. {kpi_data.get('error', '')}")
+    
+    # 최근 이벤트 테이블
+    st.subheader("📋 최근 이벤트")
+    events_data = panels["recent_events"]
+    if events_data.get('success'):
+        staleness_badge(events_data)
+        with span('frame:recent_events'):
             df = pd.DataFrame(events_data['data'])
-            if not df.empty:
-                st.dataframe(df, use_container_width=True)
-            else:
-                st.info("최근 이벤트가 없습니다.")
+        if not df.empty:
+            st.dataframe(df, use_container_width=True)
+        else:
+            st.info("최근 이벤트가 없습니다.")
     else:
-        st.error("대시보드 데이터를 불러올 수 없습니다.")
+        st.error(f"최근 이벤트를 불러올 수 없습니다. {events_data.get('error', '')}")
+    
+    # 이전 데이터를 보여준 패널은 갱신이 끝나면 다시 그리기
+    check_revalidation(pending)
 
 def kpi_analytics_page():
     """KPI 분석 페이지"""
+    import plotly.graph_objects as go
     st.markdown('<h1 class="main-header">📈 KPI 분석</h1>', unsafe_allow_html=True)
     
-    # KPI 데이터 (임시)
-    kpi_data = [
-        {
-            "name": "전환율",
-            "category": "conversion",
-            "current_value": 12.5,
-            "target_value": 15.0,
-            "unit": "%",
-            "trend": [10.2, 11.1, 12.3, 11.8, 13.2, 12.5],
-            "dates": ['2025-08-01', '2025-08-02', '2025-08-03', '2025-08-04', '2025-08-05', '2025-08-06'],
-            "journeyStage": "결정 단계",
-            "impact": "high",
-            "description": "고객이 구매 결정을 내리고 실제 결제를 완료하는 비율",
-            "improvement": "결제 프로세스 최적화, 장바구니 이탈률 감소"
-        },
-        {
-            "name": "평균 체류시간",
-            "category": "engagement",
-            "current_value": 180,
-            "target_value": 200,
-            "unit": "초",
-            "trend": [165, 172, 185, 178, 190, 180],
-            "dates": ['2025-08-01', '2025-08-02', '2025-08-03', '2025-08-04', '2025-08-05', '2025-08-06'],
-            "journeyStage": "고려 단계",
-            "impact": "medium",
-            "description": "고객이 제품 정보를 탐색하고 비교하는 시간",
-            "improvement": "콘텐츠 품질 향상, 사용자 경험 개선"
-        },
-        {
-            "name": "재방문율",
-            "category": "retention",
-            "current_value": 28.5,
-            "target_value": 30.0,
-            "unit": "%",
-            "trend": [25.2, 26.8, 27.5, 28.1, 29.2, 28.5],
-            "dates": ['2025-08-01', '2025-08-02', '2025-08-03', '2025-08-04', '2025-08-05', '2025-08-06'],
-            "journeyStage": "유지 단계",
-            "impact": "high",
-            "description": "기존 고객이 다시 방문하는 비율",
-            "improvement": "로열티 프로그램 강화, 개인화 서비스 제공"
-        }
-    ]
+    # kpi_definitions 계산식으로 매일 채우는 측정값 - app.py 의 KPI 분석 페이지와 같은 계산
+    measurements = fetch_api_data("kpi/measurements", {"category": st.session_state.selected_category})
+    kpi_data = measurements['data'] if measurements else []
+    if measurements and not kpi_data:
+        st.info("아직 측정된 KPI 가 없습니다.")
     
     # 카테고리 필터
-    categories = ["all"] + list(set([kpi["category"] for kpi in kpi_data]))
+    categories = ["all"] + sorted({kpi["category"] for kpi in kpi_data})
     selected_category = st.selectbox(
         "카테고리 선택",
         categories,
@@ -364,7 +590,9 @@ def kpi_analytics_page():
             "all": "전체",
             "conversion": "전환",
             "engagement": "참여도",
-            "retention": "유지"
+            "retention": "유지",
+            "revenue": "수익",
+            "satisfaction": "만족도"
         }.get(x, x)
     )
     
@@ -373,27 +601,28 @@ def kpi_analytics_page():
     
     # KPI 카드들
     for kpi in filtered_kpis:
-        with st.expander(f"📊 {kpi['name']} - {kpi['journeyStage']}"):
+        with st.expander(f"📊 {kpi['name']}"):
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                # KPI 값과 목표
+                # KPI 값과 목표 (목표가 없는 KPI 는 차이를 표시하지 않음)
+                delta = kpi['current_value'] - kpi['target_value'] if kpi['target_value'] is not None else None
                 st.metric(
-                    label=kpi['name'],
-                    value=f"{kpi['current_value']}{kpi['unit']}",
-                    delta=f"{kpi['current_value'] - kpi['target_value']:+.1f}{kpi['unit']}"
+                    label=f"{kpi['name']} ({kpi['trend'][-1]['date']})",
+                    value=f"{kpi['current_value']:,.1f}{kpi['unit']}",
+                    delta=f"{delta:+,.1f}{kpi['unit']}" if delta is not None else None
                 )
                 
                 # 설명
                 st.write(f"**설명:** {kpi['description']}")
-                st.write(f"**개선 방안:** {kpi['improvement']}")
+                st.caption(f"계산식: {kpi['formula']}")
             
             with col2:
                 # 트렌드 차트
                 fig = go.Figure()
                 fig.add_trace(go.Scatter(
-                    x=kpi['dates'],
-                    y=kpi['trend'],
+                    x=[point['date'] for point in kpi['trend']],
+                    y=[point['value'] for point in kpi['trend']],
                     mode='lines+markers',
                     name=kpi['name']
                 ))
@@ -402,7 +631,7 @@ def kpi_analytics_page():
                     height=200,
                     showlegend=False
                 )
-                st.plotly_chart(fig, use_container_width=True)
+                render_chart(fig, 'kpi_sparkline')
     
     # 여정 맵 토글
     if st.button("🗺️ 여정 맵 보기/숨기기"):
@@ -413,10 +642,11 @@ def kpi_analytics_page():
         st.subheader("🗺️ 고객 여정 맵 미니 버전")
         fig = create_customer_journey_map()
         if fig:
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, 'customer_journey_map')
 
 def customer_journey_page():
     """고객 여정 맵 페이지"""
+    import plotly.graph_objects as go
     st.markdown('<h1 class="main-header">🗺️ 고객 여정 맵</h1>', unsafe_allow_html=True)
     
     # 필터 옵션
@@ -452,10 +682,31 @@ def customer_journey_page():
     # 선택된 필터 정보 표시
     st.info(f"선택된 카테고리: {selected_category}, 기간: {start_date} ~ {end_date}")
     
-    # 여정 맵 표시
+    # 세션 경로 - 백엔드가 세션별 페이지(또는 액션) 순서를 접두사 트리로 집계한 상위 경로
+    st.subheader("🔀 주요 세션 경로")
+    col1, col2 = st.columns(2)
+    with col1:
+        source = st.selectbox(
+            "경로 기준",
+            options=["pages", "actions"],
+            format_func=lambda x: {"pages": "페이지 순서", "actions": "액션 순서"}[x],
+            key="journey_path_source"
+        )
+    with col2:
+        top_k = st.slider("표시할 경로 수", min_value=5, max_value=30, value=10, step=5, key="journey_path_top_k")
+    
+    paths = fetch_api_data("journey/paths", {"category": selected_category, "source": source, "top_k": top_k})
+    if paths and paths['data']['paths']:
+        render_chart(create_path_sankey(paths['data']['sankey']), 'path_sankey')
+        st.caption(f"세션 {paths['data']['sessions']:,}개 기준 (연속된 같은 페이지는 한 번으로 셈)")
+    elif paths:
+        st.info("경로 데이터가 없습니다.")
+    
+    # 여정 단계 개요
+    st.subheader("🗺️ 여정 단계 개요")
     fig = create_customer_journey_map()
     if fig:
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, 'customer_journey_map')
     
     # 감정 변화 차트
     st.subheader("📊 감정 변화 분석")
@@ -485,7 +736,7 @@ def customer_journey_page():
         height=400
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    render_chart(fig, 'emotions')
 
 def settings_page():
     """설정 페이지"""
@@ -549,6 +800,8 @@ def settings_page():
 
 def main():
     """메인 함수"""
+    import pandas as pd
+    import plotly.graph_objects as go
     # 사이드바 네비게이션
     with st.sidebar:
         st.title("📊 고객 분석 시스템")
@@ -564,15 +817,24 @@ def main():
         st.markdown("---")
         st.markdown("### 시스템 상태")
         
-        # 백엔드 연결 상태 확인
-        try:
-            response = requests.get(f"{API_BASE_URL}/dashboard/overview", timeout=5)
-            if response.status_code == 200:
-                st.success("✅ 백엔드 연결됨")
-            else:
-                st.error("❌ 백엔드 오류")
-        except:
-            st.error("❌ 백엔드 연결 실패")
+        # 백엔드 연결 상태 - 백그라운드 모니터의 마지막 결과만 읽음
+        health = get_health_monitor().snapshot()
+        if health['state'] == 'up':
+            st.success("✅ 백엔드 연결됨")
+        elif health['state'] == 'down':
+            st.error(f"❌ 백엔드 연결 실패 ({health['last_error']})")
+        else:
+            st.info("⏳ 백엔드 상태 확인 중...")
+        if health['last_checked']:
+            st.caption(
+                f"마지막 확인 {health['last_checked'].strftime('%H:%M:%S')} · "
+                f"p50 {health['p50_ms'] or 0:.0f}ms · p95 {health['p95_ms'] or 0:.0f}ms · "
+                f"가용률 {health['availability']}%"
+            )
+        with st.expander("응답 시간 분포"):
+            fig = go.Figure(go.Bar(x=list(health['histogram']), y=list(health['histogram'].values())))
+            fig.update_layout(height=200, margin=dict(l=0, r=0, t=10, b=0))
+            render_chart(fig, 'health_histogram')
         
         st.markdown("---")
         st.markdown("### 빠른 액션")
@@ -581,19 +843,67 @@ def main():
             st.rerun()
         
         if st.button("📊 데이터 업데이트"):
-            st.info("데이터 업데이트 중...")
-            time.sleep(2)
+            refresh_api_data()
             st.success("데이터가 업데이트되었습니다!")
+        
+        cache_stats = get_shared_api_cache().stats()
+        st.caption(
+            f"캐시 적중 {cache_stats['hits']}회 · 미스 {cache_stats['misses']}회 "
+            f"({cache_stats['hit_rate']}%) · 병합된 요청 {cache_stats['coalesced']}회 "
+            f"(대기 시간 초과 {cache_stats['wait_timeouts']}회) / API 호출 {cache_stats['upstream_calls']}회 · "
+            f"마지막 갱신 {st.session_state.last_refresh.strftime('%H:%M:%S')}"
+        )
+        figure_stats = get_figure_cache().stats()
+        st.caption(
+            f"차트 캐시 적중 {figure_stats['hits']}회 ({figure_stats['hit_rate']}%) · "
+            f"항목 {figure_stats['size']}개 · {figure_stats['bytes'] / 2 ** 20:.1f}MB"
+        )
+        
+        with st.expander("API 호출 통계"):
+            client = get_api_client()
+            st.caption(f"서킷 상태: {client.breaker.state}")
+            api_stats = client.stats()
+            if api_stats:
+                st.dataframe(pd.DataFrame.from_dict(api_stats, orient='index'), use_container_width=True)
+            else:
+                st.info("아직 API 호출이 없습니다.")
+        
+        with st.expander("성능 계측"):
+            span_recorder.enabled = st.checkbox(
+                "성능 계측 켜기",
+                value=span_recorder.enabled,
+                key="timing_enabled",
+                help="API 호출·DataFrame 변환·차트 생성·렌더링 구간 시간을 잽니다. 프로세스 전체에 적용됩니다."
+            )
+            spans = span_recorder.snapshot()
+            if spans:
+                st.dataframe(
+                    pd.DataFrame(spans)[['span', 'count', 'p50_ms', 'p95_ms']].set_index('span'),
+                    use_container_width=True
+                )
+                st.download_button(
+                    "Prometheus 형식 내보내기",
+                    data=span_recorder.to_prometheus(),
+                    file_name="dashboard_spans.prom",
+                    mime="text/plain",
+                    key="timing_export"
+                )
+            else:
+                st.info("아직 기록된 스팬이 없습니다.")
     
     # 페이지 라우팅
-    if selected == "대시보드":
-        dashboard_page()
-    elif selected == "KPI 분석":
-        kpi_analytics_page()
-    elif selected == "고객 여정 맵":
-        customer_journey_page()
-    elif selected == "설정":
-        settings_page()
+    with span(f"page:{selected}"):
+        if selected == "대시보드":
+            dashboard_page()
+        elif selected == "KPI 분석":
+            kpi_analytics_page()
+        elif selected == "고객 여정 맵":
+            customer_journey_page()
+        elif selected == "설정":
+            settings_page()
+    
+    if span_recorder.enabled and TIMING_EXPORT_PATH:
+        span_recorder.write_prometheus(TIMING_EXPORT_PATH)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,48 @@
+"""서킷 브레이커 상태 전이 검증"""
+import time
+
+from analytics.api_client import CircuitBreaker
+
+
+def test_opens_after_failure_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+
+
+def test_half_opens_after_cooldown_with_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.15)
+    # 쿨다운 뒤에는 시험 호출 하나만 통과
+    assert breaker.allow()
+    assert breaker.state == 'half_open'
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_trial_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+    breaker.record_failure()
+    time.sleep(0.15)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
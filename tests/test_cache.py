@@ -0,0 +1,76 @@
+"""공유 캐시의 single-flight 요청 병합 검증"""
+import threading
+import time
+
+from analytics.cache import SharedCache
+
+
+def test_concurrent_misses_call_loader_once():
+    cache = SharedCache()
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(threading.get_ident())
+        release.wait(5)
+        return {'success': True, 'data': 42}
+
+    results = []
+
+    def request():
+        results.append(cache.fetch('dashboard/overview', {'category': 'all'}, loader))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # 모든 요청이 진행 중인 호출에 합류할 때까지 기다린다
+    deadline = time.monotonic() + 5
+    while cache.stats()['coalesced'] < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{'success': True, 'data': 42}] * 8
+    stats = cache.stats()
+    assert (stats['upstream_calls'], stats['coalesced'], stats['in_flight']) == (1, 7, 0)
+    # 이후 조회는 캐시에서 바로 응답
+    assert cache.fetch('dashboard/overview', {'category': 'all'}, loader) == {'success': True, 'data': 42}
+    assert len(calls) == 1
+
+
+def test_follower_times_out_when_leader_hangs():
+    cache = SharedCache(wait_timeout=0.2)
+    started = threading.Event()
+    release = threading.Event()
+
+    def hanging():
+        started.set()
+        release.wait(5)
+        return {'success': True, 'data': 'late'}
+
+    leader = threading.Thread(target=cache.fetch, args=('journey/paths', None, hanging))
+    leader.start()
+    try:
+        assert started.wait(5)
+        begun = time.monotonic()
+        result = cache.fetch('journey/paths', None, lambda: {'success': True, 'data': 'unused'})
+        elapsed = time.monotonic() - begun
+    finally:
+        release.set()
+        leader.join(5)
+
+    assert result == {'success': False, 'error': '진행 중인 같은 요청이 0.2초 내에 끝나지 않았습니다.'}
+    assert 0.2 <= elapsed < 1.0
+    assert cache.stats()['wait_timeouts'] == 1
+    # 지연된 호출이 끝나면 그 결과가 저장된다
+    assert cache.get('journey/paths') == {'success': True, 'data': 'late'}
+
+
+def test_failed_responses_are_not_cached():
+    cache = SharedCache()
+    responses = iter([{'success': False, 'error': 'down'}, {'success': True, 'data': 1}])
+    assert cache.fetch('dashboard/funnels', None, lambda: next(responses))['success'] is False
+    assert cache.fetch('dashboard/funnels', None, lambda: next(responses)) == {'success': True, 'data': 1}
+    assert cache.stats()['upstream_calls'] == 2
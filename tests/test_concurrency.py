@@ -0,0 +1,58 @@
+"""패널 동시 조회의 개별·전체 타임아웃 검증"""
+import threading
+import time
+
+from analytics.concurrency import fetch_concurrently
+
+
+def test_slow_call_times_out_and_others_succeed():
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return {'success': True, 'data': 'late'}
+
+    started = time.monotonic()
+    try:
+        results = fetch_concurrently({
+            'fast': lambda: {'success': True, 'data': 1},
+            'slow': slow,
+        }, call_timeout=0.3, total_timeout=1.0)
+    finally:
+        release.set()
+    elapsed = time.monotonic() - started
+
+    assert results['fast'] == {'success': True, 'data': 1}
+    assert results['slow']['success'] is False
+    assert '0.3초' in results['slow']['error']
+    assert elapsed < 0.8
+
+
+def test_total_timeout_bounds_wall_time():
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return {'success': True}
+
+    started = time.monotonic()
+    try:
+        results = fetch_concurrently({f'panel{index}': slow for index in range(3)},
+                                     call_timeout=2.0, total_timeout=0.4)
+    finally:
+        release.set()
+    elapsed = time.monotonic() - started
+
+    assert 0.4 <= elapsed < 0.9
+    assert list(results) == ['panel0', 'panel1', 'panel2']
+    for result in results.values():
+        assert result == {'success': False, 'error': '전체 0.4초 제한을 초과했습니다.'}
+
+
+def test_exceptions_and_non_dict_results_become_failure_envelopes():
+    def broken():
+        raise RuntimeError('boom')
+
+    results = fetch_concurrently({'broken': broken, 'empty': lambda: None})
+    assert results['broken'] == {'success': False, 'error': 'boom'}
+    assert results['empty'] == {'success': False, 'error': '빈 응답'}
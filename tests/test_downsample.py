@@ -0,0 +1,42 @@
+"""LTTB 다운샘플링 검증"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.downsample import downsample_points, lttb
+
+
+def test_keeps_endpoints_and_budget():
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 100)
+    selected = lttb(x, y, 500)
+    assert len(selected) == 500
+    assert selected[0] == 0 and selected[-1] == len(x) - 1
+    assert np.all(np.diff(selected) > 0)
+
+
+@pytest.mark.parametrize('budget', [2, 10, 50])
+def test_returns_every_point_when_budget_is_not_smaller(budget):
+    n = 10 if budget > 2 else 40
+    np.testing.assert_array_equal(lttb(np.arange(n), np.zeros(n), budget), np.arange(n))
+
+
+def test_keeps_spikes():
+    y = np.zeros(5_000)
+    y[1234], y[3210] = 50.0, -50.0
+    selected = lttb(np.arange(len(y)), y, 100)
+    assert {1234, 3210} <= set(selected.tolist())
+
+
+def test_downsample_points_keeps_first_and_last_point():
+    dates = pd.date_range('2025-01-01', periods=3_000, freq='min').strftime('%Y-%m-%d %H:%M')
+    points = [{'date': date, 'value': float(index % 7)} for index, date in enumerate(dates)]
+    sampled = downsample_points(points, budget=300)
+    assert len(sampled) == 300
+    assert sampled[0] is points[0] and sampled[-1] is points[-1]
+    assert [point['date'] for point in sampled] == sorted(point['date'] for point in sampled)
+
+
+def test_downsample_points_passes_short_series_through():
+    points = [{'date': '2025-01-01', 'value': 1.0}, {'date': '2025-01-02', 'value': None}]
+    assert downsample_points(points, budget=10) is points
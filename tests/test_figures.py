@@ -0,0 +1,65 @@
+"""차트 Figure 캐시 키(내용 해시) 검증"""
+import weakref
+
+import plotly.graph_objects as go
+import pytest
+
+from analytics.figures import DIGEST_MEMO_MIN_ITEMS, FigureCache, content_digest
+
+
+def points(n: int, scale: float = 1.0):
+    return [{'date': f"2025-01-01 {index // 60:02d}:{index % 60:02d}", 'value': index * scale} for index in range(n)]
+
+
+@pytest.fixture
+def cache():
+    built = []
+
+    def builder(data, title='t'):
+        built.append(title)
+        return go.Figure(go.Scatter(y=[point['value'] for point in data]), layout={'title': title})
+
+    figures = FigureCache()
+    return lambda *args, **kwargs: figures.figure('trend', builder, *args, **kwargs), built, figures
+
+
+@pytest.mark.parametrize('n', [5, DIGEST_MEMO_MIN_ITEMS * 4])
+def test_equal_content_hits_and_in_place_changes_rebuild(cache, n):
+    figure, built, _ = cache
+    data = points(n)
+    figure(data)
+    figure(points(n))
+    assert len(built) == 1
+    data.append({'date': 'later', 'value': -1.0})
+    figure(data)
+    data[0] = {'date': data[0]['date'], 'value': 99.0}
+    figure(data)
+    assert len(built) == 3
+    figure(data, title='other')
+    assert len(built) == 4
+
+
+def test_digest_depends_on_content_not_identity():
+    large = DIGEST_MEMO_MIN_ITEMS * 2
+    assert content_digest(points(large)) == content_digest(points(large))
+    assert content_digest(points(large)) != content_digest(points(large, scale=2.0))
+    renamed = [{'day': point['date'], 'value': point['value']} for point in points(large)]
+    assert content_digest(renamed) != content_digest(points(large))
+    nested = [{'path': ['/a', '/b'], 'sessions': index} for index in range(large)]
+    assert content_digest(nested) == content_digest([dict(row) for row in nested])
+
+
+class Payload(list):
+    """약한 참조를 걸 수 있는 list"""
+
+
+def test_cache_does_not_keep_payloads_alive(cache):
+    figure, built, _ = cache
+    data = Payload(points(DIGEST_MEMO_MIN_ITEMS * 2))
+    figure(data)
+    ref = weakref.ref(data)
+    del data
+    assert ref() is None
+    # 같은 내용의 새 객체는 기억한 해시 대신 내용으로 다시 해시해 적중한다
+    figure(Payload(points(DIGEST_MEMO_MIN_ITEMS * 2)))
+    assert len(built) == 1
@@ -0,0 +1,113 @@
+"""KPI 계산식 컴파일러와 적재 분할에 따른 측정값 검증"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import kpi
+from analytics.kpi import FormulaError, compile_formula
+from analytics.store import AnalyticsStore
+from analytics.synthetic import generate_dataset
+
+# 적재 테이블별 시각 컬럼 - 이 시각으로 데이터셋을 두 번에 나눠 적재한다
+TIME_COLUMNS = {
+    'user_sessions': 'started_at',
+    'page_view_events': 'viewed_at',
+    'user_action_events': 'performed_at',
+    'conversion_events': 'converted_at',
+    'journey_stage_completions': 'completed_at',
+}
+MEASUREMENTS = """
+    SELECT kpi_id, scenario_id, measurement_date, measured_value FROM kpi_measurements
+    WHERE measurement_period = 'daily' ORDER BY kpi_id, scenario_id, measurement_date
+"""
+
+
+def test_compiles_and_evaluates_formula():
+    formula = compile_formula('완료된 사용자 수 / 시작한 사용자 수 * 100')
+    started, completed = formula.columns[1], formula.columns[0]
+    values = formula.evaluate({started: np.array([10, 0, 4]), completed: np.array([5, 0, 1])})
+    np.testing.assert_allclose(values, [50.0, np.nan, 25.0])
+
+
+def test_expands_operands_defined_by_other_operands():
+    formula = compile_formula('이탈한 사용자 수 / 시작한 사용자 수 * 100')
+    assert len(formula.columns) == 2
+    started, completed = formula.columns
+    values = formula.evaluate({started: np.array([8.0]), completed: np.array([6.0])})
+    np.testing.assert_allclose(values, [25.0])
+
+
+def test_category_operands_override_defaults():
+    default = compile_formula('이탈한 사용자 수 / 페이지 뷰 수 * 100')
+    engagement = compile_formula('이탈한 사용자 수 / 페이지 뷰 수 * 100', 'engagement')
+    assert ('page_views', 'bounces', ()) in engagement.columns
+    assert ('page_views', 'bounces', ()) not in default.columns
+
+
+@pytest.mark.parametrize('formula', [
+    "__import__('os').system('true')",
+    "시작한 사용자 수.__class__",
+    "(1).__class__.__bases__",
+    "시작한 사용자 수[0]",
+    "시작한 사용자 수(1)",
+    "c0 + 1",
+    "__builtins__",
+    "lambda: 1",
+    "시작한 사용자 수 ** 2",
+    "고유 고객 수 / 2",
+    "",
+    "   ",
+])
+def test_rejects_formulas_outside_arithmetic(formula):
+    with pytest.raises(FormulaError):
+        compile_formula(formula)
+
+
+@pytest.mark.parametrize('source', [
+    "c0.__class__",
+    "c0.sum()",
+    "__import__('os')",
+    "c0[0]",
+    "c1 + c0",
+    "__builtins__",
+    "[c0]",
+    "c0 if c0 else 1",
+    "c0 ** 2",
+])
+def test_whitelist_rejects_expanded_source(monkeypatch, source):
+    """항 치환을 통과한 식이라도 허용한 노드와 이 식의 열 변수만 컴파일한다"""
+    def expand(formula, operands, columns, depth=0):
+        columns.append(('sessions', 'sessions', ()))
+        return source
+
+    monkeypatch.setattr(kpi, '_expand', expand)
+    with pytest.raises(FormulaError):
+        compile_formula('방문한 사용자 수')
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    return generate_dataset(1500, 20, seed=7, end=pd.Timestamp('2025-03-01'))
+
+
+def test_split_load_matches_single_load(dataset):
+    full = AnalyticsStore()
+    full.load(dataset)
+    full.measure_kpis()
+
+    cut = pd.Timestamp('2025-03-01') - pd.Timedelta(days=8)
+    before = {name: frame[frame[TIME_COLUMNS[name]] < cut] if name in TIME_COLUMNS else frame
+              for name, frame in dataset.items()}
+    after = {name: dataset[name][dataset[name][column] >= cut] for name, column in TIME_COLUMNS.items()}
+    split = AnalyticsStore()
+    split.load(before)
+    first = split.measure_kpis()
+    split.load(after)
+    second = split.measure_kpis()
+
+    expected = full._query(MEASUREMENTS)
+    assert expected
+    assert split._query(MEASUREMENTS) == expected
+    # 두 번째 계산은 첫 번째 이후 일자만 추가한다
+    assert all(second['measured'][name] < count for name, count in first['measured'].items())
+    assert split.measure_kpis()['measured'] == {name: 0 for name in first['measured']}
@@ -0,0 +1,79 @@
+"""경로 접두사 트리의 손실 카운팅 오차 한계 검증"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.paths import PathTrie, session_chunks
+
+MIN_SUPPORT = 0.01
+EPSILON = 0.002
+
+
+def clickstream(n_sessions: int, seed: int = 11) -> pd.DataFrame:
+    """세션 순 (session_id, page) 행 - 페이지는 치우친(Zipf) 분포"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(1, 8, n_sessions)
+    pages = np.minimum(rng.zipf(1.6, lengths.sum()), 40)
+    return pd.DataFrame({
+        'session_id': np.repeat(np.arange(n_sessions), lengths),
+        'page': [f"/page/{page}" for page in pages],
+    })
+
+
+def pieces(frame: pd.DataFrame, chunks: int):
+    """세션 경계와 관계없이 행 수로 자른 조각"""
+    return [frame.iloc[rows] for rows in np.array_split(np.arange(len(frame)), chunks)]
+
+
+def feed(trie: PathTrie, frame: pd.DataFrame, chunks: int) -> PathTrie:
+    for chunk in session_chunks(pieces(frame, chunks)):
+        trie.update(chunk['session_id'], chunk['page'])
+    return trie
+
+
+@pytest.fixture(scope='module')
+def tries():
+    frame = clickstream(20_000)
+    # epsilon 0 은 아무 노드도 버리지 않으므로 정확한 기준이 된다
+    exact = feed(PathTrie(min_support=0, epsilon=0), frame, 1)
+    lossy = feed(PathTrie(min_support=MIN_SUPPORT, epsilon=EPSILON), frame, 40)
+    return exact, lossy
+
+
+def test_chunked_sessions_are_all_counted(tries):
+    exact, lossy = tries
+    assert exact.sessions == lossy.sessions == 20_000
+
+
+def test_lossy_counts_undercount_by_at_most_epsilon_n(tries):
+    exact, lossy = tries
+    expected = {tuple(row['path']): row['sessions'] for row in exact.top_paths(k=exact.nodes)}
+    found = {tuple(row['path']): row['sessions'] for row in lossy.top_paths(k=lossy.nodes)}
+    slack = EPSILON * lossy.sessions
+    for path, sessions in found.items():
+        assert expected[path] - slack <= sessions <= expected[path]
+    # 지지도 이상인 경로는 하나도 빠지지 않는다
+    frequent = [path for path, sessions in expected.items() if sessions >= MIN_SUPPORT * exact.sessions]
+    assert frequent
+    assert set(frequent) <= set(found)
+
+
+def test_lossy_counting_bounds_memory(tries):
+    exact, lossy = tries
+    assert lossy.nodes < exact.nodes / 2
+
+
+def test_top_paths_order_matches_exact(tries):
+    exact, lossy = tries
+    assert [row['path'] for row in lossy.top_paths(5)] == [row['path'] for row in exact.top_paths(5)]
+
+
+def test_session_chunks_do_not_split_sessions():
+    frame = clickstream(500)
+    chunks = list(session_chunks(pieces(frame, 7)))
+    assert sum(len(chunk) for chunk in chunks) == len(frame)
+    seen = set()
+    for chunk in chunks:
+        ids = set(chunk['session_id'])
+        assert not ids & seen
+        seen |= ids
@@ -0,0 +1,104 @@
+"""청크 스트림 세션 분할이 한 번에 나눈 기준 결과와 같은지 검증"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.sessionize import SESSION_GAP, Sessionizer, clickstream_chunks, iter_chunks, sessionize
+from analytics.store import AnalyticsStore
+
+
+def raw_events(n_users: int = 300, n_events: int = 6_000, seed: int = 5):
+    """간격이 30분 전후로 섞인 (page_views, actions) 원시 이벤트"""
+    rng = np.random.default_rng(seed)
+    users = rng.integers(0, n_users, n_events)
+    # 사용자별로 5~50분 간격이 이어지도록 시각을 쌓는다
+    steps = pd.to_timedelta(rng.integers(5, 50, n_events), unit='min')
+    frame = pd.DataFrame({'user': users, 'step': steps}).sort_values('user', kind='stable')
+    times = pd.Timestamp('2025-01-01') + frame.groupby('user')['step'].cumsum()
+    frame = frame.assign(timestamp=times.to_numpy(), row=np.arange(n_events))
+    frame = frame.sample(frac=1, random_state=seed)
+    events = pd.DataFrame({
+        'user_id': 'user_' + frame['user'].astype(str),
+        'page_url': '/page/' + (frame['row'] % 9).astype(str),
+        'row': frame['row'].to_numpy(),
+    })
+    is_view = rng.random(n_events) < 0.7
+    page_views = events[is_view].assign(viewed_at=frame['timestamp'].to_numpy()[is_view])
+    actions = events[~is_view].assign(performed_at=frame['timestamp'].to_numpy()[~is_view],
+                                      action_type='click', action_name='button')
+    return page_views.reset_index(drop=True), actions.reset_index(drop=True)
+
+
+def reference_sessions(page_views: pd.DataFrame, actions: pd.DataFrame) -> dict:
+    """한 번에 정렬해 나눈 기준 결과 - 행 번호 -> 같은 세션 행 번호들"""
+    events = pd.concat([
+        page_views.rename(columns={'viewed_at': 'timestamp'}),
+        actions.rename(columns={'performed_at': 'timestamp'}),
+    ]).sort_values(['user_id', 'timestamp', 'row'])
+    new_session = (events['user_id'] != events['user_id'].shift()) | (events['timestamp'].diff() > SESSION_GAP)
+    groups = events.groupby(new_session.cumsum())['row'].apply(frozenset)
+    return {row: group for group in groups for row in group}
+
+
+def streamed_sessions(page_views: pd.DataFrame, actions: pd.DataFrame, chunk_size: int):
+    events, sessions = [], []
+    for closed_events, closed in sessionize(clickstream_chunks(page_views, actions, chunk_size)):
+        # 내보낸 이벤트는 모두 함께 내보낸 세션에 속한다
+        assert set(closed_events['session_id']) <= set(closed['session_id'])
+        events.append(closed_events)
+        sessions.append(closed)
+    return pd.concat(events), pd.concat(sessions, ignore_index=True)
+
+
+# 한 행씩 나누는 경우는 청크마다 고정 비용이 들어 이벤트 수를 줄인다
+@pytest.mark.parametrize('chunk_size, n_events', [(1, 300), (37, 6_000), (1_000, 6_000), (100_000, 6_000)])
+def test_chunked_sessions_match_single_pass(chunk_size, n_events):
+    page_views, actions = raw_events(n_users=n_events // 20, n_events=n_events)
+    expected = reference_sessions(page_views, actions)
+    events, sessions = streamed_sessions(page_views, actions, chunk_size)
+
+    assert len(events) == len(page_views) + len(actions)
+    assert sessions['session_id'].is_unique
+    assert len(sessions) == len(set(expected.values()))
+    found = events.groupby('session_id')['row'].apply(frozenset)
+    assert {row: found[session_id] for row, session_id in zip(events['row'], events['session_id'])} == expected
+
+    stats = sessions.set_index('session_id')
+    counts = events.groupby('session_id').size()
+    np.testing.assert_array_equal(stats.loc[counts.index, 'events'], counts)
+    views = events[events['event_type'] == 'page_view'].groupby('session_id').size()
+    np.testing.assert_array_equal(stats.loc[views.index, 'page_views'], views)
+    bounds = events.groupby('session_id')['timestamp'].agg(['min', 'max'])
+    np.testing.assert_array_equal(stats.loc[bounds.index, 'started_at'], bounds['min'])
+    np.testing.assert_array_equal(stats.loc[bounds.index, 'ended_at'], bounds['max'])
+
+
+def test_sessions_carry_over_chunk_boundaries():
+    times = pd.Timestamp('2025-01-01') + pd.to_timedelta([0, 20, 40, 100, 110], unit='min')
+    events = pd.DataFrame({'user_id': 'u', 'timestamp': times, 'page_url': ['/a', '/b', '/c', '/d', '/e'],
+                           'event_type': 'page_view'})
+    sessions = pd.concat([closed for _, closed in sessionize(iter_chunks(events, 1))], ignore_index=True)
+    assert sessions['events'].tolist() == [3, 2]
+    assert sessions['landing_page'].tolist() == ['/a', '/d']
+    assert sessions['session_id'].tolist() == ['sess_00000001', 'sess_00000002']
+
+
+def test_new_ids_are_zero_padded():
+    sessionizer = Sessionizer(id_prefix='s-', id_width=4, start_id=98)
+    assert sessionizer._new_ids(3).tolist() == ['s-0098', 's-0099', 's-0100']
+    assert sessionizer._new_ids(0).tolist() == []
+
+
+def test_store_ingest_is_independent_of_chunk_size():
+    page_views, actions = raw_events()
+    tables = []
+    for chunk_size in (500, 100_000):
+        store = AnalyticsStore()
+        totals = store.ingest_clickstream(page_views, actions, chunk_size=chunk_size)
+        assert totals['page_views'] == len(page_views) and totals['actions'] == len(actions)
+        tables.append((
+            totals['sessions'],
+            sorted(store._query("SELECT user_id, started_at, ended_at, landing_page FROM user_sessions")),
+            store._query("SELECT COUNT(*) FROM page_view_events WHERE is_bounce")[0][0],
+        ))
+    assert tables[0] == tables[1]
@@ -0,0 +1,76 @@
+"""HyperLogLog·t-digest 오차 한계와 병합 검증"""
+import numpy as np
+import pytest
+
+from analytics.sketch import DEFAULT_COMPRESSION, HyperLogLog, TDigest
+
+QUANTILES = np.array([0.001, 0.01, 0.25, 0.5, 0.75, 0.99, 0.999])
+
+
+def users(start: int, stop: int):
+    return [f"user-{index}" for index in range(start, stop)]
+
+
+@pytest.mark.parametrize('n', [50, 1_000, 20_000, 200_000])
+def test_hll_count_within_three_standard_errors(n):
+    sketch = HyperLogLog().add(users(0, n))
+    assert abs(sketch.count() - n) <= 3 * sketch.relative_error * n
+
+
+def test_hll_small_counts_are_near_exact():
+    # 선형 카운팅 구간
+    assert HyperLogLog().add(users(0, 50)).count() == 50
+    assert HyperLogLog().add(users(0, 10) * 20).count() == 10
+
+
+def test_hll_merge_equals_union():
+    first = HyperLogLog().add(users(0, 30_000))
+    second = HyperLogLog().add(users(20_000, 50_000))
+    union = HyperLogLog().add(users(0, 50_000))
+    merged = HyperLogLog.merged([first, second])
+    np.testing.assert_array_equal(merged.registers, union.registers)
+    assert abs(merged.count() - 50_000) <= 3 * merged.relative_error * 50_000
+
+
+def test_hll_rejects_mismatched_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(12).update(HyperLogLog(14))
+    with pytest.raises(ValueError):
+        HyperLogLog(20)
+
+
+def rank_error(values: np.ndarray, estimates: np.ndarray) -> np.ndarray:
+    """추정 분위수의 실제 순위와 목표 분위의 차이"""
+    return np.abs(np.searchsorted(np.sort(values), estimates) / len(values) - QUANTILES)
+
+
+def rank_bound() -> np.ndarray:
+    # k1 척도는 양 끝을 촘촘히 묶으므로 허용 오차도 sqrt(q(1-q)) 에 비례해 작아진다
+    return 4 * np.sqrt(QUANTILES * (1 - QUANTILES)) / DEFAULT_COMPRESSION
+
+
+@pytest.fixture(scope='module')
+def durations():
+    return np.random.default_rng(3).lognormal(3, 1.2, 200_000)
+
+
+def test_tdigest_rank_error_within_bound(durations):
+    digest = TDigest().add(durations)
+    assert np.all(rank_error(durations, digest.quantile(QUANTILES)) <= rank_bound())
+    assert len(digest.means) <= DEFAULT_COMPRESSION
+
+
+def test_tdigest_merge_keeps_error_bound_and_exact_moments(durations):
+    merged = TDigest.merged([TDigest().add(chunk) for chunk in np.array_split(durations, 20)])
+    assert np.all(rank_error(durations, merged.quantile(QUANTILES)) <= rank_bound())
+    assert merged.count == len(durations)
+    assert merged.minimum == durations.min()
+    assert merged.maximum == durations.max()
+    assert merged.mean() == pytest.approx(durations.mean())
+
+
+def test_tdigest_ignores_nan_and_handles_empty():
+    assert np.isnan(TDigest().quantile(0.5)).all()
+    digest = TDigest().add([1.0, np.nan, 3.0])
+    assert digest.count == 2
+    assert digest.quantile([0.0, 1.0]).tolist() == [1.0, 3.0]
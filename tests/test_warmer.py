@@ -0,0 +1,36 @@
+"""캐시 워머의 최초 전체 계산과 이후 조회 기반 갱신 검증"""
+from analytics.cache import TTLCache
+from analytics.warmer import CacheWarmer
+
+ENDPOINTS = ['dashboard/overview', 'dashboard/funnels']
+CATEGORIES = ['all', 'ecommerce', 'content']
+
+
+def make_warmer():
+    calls = []
+
+    def load(endpoint, category):
+        calls.append((endpoint, category))
+        return {'success': True, 'data': [endpoint, category]}
+
+    cache = TTLCache(ttls={endpoint: 60 for endpoint in ENDPOINTS})
+    return CacheWarmer(cache, load, ENDPOINTS, CATEGORIES, lead_time=10), cache, calls
+
+
+def test_seed_warms_every_pair_without_access():
+    warmer, cache, calls = make_warmer()
+    assert warmer.warm(seed=True) == len(ENDPOINTS) * len(CATEGORIES)
+    for category in CATEGORIES:
+        for endpoint in ENDPOINTS:
+            assert cache.get(endpoint, {'category': category}) == {'success': True, 'data': [endpoint, category]}
+    # 아직 만료되지 않은 항목은 다시 계산하지 않는다
+    assert warmer.warm(seed=True) == 0
+
+
+def test_refresh_cycles_only_touch_recently_accessed_keys():
+    warmer, cache, calls = make_warmer()
+    assert warmer.warm() == 0
+    assert calls == []
+    cache.get('dashboard/funnels', {'category': 'content'})
+    assert warmer.warm() == 1
+    assert calls == [('dashboard/funnels', 'content')]